@@ -1,4 +1,5 @@
-from .app_state import AppState, AppStateValue  # noqa F401
+from .app_state import AppState, AppStateValue, ArrayAppStateValue, ArrayDelta  # noqa F401
 from .loading_spinner import LoadingSpinner  # noqa F401
 from .plot_settings import PlotSettings  # noqa F401
+from .plot_settings_manager import PlotSettingsManager  # noqa F401
 from .confirmation_modal import ConfirmationModal  # noqa F401
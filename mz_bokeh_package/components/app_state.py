@@ -1,11 +1,18 @@
+import copy
 import json
 from inspect import getfullargspec, ismethod
-from typing import Callable, Iterable, List, Dict, Any, Optional
+from typing import Callable, Iterable, List, Dict, Any, NamedTuple, Optional, Sequence, Tuple, Union
 from functools import partial
+import numpy as np
 from bokeh.models import Toggle, CustomJS
 from bokeh.io import curdoc
 
 from mz_bokeh_package.utilities import BokehUtilities, Environment, CurrentUser
+from .state_history import StateHistory
+
+# Keys of transient values (e.g. the loading mode of async event handlers), which are not recorded in the history
+# unless they are explicitly included in "history_keys".
+TRANSIENT_KEYS = frozenset({"is_loading"})
 
 
 class AppStateValue():
@@ -31,25 +38,205 @@ class AppStateValue():
         self._call_callbacks()
 
     def subscribe(self, callback_function: Callable[[Any], None]):
+        self._validate_callback(callback_function, ("new_value",))
+        self._callback_functions.append(callback_function)
+
+    @staticmethod
+    def _validate_callback(callback_function: Callable, argument_names: Sequence[str]):
+        """Makes sure that a callback function accepts exactly the given arguments.
+
+        Args:
+            callback_function (Callable): The callback function to validate.
+            argument_names (Sequence[str]): The names of the arguments the callback will be called with.
+
+        Raises:
+            ValueError: If the callback does not accept the expected number of arguments.
+        """
         callback_signature = getfullargspec(callback_function)
 
         function_arguments = callback_signature.args
         if ismethod(callback_function) or (isinstance(callback_function, partial) and ismethod(callback_function.func)):
             function_arguments.pop(0)
 
-        if len(function_arguments) != 1:
+        if len(function_arguments) != len(argument_names):
+            required = "a single argument" if len(argument_names) == 1 else f"{len(argument_names)} arguments"
             raise ValueError(
-                f"Callback functions require a single argument (new_value), but the provided "
-                f"callback has {len(callback_signature.args)} arguments."
+                f"Callback functions require {required} ({', '.join(argument_names)}), but the provided "
+                f"callback has {len(function_arguments)} arguments."
             )
 
-        self._callback_functions.append(callback_function)
-
     def _call_callbacks(self):
         for callback_function in self._callback_functions:
             callback_function(self.value)
 
 
+class ArrayDelta(NamedTuple):
+    """Describes how the value of an ArrayAppStateValue changed.
+
+    Attributes:
+        kind (str): "replace" (the whole array was replaced), "patch" (some rows were updated in place) or
+            "append" (rows were added at the end of the array).
+        ranges (List[Tuple[int, int]]): The (start, stop) row ranges that changed. For "replace" this is the range
+            of the whole new array and for "append" it is the range of the appended rows.
+        tail (Optional[np.ndarray]): The appended rows for "append" deltas, None otherwise.
+    """
+    kind: str
+    ranges: List[Tuple[int, int]]
+    tail: Optional[np.ndarray] = None
+
+
+class ArrayAppStateValue(AppStateValue):
+    """An AppStateValue that holds a NumPy array and supports in-place row updates and appends.
+
+    Subscribers registered with "subscribe" are called with the new value, exactly as for a regular AppStateValue.
+    Subscribers registered with "subscribe_delta" are also given an ArrayDelta, so they can patch or stream the
+    changed rows (e.g. using ColumnDataSource.patch/stream) instead of recomputing everything.
+
+    Note! "value" returns a view of the internal buffer. It should be treated as read-only, use "patch" and
+    "append" to modify it.
+
+    Usage:
+        measurements = ArrayAppStateValue(np.zeros(1000))
+        measurements.subscribe_delta(lambda new_value, delta: print(delta.kind, delta.ranges))
+
+        measurements.patch(slice(10, 20), 1.0)  # prints: patch [(10, 20)]
+        measurements.append([1.0, 2.0])  # prints: append [(1000, 1002)]
+    """
+
+    def __init__(self, value: Optional[Any] = None):
+        super().__init__()
+        self._delta_callback_functions: List[Callable] = []
+
+        # The array is stored in a buffer that may be larger than the value itself, which makes appends amortized
+        # O(appended rows) instead of O(total rows).
+        self._buffer: Optional[np.ndarray] = None
+        self._length = 0
+
+        if value is not None:
+            self._store(value)
+
+    @property
+    def value(self) -> Optional[np.ndarray]:
+        if self._buffer is None:
+            return None
+        return self._buffer[:self._length]
+
+    @value.setter
+    def value(self, new_value: Optional[Any]):
+        if new_value is None:
+            if self._buffer is None:
+                return
+            self._buffer = None
+            self._length = 0
+            self._notify(ArrayDelta("replace", []))
+            return
+
+        new_array = np.asarray(new_value)
+        current_value = self.value
+        if current_value is not None and current_value.dtype == new_array.dtype \
+                and np.array_equal(current_value, new_array):
+            return
+
+        self._store(new_array)
+        self._notify(ArrayDelta("replace", [(0, self._length)]))
+
+    def patch(self, index: Union[int, slice], values: Any):
+        """Updates rows of the array in place.
+
+        Subscribers are notified only if at least one of the rows actually changed, and the delta contains only
+        the ranges of rows that changed.
+
+        Args:
+            index (Union[int, slice]): The row, or a contiguous slice of rows, to update.
+            values (Any): The new values. They are broadcast to the shape of the updated rows.
+
+        Raises:
+            ValueError: If the value is empty or if the slice is not contiguous.
+        """
+        current_value = self.value
+        if current_value is None:
+            raise ValueError("Cannot patch an array value that has not been set.")
+
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._length)
+            if step != 1:
+                raise ValueError("Only contiguous slices (with a step of 1) can be patched.")
+            stop = max(start, stop)
+        else:
+            start = range(self._length)[index]
+            stop = start + 1
+
+        rows = current_value[start:stop]
+        new_rows = np.broadcast_to(np.asarray(values, dtype=current_value.dtype), rows.shape)
+
+        changed_rows = (rows != new_rows).reshape(len(rows), -1).any(axis=1)
+        if not changed_rows.any():
+            return
+
+        rows[...] = new_rows
+        self._notify(ArrayDelta("patch", self._get_changed_ranges(changed_rows, start)))
+
+    def append(self, values: Any):
+        """Appends rows to the end of the array.
+
+        Args:
+            values (Any): A single row or a sequence of rows to append.
+        """
+        if self._buffer is None:
+            self._store(values)
+            self._notify(ArrayDelta("append", [(0, self._length)], self.value))
+            return
+
+        tail = np.asarray(values, dtype=self._buffer.dtype)
+        if tail.ndim == self._buffer.ndim - 1:
+            tail = tail[np.newaxis]
+
+        if len(tail) == 0:
+            return
+
+        start = self._length
+        stop = start + len(tail)
+
+        # Grow the buffer geometrically so that repeated appends do not copy the whole array each time.
+        if stop > len(self._buffer):
+            buffer = np.empty((max(stop, 2 * len(self._buffer)), *self._buffer.shape[1:]), dtype=self._buffer.dtype)
+            buffer[:start] = self._buffer[:start]
+            self._buffer = buffer
+
+        self._buffer[start:stop] = tail
+        self._length = stop
+        self._notify(ArrayDelta("append", [(start, stop)], self._buffer[start:stop]))
+
+    def subscribe_delta(self, callback_function: Callable[[Any, ArrayDelta], None]):
+        """Subscribes a callback that is called with both the new value and an ArrayDelta.
+
+        Args:
+            callback_function (Callable[[Any, ArrayDelta], None]): The function to call when the value changes.
+        """
+        self._validate_callback(callback_function, ("new_value", "delta"))
+        self._delta_callback_functions.append(callback_function)
+
+    def _store(self, value: Any):
+        # Copy the array so that in-place updates never modify an array owned by the caller.
+        self._buffer = np.array(value)
+        if self._buffer.ndim == 0:
+            self._buffer = self._buffer[np.newaxis]
+        self._length = len(self._buffer)
+
+    def _notify(self, delta: ArrayDelta):
+        self._call_callbacks()
+        for callback_function in self._delta_callback_functions:
+            callback_function(self.value, delta)
+
+    @staticmethod
+    def _get_changed_ranges(changed_rows: np.ndarray, offset: int) -> List[Tuple[int, int]]:
+        """Converts a boolean mask of changed rows to a list of contiguous (start, stop) ranges.
+        """
+        padded = np.concatenate(([False], changed_rows, [False]))
+        edges = np.flatnonzero(padded[1:] != padded[:-1]) + offset
+        return [(int(start), int(stop)) for start, stop in zip(edges[::2], edges[1::2])]
+
+
 class AppState:
     """ This class is used to store data that is shared by different components in the app.
     For example, if one component is used to calculate the area under a plot and another one is used to save that
@@ -80,10 +267,41 @@ class AppState:
 
         # print the current value of your stored value
         print(state["plot_area"])
+
+    Undo/Redo:
+        # keep up to 50 versions of the "plot_area" and "selection" values, using at most 100MB
+        state = AppState(history_depth=50, history_max_bytes=100 * 2**20, history_keys=["plot_area", "selection"])
+
+        state["plot_area"] = 1
+        state.checkpoint()
+        state["plot_area"] = 2
+        state.checkpoint()
+
+        state.undo()  # the "plot_area" value is set back to 1 (and its callback functions are called)
+        state.redo()  # the "plot_area" value is set back to 2
     """
 
-    def __init__(self, persistent_keys: Optional[Iterable[str]] = None):
+    def __init__(
+        self,
+        persistent_keys: Optional[Iterable[str]] = None,
+        history_depth: int = 0,
+        history_max_bytes: Optional[int] = None,
+        history_keys: Optional[Iterable[str]] = None,
+    ):
+        """Initializes an AppState instance.
+
+        Args:
+            persistent_keys (Optional[Iterable[str]], optional): Keys whose values are stored as cookies.
+                Defaults to None.
+            history_depth (int, optional): The number of versions to keep for undo/redo. Defaults to 0 (disabled).
+            history_max_bytes (Optional[int], optional): The approximate maximal memory that the history may occupy.
+                Defaults to None (no budget).
+            history_keys (Optional[Iterable[str]], optional): The keys to include in the history. Defaults to None
+                (all keys, except for TRANSIENT_KEYS).
+        """
         self._values: Dict[str, AppStateValue] = {}
+        self._history = StateHistory(history_depth, history_max_bytes) if history_depth else None
+        self._history_keys = set(history_keys) if history_keys is not None else None
 
         if persistent_keys:
             self._add_persistent_values(persistent_keys)
@@ -110,6 +328,114 @@ class AppState:
             self._values[key] = AppStateValue()
         self._values[key].subscribe(callback_function)
 
+    @property
+    def can_undo(self) -> bool:
+        return self._get_history().can_undo
+
+    @property
+    def can_redo(self) -> bool:
+        return self._get_history().can_redo
+
+    def checkpoint(self) -> bool:
+        """ record the current values as a new version in the history
+
+        Unchanged values (and unchanged parts of dict, list and tuple values) are shared with the previous version,
+        so a checkpoint costs memory proportional to what changed since the previous one.
+
+        Returns:
+            True if a new version was recorded, False if nothing changed since the last checkpoint
+        """
+        history = self._get_history()
+        return history.record({
+            key: state_value.value
+            for key, state_value in self._values.items()
+            if self._is_history_key(key)
+        })
+
+    def undo(self) -> bool:
+        """ restore the values of the previous version in the history
+
+        Changes that were made since the last checkpoint are recorded first, so undo always restores the values
+        of the version that precedes the current values.
+
+        Returns:
+            True if the values were restored, False if there is no version to undo to
+        """
+        history = self._get_history()
+        self.checkpoint()
+        current_version = history.current
+        return self._restore_version(history.undo(), current_version)
+
+    def redo(self) -> bool:
+        """ restore the values of the next version in the history
+
+        Returns:
+            True if the values were restored, False if there is no version to redo to
+        """
+        history = self._get_history()
+        current_version = history.current
+        return self._restore_version(history.redo(), current_version)
+
+    def _is_history_key(self, key: str) -> bool:
+        if self._history_keys is None:
+            return key not in TRANSIENT_KEYS
+        return key in self._history_keys
+
+    def _get_history(self) -> StateHistory:
+        if self._history is None:
+            raise ValueError("The state history is disabled, set \"history_depth\" to enable it.")
+        return self._history
+
+    def _restore_version(self, version: Optional[Dict[str, Any]], current_version: Dict[str, Any]) -> bool:
+        """Sets the values of a recorded version.
+
+        Only values that differ from the current version are set. They are copied, since the recorded versions
+        must not be modified by changes that are made in place to the live values.
+        """
+        if version is None:
+            return False
+
+        for key, value in version.items():
+            if current_version.get(key) is not value:
+                self[key] = copy.deepcopy(value) if not isinstance(value, np.ndarray) else value.copy()
+
+        return True
+
+    def add_array_value(self, key: str, value: Optional[Any] = None) -> ArrayAppStateValue:
+        """Stores an array value that supports in-place patches and appends with delta notifications.
+
+        If the key already holds a regular value, it is converted into an array value and its existing
+        callback functions are kept.
+
+        Args:
+            key: a unique key identifying your stored value
+            value: the initial value of the array
+
+        Returns:
+            ArrayAppStateValue: the stored value, use its "patch" and "append" methods to modify it in place
+        """
+        state_value = self._values.get(key)
+
+        if not isinstance(state_value, ArrayAppStateValue):
+            array_value = ArrayAppStateValue(value if value is not None or state_value is None else state_value.value)
+            if state_value is not None:
+                array_value._callback_functions = state_value._callback_functions
+            self._values[key] = array_value
+
+        elif value is not None:
+            state_value.value = value
+
+        return self._values[key]
+
+    def on_delta(self, key: str, callback_function: Callable):
+        """ assign a callback function that is called with both the new value and an ArrayDelta to an array value
+
+        Args:
+            key: a unique key identifying your stored array value (see "add_array_value")
+            callback_function: the function to call when the array changes
+        """
+        self.add_array_value(key).subscribe_delta(callback_function)
+
     def _set_persistent_value(self, key: str, value: Optional[Any] = None):
         self[key] = value
         self.on_change(key, partial(self._store_cookie_callback, cookie_name=key))
@@ -1,33 +1,88 @@
 import logging
-from bokeh.models.widgets.markups import Div
-from bokeh.models import CustomJS
+from contextlib import contextmanager
+from typing import Iterator
 from bokeh.layouts import column
 
+from mz_bokeh_package.custom_widgets import LoadingIndicator
+
 logger = logging.getLogger(__name__)
 
+SHOW_DELAY = 300
+MIN_DISPLAY_TIME = 500
+
 
 class LoadingSpinner:
+    """Controls the loading spinner of the page.
+
+    The spinner is controlled by a single boolean property of a dedicated model, so each activation or
+    deactivation costs (at most) a single tiny patch. The spinner is shown only if the app is still loading
+    after "show_delay" milliseconds, and it stays visible for at least "min_display_time" milliseconds, hence
+    short operations cause no flicker.
+
+    Overlapping operations should use "acquire"/"release" (or the "loading" context manager), which are
+    reference-counted: the spinner is turned off only once all the operations are done.
+
+    Usage:
+        spinner = LoadingSpinner()
+
+        with spinner.loading():
+            run_long_operation()
+    """
+
+    def __init__(self, show_delay: int = SHOW_DELAY, min_display_time: int = MIN_DISPLAY_TIME):
+        """Initializes a LoadingSpinner instance.
 
-    def __init__(self):
-        # add a dummy element that will trigger the event for enabling/disabling the loading spinner
-        self._loader_trigger = Div(text="1", visible=False)
-        self._callback = CustomJS(code="")
-        self._loader_trigger.js_on_change('text', self._callback)
-        self._enabled = True
+        Args:
+            show_delay (int, optional): The number of milliseconds to wait before showing the spinner.
+                Defaults to SHOW_DELAY.
+            min_display_time (int, optional): The minimal number of milliseconds the spinner is displayed once shown.
+                Defaults to MIN_DISPLAY_TIME.
+        """
+        # The spinner is enabled while the app is loading.
+        self._activations = 1
+        self._indicator = LoadingIndicator(
+            active=True,
+            show_delay=show_delay,
+            min_display_time=min_display_time,
+            visible=False,
+        )
 
-        self.layout = column(self._loader_trigger, name="loader_trigger")
+        self.layout = column(self._indicator, name="loader_trigger")
 
     @property
-    def enabled(self):
-        return self._enabled
+    def enabled(self) -> bool:
+        return self._indicator.active
 
     @enabled.setter
     def enabled(self, value: bool):
-        """enable/disable loading mode """
-        self._enabled = value
-        visibility = 'visible' if value else 'hidden'
-        self._callback.code = f"""
-            document.getElementById('loading-spinner-invoker').style.visibility = '{visibility}';
+        """enable/disable loading mode, regardless of the number of active operations """
+        self._activations = 1 if value else 0
+        self._set_active(value)
+
+    def acquire(self):
+        """Enables loading mode for an operation. Each call should be followed by a call to "release".
+        """
+        self._activations += 1
+        self._set_active(True)
+
+    def release(self):
+        """Marks an operation as done. Loading mode is disabled once all the operations are done.
         """
-        logger.debug(f"Loading spinner is {visibility}")
-        self._loader_trigger.text = str(int(self._loader_trigger.text) + 1)
+        self._activations = max(self._activations - 1, 0)
+        if self._activations == 0:
+            self._set_active(False)
+
+    @contextmanager
+    def loading(self) -> Iterator[None]:
+        """A context manager that enables loading mode while the context is active.
+        """
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def _set_active(self, value: bool):
+        # Bokeh sends a patch only if the property value actually changes.
+        self._indicator.active = value
+        logger.debug(f"Loading spinner is {'visible' if value else 'hidden'}")
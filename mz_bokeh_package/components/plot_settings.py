@@ -1,29 +1,40 @@
 """This module includes the PlotSettings class that implements a plot tool that
 allows modifying various properties of the plot.
 """
+from contextlib import nullcontext
 import os
 from pathlib import Path
 import re
 import itertools
+import weakref
 import numpy as np
 from typing import Any, Dict, List, Optional, Tuple
 from bokeh.io import curdoc
 from bokeh.plotting import Figure
+from bokeh.document import Document
+from bokeh.themes import Theme
 from bokeh.core.enums import Anchor
 from bokeh.palettes import Category10
 from bokeh.models.renderers import GlyphRenderer
+from bokeh.models.glyphs import Scatter
 from bokeh.models import (
+    CategoricalColorMapper,
+    ColumnDataSource,
     CustomAction,
     Spinner,
     Button,
     CheckboxGroup,
     CustomJS,
     Column,
+    Plot,
     Toggle,
 )
+from bokeh.model import Model
 
 from mz_bokeh_package.components import AppState
 from mz_bokeh_package.custom_widgets import CustomSelect, CustomMultiSelect
+from mz_bokeh_package.utilities import BokehUtilities, GroupIndex, consolidate_renderers
+from mz_bokeh_package.utilities.colors import find_darker_shade, find_darker_shades
 
 BASE_DIR = os.path.dirname(__file__)
 
@@ -59,6 +70,9 @@ PLOT_DIMENSION_STEP = 50
 PLOT_DIMENSION_MIN = 300
 PLOT_DIMENSION_MAX = 1500
 LEGEND_POSITIONS = [position for position in Anchor if "_" in position]
+OUTPUT_BACKENDS = [("auto", "Auto"), ("canvas", "Canvas"), ("webgl", "WebGL")]
+# The number of points (across all the plot's data sources) from which the "auto" output backend is WebGL.
+WEBGL_POINTS_THRESHOLD = 10000
 POINT_SHAPES = [
     "asterisk",
     "circle",
@@ -90,6 +104,41 @@ POINT_SHAPES = [
 ]
 PLOT_DIMENSIONS_SETTINGS = ["custom_plot_dimensions", "plot_height", "plot_width", "aspect_ratio"]
 BASE_SETTINGS = ["grid_lines", "axes_thickness", "plot_outline", *PLOT_DIMENSIONS_SETTINGS]
+RENDERERS_SETTINGS = [
+    "point_size",
+    "point_color",
+    "multi_point_color",
+    "line_thickness",
+    "line_color",
+    "multi_line_color",
+    "fill_color",
+]
+
+# The glyph properties that the colors settings set. Settings that set the same properties override each other.
+COLORS_SETTINGS_PROPERTIES = {
+    "point_color": {"fill_color", "line_color"},
+    "multi_point_color": {"fill_color", "line_color"},
+    "line_color": {"line_color"},
+    "multi_line_color": {"line_color"},
+    "fill_color": {"fill_color"},
+}
+
+# Settings whose setters override (or depend on) the plot properties of other settings. When a setting changes,
+# its dependent settings (and theirs) are applied again, in the order of the included settings, even if their own
+# values didn't change.
+# Note! The renderers' settings (RENDERERS_SETTINGS) are applied again whenever the renderers are replaced (e.g. by
+# the "point_shape" setting) or their data changes, see _invalidate_renderers_settings.
+SETTINGS_DEPENDENCIES = {
+    "axes_thickness": ["plot_outline"],
+    "custom_plot_dimensions": ["plot_height", "plot_width", "aspect_ratio"],
+    **{
+        setting_id: [
+            other_setting_id for other_setting_id, other_properties in COLORS_SETTINGS_PROPERTIES.items()
+            if other_setting_id != setting_id and properties & other_properties
+        ]
+        for setting_id, properties in COLORS_SETTINGS_PROPERTIES.items()
+    },
+}
 
 
 def get_options_from_ids(ids: List[str]) -> List[Tuple[str]]:
@@ -124,9 +173,122 @@ SETTINGS = {
     "fill_color": (CustomSelect, {"title": "Fill color", "options": [*POINT_COLORS.items()], "allow_non_selected": False}),  # noqa: E501
     "show_legend": (CheckboxGroup, {"labels": ["Legend"]}),
     "legend_position": (CustomSelect, {"title": "Legend Position", "options": get_options_from_ids(LEGEND_POSITIONS), "allow_non_selected": False}),  # noqa: E501
+    "output_backend": (CustomSelect, {"title": "Rendering", "options": OUTPUT_BACKENDS, "allow_non_selected": False}),  # noqa: E501
+}
+
+# Replaces the view of a plot (cb_obj) with a new one, for the changes of properties that are read only when a view is
+# created (e.g. "output_backend") to take effect. Plots that are document roots are rendered again only on reload.
+RERENDER_PLOT_JS_CODE = """
+const find_parent_view = (view) => {
+    for (const child_view of view.child_views || []) {
+        if (child_view == null) {
+            continue
+        }
+        if (child_view.model === cb_obj) {
+            return view
+        }
+        const parent_view = find_parent_view(child_view)
+        if (parent_view != null) {
+            return parent_view
+        }
+    }
+    return null
+}
+
+for (const root_view of Object.values(Bokeh.index)) {
+    const parent_view = find_parent_view(root_view)
+    if (parent_view != null) {
+        parent_view._child_views.get(cb_obj).remove()
+        parent_view._child_views.delete(cb_obj)
+        parent_view.rebuild()
+    }
+}
+"""
+
+# Maps the settings that can be expressed by a Bokeh theme to functions that receive the setting's value and the
+# values of all the settings, and return the theme attributes (by model name) that express the setting.
+THEME_ATTRS = {
+    "grid_lines": lambda value, values: {"Grid": {"visible": value}},
+    "plot_outline": lambda value, values: {"Plot": {
+        "outline_line_alpha": 1 if value else 0,
+        "outline_line_dash": "solid",
+        "outline_line_color": "black",
+        "outline_line_width": AXES_BOLD_WIDTH if values.get("axes_thickness") else AXES_NORMAL_WIDTH,
+    }},
+    "text_size": lambda value, values: {"Axis": {
+        "major_label_text_font_size": f"{value}px",
+        "axis_label_text_font_size": f"{value}px",
+    }},
+    "text_thickness": lambda value, values: {"Axis": {
+        "major_label_text_font_style": "bold" if value else "normal",
+        "axis_label_text_font_style": "bold" if value else "normal",
+    }},
+    "axes_thickness": lambda value, values: {"Axis": {
+        attr: AXES_BOLD_WIDTH if value else AXES_NORMAL_WIDTH for attr in AXES_WIDTH_ATTRIBUTES
+    }},
+    "show_legend": lambda value, values: {"Legend": {"visible": value}},
+    "legend_position": lambda value, values: {"Legend": {"location": value}},
+    "point_size": lambda value, values: {"Marker": {"size": value}},
+    "point_shape": lambda value, values: {"Scatter": {"marker": value}},
 }
 
 
+class PlotSettingsTheme(Theme):
+    """A document theme that extends the document's original theme with the themes of PlotSettings components.
+
+    The theme of each component (see PlotSettings.build_theme) is applied only to the plots that are tagged with the
+    component's theme tag (see PlotSettings.theme_tag) and to the models they reference, while the other models of
+    the document are styled by the original theme alone.
+    """
+
+    def __init__(self, base_theme: Theme):
+        super().__init__(json={})
+        self._base_theme = base_theme
+
+        # The theme attributes of the components by their tags (see PlotSettings.build_theme), and the tag of each
+        # model of a tagged plot.
+        self._tagged_attrs: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._models_tags: "weakref.WeakKeyDictionary[Model, str]" = weakref.WeakKeyDictionary()
+
+    def set_tagged_theme(self, tag: str, attrs: Dict[str, Dict[str, Any]], doc: Document):
+        """Sets the theme of the plots that are tagged with a given tag, and applies it to the document's plots.
+
+        Args:
+            tag (str): The plots' tag.
+            attrs (Dict[str, Dict[str, Any]]): The theme attributes (by model names, like the "attrs" of a theme's
+                JSON) to apply on top of the original theme to the tagged plots.
+            doc (Document): The document that the theme is installed on.
+        """
+        self._tagged_attrs[tag] = attrs
+        with BokehUtilities.combined_updates(doc):
+            for plot in doc.select({"type": Plot, "tags": tag}):
+                self.apply_to_model(plot)
+
+    def apply_to_model(self, model: Model):
+        if isinstance(model, Plot):
+            tag = next((tag for tag in model.tags if tag in self._tagged_attrs), None)
+            if tag is not None:
+                for referenced_model in model.references():
+                    self._models_tags[referenced_model] = tag
+                    if referenced_model is not model:
+                        self._apply_to_model(referenced_model, tag)
+
+        self._apply_to_model(model, self._models_tags.get(model))
+
+    def _apply_to_model(self, model: Model, tag: Optional[str]):
+        self._base_theme.apply_to_model(model)
+        if tag not in self._tagged_attrs:
+            return
+
+        # Like in Bokeh themes, the attributes of a model class apply to its subclasses, which may override them.
+        properties: Dict[str, Any] = {}
+        for cls in reversed(type(model).__mro__):
+            properties.update(self._tagged_attrs[tag].get(cls.__name__, {}))
+
+        if properties:
+            model.apply_theme({**(model.themed_values() or {}), **properties})
+
+
 class PlotSettings:
     """This class contains widgets and logic that are common to all settings modals.
     """
@@ -150,27 +312,33 @@ class PlotSettings:
         "fill_color": COLORS_PALETTE[-2],  # Light Turquoise
         "show_legend": True,
         "legend_position": "top_right",
+        "output_backend": "auto",
     }
 
     def __init__(
         self,
         title: str,
-        plot: Figure,
+        plot: Optional[Figure],
         state: AppState,
         included_settings: Optional[List[str]] = None,
         default_values: Optional[Dict[str, Any]] = None,
+        consolidate: bool = False,
     ) -> None:
         """Initializes a PlotSettings instance.
 
         Args:
             title (str): The title of the plot settings modal.
-            plot (Figure): The plot to apply the settings to.
+            plot (Optional[Figure]): The plot to apply the settings to. If None, the settings are applied only once
+                a plot is passed to "on_apply_dialog".
             state (AppState): Bokeh application state.
             included_settings (Optional[List[str]], optional): A list of setting IDs to include in the settings modal.
                 The order in which the settings widgets are rendered matches the order they appear in this list.
                 Defaults to None.
             default_values (Optional[Dict[str, Any]], optional): A dictionary that maps settings to
                 their default values. For example, {"show_legend": False}. Defaults to None.
+            consolidate (bool, optional): Whether to consolidate the renderers of the plot (one per group) into a
+                single renderer (see consolidate_renderers), so the cost of applying the settings doesn't grow with
+                the number of groups. Defaults to False.
             configure_jinja_env (bool, optional): Whether to configure the jinja environment or not. Defaults to True.
         """
 
@@ -178,8 +346,27 @@ class PlotSettings:
         self._plot = plot
         self._state = state
         self._included_settings = included_settings or BASE_SETTINGS
+        self._consolidate = consolidate
         self._plot_tool_description = "Plot Settings"
 
+        # The values of the settings that are currently applied to the plot.
+        self._applied_values: Dict[str, Any] = {}
+
+        # The renderers of each plot that the renderers' settings were applied to, and the plots whose renderers' data
+        # changed since then (see _invalidate_renderers_settings).
+        self._applied_renderers: "weakref.WeakKeyDictionary[Figure, List[GlyphRenderer]]" = \
+            weakref.WeakKeyDictionary()
+        self._plots_with_changed_data: "weakref.WeakSet[Figure]" = weakref.WeakSet()
+        self._watched_sources: "weakref.WeakSet[ColumnDataSource]" = weakref.WeakSet()
+
+        # Whether the settings' widgets are being set to given values, in which case their callbacks ignore the changes.
+        self._setting_widgets_values = False
+
+        # The document that the settings' theme is installed on (see install_theme), and the theme's values.
+        self._theme_document: Optional[Document] = None
+        self._theme_values: Dict[str, Any] = {}
+        self._group_index = GroupIndex()
+
         # Update settings' default values
         if default_values:
             self.default_values.update(default_values)
@@ -187,6 +374,9 @@ class PlotSettings:
         # Initialize settings' widgets
         self._init_included_widgets()
 
+        # Renders a plot again (in the browser) once its output backend is changed
+        self._rerender_plot_callback = CustomJS(code=RERENDER_PLOT_JS_CODE)
+
         # Create a dummy widget to allow invoking a backend callback (python) from the frontend (javascript)
         self._backend_callback_invoker = Toggle()
         self._backend_callback_invoker.on_change("active", self._update_widgets_values)
@@ -197,7 +387,8 @@ class PlotSettings:
             icon=Path(BASE_DIR, "../assets/img/settings-icon.png"),
             callback=self._get_settings_button_click_js_callback(),
         )
-        self._plot.add_tools(self._settings_plot_tool)
+        if self._plot is not None:
+            self._prepare_plot(self._plot)
 
         # "Apply" button
         self._apply_dialog_btn = Button(
@@ -345,37 +536,14 @@ class PlotSettings:
 
     @_point_shape.setter
     def _point_shape(self, value: str):
-        # Fetch the glyph renderer's "create" method
-        create_glyph = getattr(self._plot, value)
-
-        # Get glyphs kwargs
-        glyph_kwargs = self._get_glyph_kwargs()
-
-        fill_alpha = 0 if value.endswith(("_dot", "_cross", "_y", "_x")) else 1
-
-        for kwargs in glyph_kwargs:
-            # The "Circle" glyph has no "marker" attribute,
-            # hence it should be removed from kwargs.
-            if value == "circle":
-                kwargs.pop("marker", None)
+        glyphs = [renderer.glyph for renderer in self._plot.renderers]
 
-            kwargs["fill_alpha"] = fill_alpha
-
-            # Make sure that the selection_glyph and the nonselection_glyphs are
-            # instantiated along with the newly created glyph.
-            kwargs["selection_color"] = COLORS_PALETTE[COLORS_NAMES.index("Light Turquoise")]
-            kwargs["nonselection_color"] = COLORS_PALETTE[COLORS_NAMES.index("Light Turquoise")]
-
-            # Create the glyph renderer
-            create_glyph(**kwargs)
-
-        # remove previous renderers
-        self._plot.renderers = self._plot.renderers[len(glyph_kwargs):]
-
-        # Update legend
-        if getattr(self._plot, "legend"):
-            for renderer, legend_item in zip(self._plot.renderers, self._plot.legend.items):
-                legend_item.renderers = [renderer]
+        # "Scatter" glyphs can render any marker (including a circle), hence their marker is changed in place.
+        # The renderers are recreated only if they have glyphs of other types (e.g. "Circle").
+        if all(isinstance(glyph, Scatter) for glyph in glyphs):
+            self._set_marker(value)
+        elif not all(type(glyph).__name__.lower() == value for glyph in glyphs):
+            self._recreate_renderers(value)
 
     @property
     def _point_color(self) -> str:
@@ -445,9 +613,7 @@ class PlotSettings:
         renderers_num = len(self._plot.renderers)
 
         if renderers_num == 1:
-            renderer = self._plot.renderers[0]
-            color_field_name = renderer.glyph.line_color
-            return [*{*renderer.data_source.data[color_field_name]}]
+            return self._get_colors_by_field(self._plot.renderers[0].glyph.line_color)
         else:
             return [renderer.glyph.line_color for renderer in self._plot.renderers]
 
@@ -455,25 +621,24 @@ class PlotSettings:
     def _multi_line_color(self, value: List[str]):
         renderers_num = len(self._plot.renderers)
         if renderers_num == 1:
-            self._set_colors_by_field(value)
+            self._set_colors_by_field(value, ["line_color"])
 
         else:
             colors = self._fill_missing_colors(value, len(self._plot.renderers))
+            darker_shades = find_darker_shades(colors).tolist()
 
-            for color, renderer in zip(colors, self._plot.renderers):
+            for color, darker_shade, renderer in zip(colors, darker_shades, self._plot.renderers):
                 renderer.glyph.line_color = color
 
                 if getattr(renderer, "hover_glyph"):
-                    renderer.hover_glyph.line_color = self._find_darker_shade(color)
+                    renderer.hover_glyph.line_color = darker_shade
 
     @property
     def _multi_point_color(self) -> List[str]:
         renderers_num = len(self._plot.renderers)
 
         if renderers_num == 1:
-            renderer = self._plot.renderers[0]
-            color_field_name = renderer.glyph.fill_color
-            return [*{*renderer.data_source.data[color_field_name]}]
+            return self._get_colors_by_field(self._plot.renderers[0].glyph.fill_color)
         else:
             return [renderer.glyph.fill_color for renderer in self._plot.renderers]
 
@@ -482,17 +647,17 @@ class PlotSettings:
         renderers_num = len(self._plot.renderers)
 
         if renderers_num == 1:
-            self._set_colors_by_field(value)
+            self._set_colors_by_field(value, ["fill_color", "line_color"])
 
         else:
             colors = self._fill_missing_colors(value, len(self._plot.renderers))
+            darker_shades = find_darker_shades(colors).tolist()
 
-            for color, renderer in zip(colors, self._plot.renderers):
+            for color, darker_shade, renderer in zip(colors, darker_shades, self._plot.renderers):
                 renderer.glyph.fill_color = color
                 renderer.glyph.line_color = color
 
                 if getattr(renderer, "hover_glyph"):
-                    darker_shade = self._find_darker_shade(color)
                     renderer.hover_glyph.fill_color = darker_shade
                     renderer.hover_glyph.line_color = darker_shade
 
@@ -525,6 +690,40 @@ class PlotSettings:
     def _legend_position(self, value: str):
         self._plot.legend.location = value
 
+    @property
+    def _output_backend(self) -> str:
+        output_backend = self._plot.output_backend
+
+        # The "auto" setting is reported as long as the plot's backend matches it.
+        if self._applied_values.get("output_backend") == "auto" and output_backend == self._get_auto_output_backend():
+            return "auto"
+
+        return output_backend
+
+    @_output_backend.setter
+    def _output_backend(self, value: str):
+        # The output backend of a plot is chosen when the plot is rendered, hence the plot is rendered again in the
+        # browser once its backend is changed.
+        callbacks = self._plot.js_property_callbacks.get("change:output_backend", [])
+        if self._rerender_plot_callback not in callbacks:
+            self._plot.js_on_change("output_backend", self._rerender_plot_callback)
+
+        self._plot.output_backend = self._get_auto_output_backend() if value == "auto" else value
+
+    def _get_auto_output_backend(self) -> str:
+        """Returns the output backend of the "auto" setting, WebGL for plots with many points and canvas otherwise.
+
+        Returns:
+            str: The output backend.
+        """
+        sources = {
+            renderer.data_source for renderer in self._plot.renderers
+            if isinstance(renderer, GlyphRenderer) and isinstance(renderer.data_source, ColumnDataSource)
+        }
+        points_num = sum(max((len(column) for column in source.data.values()), default=0) for source in sources)
+
+        return "webgl" if points_num >= WEBGL_POINTS_THRESHOLD else "canvas"
+
     def _init_included_widgets(self):
         """Initializes Bokeh widgets based on included settings.
         """
@@ -549,7 +748,13 @@ class PlotSettings:
             CustomJS: "on_click" Javascript callback.
         """
 
-        args = {"backend_callback_invoker": self._backend_callback_invoker}
+        args = {
+            "backend_callback_invoker": self._backend_callback_invoker,
+            "settings_widgets": {
+                setting_id: self._get_setting_widget(setting_id)
+                for setting_id in self._included_settings
+            },
+        }
         code = f"""
         // Add "data" attributes to the "Settings" tool to allow toggling the modal.
         $(".bk-toolbar-button-custom-action[title='{self._plot_tool_description}']").attr("data-toggle", "modal")
@@ -567,8 +772,16 @@ class PlotSettings:
         $(".reset-plot-settings > .bk-btn-group > .bk-btn:not([class*='material-icons'])").addClass("material-icons")
         $(".reset-plot-settings > .bk-btn-group > .bk-btn").removeClass("bk bk-btn-default")
 
-        // Invoke backend callback
-        backend_callback_invoker.active = !backend_callback_invoker.active
+        // Restore the widgets' values from the snapshot of the applied settings. The backend callback, which reads
+        // the values from the plot, is invoked only if the plot was changed since the settings were applied.
+        const [applied_settings] = backend_callback_invoker.tags
+        if (applied_settings == null || applied_settings.stale) {{
+            backend_callback_invoker.active = !backend_callback_invoker.active
+        }} else {{
+            for (const [setting_id, widget_values] of Object.entries(applied_settings.snapshot)) {{
+                settings_widgets[setting_id].setv(widget_values)
+            }}
+        }}
         """
         return CustomJS(args=args, code=code)
 
@@ -581,35 +794,279 @@ class PlotSettings:
         causes a creation of a new Figure instance. In such case, the histogram component can use this function
         in order to apply the plot settings on the newly created plot.
 
+        Only the settings whose values changed since they were last applied (and the settings that depend on them, see
+        SETTINGS_DEPENDENCIES) are applied, unless a new plot is given, in which case all the settings are applied,
+        except for the settings that the installed theme (see install_theme) already applied to the new plot.
+        The plot changes are held until all the settings are applied (see BokehUtilities.combined_updates).
+
         Args:
             new_plot (Optional[Figure], optional): The newly created Figure instance. Defaults to None.
         """
+        state = {
+            setting_id: self._get_setting_widget_value(setting_id)
+            for setting_id in self._included_settings
+        }
+
         if isinstance(new_plot, Figure):
             self._plot = new_plot
-            self._plot.add_tools(self._settings_plot_tool)
+            self._prepare_plot(self._plot)
+            self._applied_values = self._get_themed_values(state)
+            self._update_applied_renderers()
+
+        # Without a plot, the settings are only saved (and applied to the plot that is given later).
+        if self._plot is not None:
+            self._apply_settings(state)
+
+        # Save the state as a cookie
+        self._plot_settings_state = state
+
+        self._update_applied_settings_snapshot(state)
+        self._update_theme(state)
+
+    def _prepare_plot(self, plot: Figure):
+        """Adds the settings tool to a plot, consolidates its renderers (if required), and tags it with the theme
+        tag (see install_theme).
+        """
+        if self._consolidate:
+            consolidate_renderers(plot)
+
+        plot.add_tools(self._settings_plot_tool)
+
+        if self.theme_tag not in plot.tags:
+            plot.tags = [*plot.tags, self.theme_tag]
+
+            # A plot that was created without the tag is themed once it's tagged.
+            if self._theme_document is not None and isinstance(self._theme_document.theme, PlotSettingsTheme):
+                self._theme_document.theme.apply_to_model(plot)
+
+    @property
+    def theme_tag(self) -> str:
+        """The tag of the plots that the settings' theme applies to (see install_theme).
+        """
+        return f"plot-settings-theme-{self._settings_plot_tool.id}"
 
-        state = {}
+    def build_theme(self, values: Optional[Dict[str, Any]] = None) -> Theme:
+        """Compiles the settings that can be expressed by a theme (see THEME_ATTRS) into a Bokeh theme.
+
+        Args:
+            values (Optional[Dict[str, Any]], optional): A dictionary that maps the included settings to their values.
+                Defaults to None (the saved settings).
+
+        Returns:
+            Theme: A theme that applies the settings to the plots that are added to a document.
+        """
+        return Theme(json={"attrs": self._build_theme_attrs(values or self._plot_settings_state)})
+
+    def _build_theme_attrs(self, values: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Returns the theme attributes (by model names) that express the included settings (see THEME_ATTRS).
+        """
+        attrs: Dict[str, Dict[str, Any]] = {}
 
         for setting_id in self._included_settings:
-            value = self._get_setting_widget_value(setting_id)
+            if setting_id not in THEME_ATTRS:
+                continue
 
-            # Update the plot based on the applied setting
-            self._set_setting_property(setting_id, value)
+            for model_name, model_attrs in THEME_ATTRS[setting_id](values[setting_id], values).items():
+                attrs.setdefault(model_name, {}).update(model_attrs)
 
-            state[setting_id] = value
+        return attrs
 
-        # Save the state as a cookie
-        self._plot_settings_state = state
+    def install_theme(self, doc: Optional[Document] = None):
+        """Installs the settings' theme (see build_theme) on a document, and keeps it updated as settings are applied.
+
+        The theme applies only to the plots that are tagged with the theme tag, i.e. the plots of this component and
+        plots that are created with the tag, on top of the document's original theme (see PlotSettingsTheme). Such
+        plots are created with the settings that the theme expresses, hence when a plot is replaced (see
+        on_apply_dialog), only the other settings are applied to the new plot. For example:
+
+            new_plot = figure(tags=[settings.theme_tag])
+
+        Args:
+            doc (Optional[Document], optional): The document to install the theme on. Defaults to the current document.
+        """
+        self._theme_document = doc or curdoc()
+        self._theme_values = {}
+        self._update_theme(self._plot_settings_state)
+
+    def _update_theme(self, values: Dict[str, Any]):
+        theme_values = {
+            setting_id: values[setting_id]
+            for setting_id in self._included_settings
+            if setting_id in THEME_ATTRS
+        }
+
+        # Applying the theme restyles all the models of the tagged plots, hence it's done only if it changed.
+        if self._theme_document is None or theme_values == self._theme_values:
+            return
+
+        if not isinstance(self._theme_document.theme, PlotSettingsTheme):
+            self._theme_document.theme = PlotSettingsTheme(self._theme_document.theme)
+
+        self._theme_values = theme_values
+        self._theme_document.theme.set_tagged_theme(
+            self.theme_tag, self._build_theme_attrs(values), self._theme_document
+        )
+
+    def _get_themed_values(self, values: Dict[str, Any]) -> Dict[str, Any]:
+        """Returns the settings that the installed theme already applied to the plot.
+
+        Args:
+            values (Dict[str, Any]): A dictionary that maps the included settings to their values.
+
+        Returns:
+            Dict[str, Any]: The settings (and their values) that the plot already has.
+        """
+        if self._theme_document is None:
+            return {}
+
+        # Properties that were set explicitly when the plot was created are not overridden by the theme.
+        return {
+            setting_id: value for setting_id, value in values.items()
+            if setting_id in self._theme_values and self._get_setting_property(setting_id) == value
+        }
+
+    def mark_plot_changed(self):
+        """Marks the plot as changed by another component (e.g. a component that modified the plot's glyphs).
+
+        The settings modal is normally opened with the values of the last applied settings. Once the plot is marked
+        as changed, the next opening of the modal reads the values from the plot instead. Changes of the data of the
+        plot's renderers (see _on_data_change) mark the plot as changed automatically.
+        """
+        self._mark_snapshot_stale()
+
+    def _mark_plot_stale(self, plot: Figure):
+        """Marks a plot whose renderers' data changed (see _on_data_change) as changed, if it's the current plot.
+        """
+        if plot is self._plot:
+            self._mark_snapshot_stale()
+
+    def _mark_snapshot_stale(self):
+        # Until the settings are applied there's no snapshot, and the modal reads the values from the plot anyway.
+        if self._backend_callback_invoker.tags:
+            [applied_settings] = self._backend_callback_invoker.tags
+            self._backend_callback_invoker.tags = [{**applied_settings, "stale": True}]
+
+    def _update_applied_settings_snapshot(self, values: Dict[str, Any], stale: bool = False):
+        """Stores the widgets' values of the applied settings in the browser, so the settings modal can be opened
+        without a round trip to the backend (see _get_settings_button_click_js_callback).
+
+        Args:
+            values (Dict[str, Any]): A dictionary that maps the included settings to their applied values.
+            stale (bool, optional): Whether the plot was changed since the settings were applied. Defaults to False.
+        """
+        snapshot = {
+            setting_id: self._get_setting_widget_update(setting_id, values[setting_id])
+            for setting_id in self._included_settings
+        }
+        self._backend_callback_invoker.tags = [{"snapshot": snapshot, "stale": stale}]
+
+    def _apply_settings(self, values: Dict[str, Any]):
+        """Applies the settings that changed since they were last applied to the plot, while holding the document.
+
+        Args:
+            values (Dict[str, Any]): A dictionary that maps settings to their new values.
+        """
+        with BokehUtilities.combined_updates(self._plot.document):
+            self._invalidate_renderers_settings()
+
+            for setting_id in self._get_settings_to_apply(values):
+                # Update the plot based on the applied setting
+                self._set_setting_property(setting_id, values[setting_id])
+
+            # Applying a setting may replace the renderers (see _recreate_renderers), in which case the renderers'
+            # settings are applied to the new renderers.
+            if self._invalidate_renderers_settings():
+                for setting_id in self._get_settings_to_apply(values):
+                    if setting_id in RENDERERS_SETTINGS:
+                        self._set_setting_property(setting_id, values[setting_id])
+
+    def _invalidate_renderers_settings(self) -> bool:
+        """Marks the renderers' settings as not applied if the plot's renderers were replaced, or if their data
+        changed (e.g. another component added groups that should be colored), since the settings were last applied.
+
+        Returns:
+            bool: Whether the renderers' settings were marked as not applied.
+        """
+        is_changed = self._plot in self._plots_with_changed_data or \
+            self._plot.renderers != self._applied_renderers.get(self._plot)
+        if is_changed:
+            for setting_id in RENDERERS_SETTINGS:
+                self._applied_values.pop(setting_id, None)
+
+        self._update_applied_renderers()
+        return is_changed
+
+    def _update_applied_renderers(self):
+        """Records the plot's renderers as the renderers that the settings are applied to, and watches their data.
+        """
+        self._applied_renderers[self._plot] = list(self._plot.renderers)
+        self._plots_with_changed_data.discard(self._plot)
+
+        for renderer in self._plot.renderers:
+            source = getattr(renderer, "data_source", None)
+            if isinstance(source, ColumnDataSource) and source not in self._watched_sources:
+                self._watched_sources.add(source)
+                source.on_change("data", lambda attr, old, new, source=source: self._on_data_change(source, old, new))
+
+    def _on_data_change(self, source: ColumnDataSource, old: Dict[str, Any], new: Dict[str, Any]):
+        """Marks the plots that render a data source as changed, unless only their colors fields were replaced (e.g.
+        by _set_colors_by_field).
+        """
+        plots_renderers = {
+            plot: [renderer for renderer in renderers if getattr(renderer, "data_source", None) is source]
+            for plot, renderers in self._applied_renderers.items()
+        }
+        colors_fields = {
+            getattr(renderer.glyph, color_attr, None)
+            for renderers in plots_renderers.values()
+            for renderer in renderers
+            for color_attr in ("fill_color", "line_color")
+        }
+        replaced_fields = {field for field in {*old, *new} if field not in new or new[field] is not old.get(field)}
+
+        # Streamed and patched columns are modified in place, hence no field is replaced.
+        if not replaced_fields or replaced_fields - colors_fields:
+            for plot, renderers in plots_renderers.items():
+                if renderers:
+                    self._plots_with_changed_data.add(plot)
+                    self._mark_plot_stale(plot)
+
+    def _get_settings_to_apply(self, values: Dict[str, Any]) -> List[str]:
+        """Returns the settings that should be applied in order to bring the plot to the given values.
+
+        Args:
+            values (Dict[str, Any]): A dictionary that maps settings to their new values.
+
+        Returns:
+            List[str]: The settings whose values changed since they were last applied, and the settings that depend on
+                them, ordered as in the included settings.
+        """
+        changed_settings = {
+            setting_id for setting_id, value in values.items()
+            if setting_id not in self._applied_values or self._applied_values[setting_id] != value
+        }
+
+        # The "auto" output backend depends on the plot's data, hence it's evaluated whenever the settings are applied.
+        if values.get("output_backend") == "auto":
+            changed_settings.add("output_backend")
+
+        dependent_settings = [*changed_settings]
+        while dependent_settings:
+            for setting_id in SETTINGS_DEPENDENCIES.get(dependent_settings.pop(), []):
+                if setting_id not in changed_settings:
+                    changed_settings.add(setting_id)
+                    dependent_settings.append(setting_id)
+
+        return [setting_id for setting_id in self._included_settings if setting_id in changed_settings]
 
     def _on_cancel_dialog(self):
-        for setting_id in self._included_settings:
-            setting_value = self._plot_settings_state[setting_id]
-            self._set_setting_widget_value(setting_id, setting_value)
+        self._set_settings_widgets_values(self._plot_settings_state)
 
     def _on_reset_settings(self):
-        for setting_id in self._included_settings:
-            setting_value = self.default_values[setting_id]
-            self._set_setting_widget_value(setting_id, setting_value)
+        self._set_settings_widgets_values({
+            setting_id: self.default_values[setting_id]
+            for setting_id in self._included_settings
+        })
 
     def _configure_jinja_environment(self):
         """Configures the Bokeh template's environment.
@@ -625,7 +1082,10 @@ class PlotSettings:
 
         # Add the settings modal macros directory to the Jinja environment search path.
         # This allows importing/including the settings modal macros in the Bokeh app template.
-        doc.template.environment.loader.searchpath.append(PLOT_SETTINGS_MACROS_PATH)
+        # Note! The template's environment is shared by all the documents, hence the path is added only once.
+        searchpath = doc.template.environment.loader.searchpath
+        if PLOT_SETTINGS_MACROS_PATH not in searchpath:
+            searchpath.append(PLOT_SETTINGS_MACROS_PATH)
 
         # Add template variables. These variables are necessary for generating the settings modal HTML.
         doc.template_variables["plot_settings_title"] = self._title
@@ -672,6 +1132,7 @@ class PlotSettings:
             value (Any): Value to set to the corresponding class property.
         """
         setattr(self, f"_{setting_id}", value)
+        self._applied_values[setting_id] = value
 
     def _set_setting_widget_value(self, setting_id: str, value: Any):
         """Sets the value of the corresponding widget of a given setting.
@@ -681,11 +1142,44 @@ class PlotSettings:
             value (Any): Value to set to the corresponding widget.
         """
         setting_widget = self._get_setting_widget(setting_id)
+        setting_widget.update(**self._get_setting_widget_update(setting_id, value))
 
-        if type(setting_widget).__name__ == "CheckboxGroup":
-            setting_widget.active = [0] if value else []
+    def _set_settings_widgets_values(self, values: Dict[str, Any]):
+        """Sets the values of the corresponding widgets of many settings at once.
+
+        The changes are held until all of them are made, and the widgets' callbacks of this class ignore them.
+
+        Args:
+            values (Dict[str, Any]): A dictionary that maps settings to the values to set to their widgets.
+        """
+        widgets = [self._get_setting_widget(setting_id) for setting_id in values]
+        doc = next((widget.document for widget in widgets if widget.document is not None), None)
+
+        self._setting_widgets_values = True
+        try:
+            with BokehUtilities.combined_updates(doc) if doc is not None else nullcontext():
+                for setting_id, value in values.items():
+                    self._set_setting_widget_value(setting_id, value)
+        finally:
+            self._setting_widgets_values = False
+
+        if "custom_plot_dimensions" in values:
+            self._set_plot_dimensions_widgets_state(values["custom_plot_dimensions"])
+
+    def _get_setting_widget_update(self, setting_id: str, value: Any) -> Dict[str, Any]:
+        """Returns the widget properties that represent a given setting value.
+
+        Args:
+            setting_id (str): ID of the setting.
+            value (Any): Value of the setting.
+
+        Returns:
+            Dict[str, Any]: A dictionary that maps the widget's properties to their values.
+        """
+        if type(self._get_setting_widget(setting_id)).__name__ == "CheckboxGroup":
+            return {"active": [0] if value else []}
         else:
-            setting_widget.value = value
+            return {"value": value}
 
     def _get_setting_property(self, setting_id: str) -> Any:
         return getattr(self, f"_{setting_id}")
@@ -708,16 +1202,87 @@ class PlotSettings:
             for renderer in self._plot.renderers
         ]
 
+    def _set_marker(self, marker: str):
+        """Sets the marker of the plot's "Scatter" renderers in place.
+
+        Args:
+            marker (str): The new marker.
+        """
+        fill_alpha = self._get_marker_fill_alpha(marker)
+
+        for renderer in self._plot.renderers:
+            for glyph_attr in ("glyph", "selection_glyph", "nonselection_glyph", "hover_glyph", "muted_glyph"):
+                glyph = getattr(renderer, glyph_attr)
+                if not isinstance(glyph, Scatter):
+                    continue
+
+                glyph.marker = marker
+
+                # The non-selection and muted glyphs keep their own (lower) alpha.
+                if glyph_attr in ("glyph", "selection_glyph", "hover_glyph"):
+                    glyph.fill_alpha = fill_alpha
+
+    def _recreate_renderers(self, value: str):
+        """Replaces the plot's renderers with renderers of the given marker's glyph type.
+
+        Args:
+            value (str): The new marker.
+        """
+        # Fetch the glyph renderer's "create" method
+        create_glyph = getattr(self._plot, value)
+
+        # Get glyphs kwargs
+        glyph_kwargs = self._get_glyph_kwargs()
+
+        fill_alpha = self._get_marker_fill_alpha(value)
+
+        for kwargs in glyph_kwargs:
+            # The "Circle" glyph has no "marker" attribute,
+            # hence it should be removed from kwargs.
+            if value == "circle":
+                kwargs.pop("marker", None)
+
+            kwargs["fill_alpha"] = fill_alpha
+
+            # Make sure that the selection_glyph and the nonselection_glyphs are
+            # instantiated along with the newly created glyph.
+            kwargs["selection_color"] = COLORS_PALETTE[COLORS_NAMES.index("Light Turquoise")]
+            kwargs["nonselection_color"] = COLORS_PALETTE[COLORS_NAMES.index("Light Turquoise")]
+
+            # Create the glyph renderer
+            create_glyph(**kwargs)
+
+        # remove previous renderers
+        self._plot.renderers = self._plot.renderers[len(glyph_kwargs):]
+
+        # Update legend
+        if getattr(self._plot, "legend"):
+            for renderer, legend_item in zip(self._plot.renderers, self._plot.legend.items):
+                legend_item.renderers = [renderer]
+
+    @staticmethod
+    def _get_marker_fill_alpha(marker: str) -> float:
+        # Markers that are drawn with inner lines (e.g. "circle_cross") are hollow.
+        return 0 if marker.endswith(("_dot", "_cross", "_y", "_x")) else 1
+
     def _init_plot_settings_values(self):
         """Initializes the settings values.
 
         The initial values are set to be equal to the last saved state (loaded by the AppState).
         If there is no saved state, they are default to the "default_values" class property.
         """
-        for setting_id, value in self._plot_settings_state.items():
-            self._set_setting_property(setting_id, value)
+        values = self._plot_settings_state
+
+        for setting_id, value in values.items():
+            if self._plot is not None:
+                self._set_setting_property(setting_id, value)
             self._set_setting_widget_value(setting_id, value)
 
+        if self._plot is not None:
+            self._update_applied_renderers()
+
+        self._update_applied_settings_snapshot(values)
+
     @staticmethod
     def _set_color_for_renderer(renderer: GlyphRenderer, new_color: str):
         """Set line color and fill color of a bokeh renderer for its default representation,
@@ -741,7 +1306,7 @@ class PlotSettings:
 
     @staticmethod
     def _find_darker_shade(color: str) -> str:
-        """Finds a darker shade for a given hex color.
+        """Finds a darker shade for a given hex color (see colors.find_darker_shade).
 
         Args:
             color (str): A valid hex color (e.g "#4F4F4F").
@@ -749,44 +1314,80 @@ class PlotSettings:
         Returns:
             str: A darker hex color.
         """
-        MIN = 0
-        MAX = 255
-        DELTA = 30
-        hex_color = color.lstrip("#")
-
-        # For each of the RGB parts, find a darker shade by decreasing the value (by "DELTA") and
-        # concatenate the results back together. Each result is being clipped to (MIN, MAX)
-        # in order to keep it valid.
-        return "#" + "".join(
-            "{:02x}".format(np.clip(int(hex_color[i:i+2], 16) - DELTA, MIN, MAX))
-            for i in (0, 2, 4)
-        )
+        return find_darker_shade(color)
+
+    def _get_colors_by_field(self, color_spec: Any) -> List[str]:
+        """Returns the colors of a plot that is colored by a data source field.
+
+        Args:
+            color_spec (Any): The color property of the plot's glyph, either the name of a colors field or a field with
+                a CategoricalColorMapper transform (e.g. factor_cmap).
+
+        Returns:
+            List[str]: The unique colors of the plot's groups.
+        """
+        color_mapper = self._get_color_mapper(color_spec)
+        if color_mapper is not None:
+            return [*dict.fromkeys(color_mapper.palette[:len(color_mapper.factors)])]
+
+        _, colors = self._group_index.get(self._plot.renderers[0].data_source, color_spec)
+        return colors.tolist()
 
-    def _set_colors_by_field(self, colors: List[str]):
+    def _set_colors_by_field(self, colors: List[str], color_attrs: List[str]):
         """Sets plot colors by modifying a data source field.
 
         This method assumes that the plot's data is grouped using Bokeh's
         "automatic grouping" feature (more info here: https://docs.bokeh.org/en/latest/docs/user_guide/annotations.html#automatic-grouping-browser-side)
         rather than having multiple renderers.
+        If the plot is colored through a CategoricalColorMapper (e.g. factor_cmap), only the mapper's palette is
+        modified, and the colors are mapped in the browser.
 
         Args:
             colors (List[str]): A list of colors that were chosen by the user in the settings modal.
+            color_attrs (List[str]): The color properties of the glyph to set (e.g. "fill_color" and "line_color").
         """  # noqa: E501
 
         renderer = self._plot.renderers[0]
+
+        color_specs = [getattr(renderer.glyph, color_attr, None) for color_attr in color_attrs]
+        color_mappers = {self._get_color_mapper(color_spec) for color_spec in color_specs} - {None}
+        if color_mappers:
+            for color_mapper in color_mappers:
+                color_mapper.palette = self._fill_missing_colors(colors, len(color_mapper.factors))
+            return
+
         source = renderer.data_source
-        data = source.data
-        color_field_name = getattr(renderer, "fill_color", renderer.glyph.line_color)
+        # The fill and line colors may be set by separate fields (e.g. of consolidated renderers).
+        color_fields = [*dict.fromkeys(color_spec for color_spec in color_specs if isinstance(color_spec, str))]
 
-        # The field that the data is grouped by
-        grouped_by = self._plot.legend.items[0].label["field"]
+        # The field that the data is grouped by, i.e. the label field of the renderer's legend item.
+        grouped_by = next(
+            item.label["field"] for item in self._plot.legend.items
+            if renderer in item.renderers and isinstance(item.label, dict) and "field" in item.label
+        )
 
-        groups = {*data[grouped_by]}
+        # The group index is cached as long as the grouping column doesn't change.
+        codes, groups = self._group_index.get(source, grouped_by)
         groups_colors = self._fill_missing_colors(colors, len(groups))
 
         # Set color for each group
-        criteria = [np.array(data[grouped_by]) == group_name for group_name in groups]
-        data[color_field_name] = np.select(criteria, groups_colors)
+        rows_colors = np.asarray(groups_colors)[codes]
+        for color_field in color_fields:
+            source.data[color_field] = rows_colors
+
+    @staticmethod
+    def _get_color_mapper(color_spec: Any) -> Optional[CategoricalColorMapper]:
+        """Returns the CategoricalColorMapper of a glyph's color property, if it has one.
+
+        Args:
+            color_spec (Any): The value of a glyph's color property.
+
+        Returns:
+            Optional[CategoricalColorMapper]: The color property's transform if it's a CategoricalColorMapper,
+                otherwise None.
+        """
+        transform = color_spec.get("transform") if isinstance(color_spec, dict) else None
+        return transform if isinstance(transform, CategoricalColorMapper) else None
 
     def _fill_missing_colors(self, chosen_colors: List[str], groups_num: int) -> List[str]:
         """Fills missing colors.
@@ -820,14 +1421,25 @@ class PlotSettings:
     def _update_widgets_values(self, attr, old, new):
         """Updates the widgets' values based on the current state of the plot.
         """
-        for setting_id in self._included_settings:
-            setting_value = self._get_setting_property(setting_id)
-            self._set_setting_widget_value(setting_id, setting_value)
+        values = {
+            setting_id: self._get_setting_property(setting_id)
+            for setting_id in self._included_settings
+        }
+        self._set_settings_widgets_values(values)
+
+        # The plot's current state is the applied state from now on.
+        self._applied_values.update(values)
+        self._update_applied_renderers()
+        self._update_applied_settings_snapshot(values)
 
     def _toggle_plot_dimensions(self, attr, old, new):
         """Enables/disables the "plot height" and "plot width" widgets.
         """
-        is_disabled = False if new else True
+        if not self._setting_widgets_values:
+            self._set_plot_dimensions_widgets_state(bool(new))
+
+    def _set_plot_dimensions_widgets_state(self, custom_plot_dimensions: bool):
+        is_disabled = False if custom_plot_dimensions else True
         self._get_setting_widget("plot_height").disabled = is_disabled
         self._get_setting_widget("plot_width").disabled = is_disabled
         self._get_setting_widget("aspect_ratio").disabled = not is_disabled
@@ -0,0 +1,164 @@
+"""This module includes the PlotSettingsManager class that applies a single settings modal to many plots.
+"""
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from bokeh.plotting import Figure
+
+from mz_bokeh_package.components import AppState
+from .plot_settings import PlotSettings
+
+
+class PlotSettingsManager(PlotSettings):
+    """A plot settings modal that is shared by many plots.
+
+    The manager owns a single set of settings widgets and a single settings tool, which is added to all the
+    registered plots. The settings (profile) that are applied in the modal are applied to all the registered plots,
+    hence the number of models in the document doesn't grow as plots are added.
+
+    Usage:
+        settings = PlotSettingsManager("Plot Settings", state, figures=[plot_a, plot_b])
+
+        # A plot that is created later
+        settings.register(plot_c)
+    """
+
+    def __init__(
+        self,
+        title: str,
+        state: AppState,
+        figures: Optional[List[Figure]] = None,
+        included_settings: Optional[List[str]] = None,
+        default_values: Optional[Dict[str, Any]] = None,
+        consolidate: bool = False,
+    ) -> None:
+        """Initializes a PlotSettingsManager instance.
+
+        Args:
+            title (str): The title of the plot settings modal.
+            state (AppState): Bokeh application state.
+            figures (Optional[List[Figure]], optional): The plots to apply the settings to. Defaults to None.
+            included_settings (Optional[List[str]], optional): A list of setting IDs to include in the settings modal.
+                Defaults to None.
+            default_values (Optional[Dict[str, Any]], optional): A dictionary that maps settings to
+                their default values. Defaults to None.
+            consolidate (bool, optional): Whether to consolidate the renderers of the plots (see PlotSettings).
+                Defaults to False.
+        """
+        # Maps each registered plot to the values of the settings that are applied to it. The settings operate on a
+        # single plot at a time (see _use_figure).
+        self._figures_applied_values: Dict[Figure, Dict[str, Any]] = {}
+
+        super().__init__(title, None, state, included_settings, default_values, consolidate)
+
+        for figure in figures or []:
+            self.register(figure)
+
+    @property
+    def figures(self) -> List[Figure]:
+        return [*self._figures_applied_values]
+
+    def register(self, figure: Figure):
+        """Adds the settings tool to a plot and applies the current settings to it.
+
+        Args:
+            figure (Figure): The plot to register.
+        """
+        if figure in self._figures_applied_values:
+            return
+
+        self._prepare_plot(figure)
+
+        # Settings that the installed theme (see install_theme) already applied to the plot are not applied again.
+        self._figures_applied_values[figure] = {}
+        with self._use_figure(figure):
+            self._applied_values.update(self._get_themed_values(self._plot_settings_state))
+
+        self.apply(figure)
+
+    def unregister(self, figure: Figure):
+        """Removes the settings tool from a plot. The applied settings are kept.
+
+        Args:
+            figure (Figure): The plot to unregister.
+        """
+        if self._figures_applied_values.pop(figure, None) is None:
+            raise ValueError("The plot is not registered")
+
+        figure.tools = [tool for tool in figure.tools if tool is not self._settings_plot_tool]
+
+    def apply(self, figure: Optional[Figure] = None):
+        """Applies the current (saved) settings to a registered plot, or to all of them.
+
+        Only the settings that changed since they were last applied to a plot are applied to it.
+
+        Args:
+            figure (Optional[Figure], optional): The plot to apply the settings to. Defaults to None (all the plots).
+        """
+        if figure is not None and figure not in self._figures_applied_values:
+            raise ValueError("The plot is not registered")
+
+        values = self._plot_settings_state
+        for figure in [figure] if figure is not None else self.figures:
+            self._apply_to_figure(figure, values)
+
+    def on_apply_dialog(self, new_plot: Optional[Figure] = None):
+        """Applies the settings of the settings modal to all the registered plots.
+
+        Args:
+            new_plot (Optional[Figure], optional): A plot to register before applying the settings. Defaults to None.
+        """
+        if isinstance(new_plot, Figure):
+            self.register(new_plot)
+
+        values = {
+            setting_id: self._get_setting_widget_value(setting_id)
+            for setting_id in self._included_settings
+        }
+
+        for figure in self.figures:
+            self._apply_to_figure(figure, values)
+
+        # Save the state as a cookie
+        self._plot_settings_state = values
+
+        self._update_applied_settings_snapshot(values)
+        self._update_theme(values)
+
+    def mark_plot_changed(self, figure: Optional[Figure] = None):
+        """Marks a registered plot (or all of them) as changed by another component.
+
+        The settings modal of the manager always opens with the applied settings. The next time the settings are
+        applied, all of them are applied to the changed plots (rather than only the settings that changed).
+
+        Args:
+            figure (Optional[Figure], optional): The changed plot. Defaults to None (all the plots).
+        """
+        if figure is not None and figure not in self._figures_applied_values:
+            raise ValueError("The plot is not registered")
+
+        for figure in [figure] if figure is not None else self.figures:
+            self._mark_plot_stale(figure)
+
+    def _mark_plot_stale(self, plot: Figure):
+        # The settings modal of the manager always opens with the applied settings (hence its snapshot is never
+        # stale), so all the settings are applied again to the changed plot instead.
+        if plot in self._figures_applied_values:
+            self._figures_applied_values[plot].clear()
+
+    def _apply_to_figure(self, figure: Figure, values: Dict[str, Any]):
+        with self._use_figure(figure):
+            self._apply_settings(values)
+
+    @contextmanager
+    def _use_figure(self, figure: Figure) -> Iterator[None]:
+        """Makes a registered plot the plot that the settings' properties operate on (and whose applied values they
+        update), until the context exits.
+        """
+        self._plot = figure
+        self._applied_values = self._figures_applied_values[figure]
+        try:
+            yield
+        finally:
+            self._plot = None
+            self._applied_values = {}
@@ -0,0 +1,218 @@
+"""This module includes the StateHistory class that stores versions of the AppState values for undo/redo.
+
+Versions are structurally shared: a new version reuses every value (and every part of a dict, list or tuple value)
+that did not change since the previous version, so the memory cost of a version is proportional to what changed
+rather than to the total size of the state.
+"""
+import copy
+import sys
+from typing import Any, Dict, List, Optional, Set
+
+import numpy as np
+
+_MISSING = object()
+
+
+class StateHistory:
+    """Stores a bounded list of structurally shared snapshots of the state values.
+
+    Snapshots are private to the history: changed values are copied when they are recorded (and NumPy arrays are
+    made read-only), so modifying a value of the live state in place never modifies a recorded version.
+
+    Usage:
+        history = StateHistory(max_depth=3)
+        history.record({"a": [1, 2], "b": big_array})
+        history.record({"a": [1, 3], "b": big_array})  # "b" is shared with the first version
+
+        history.undo()  # returns {"a": [1, 2], "b": big_array}
+        history.redo()  # returns {"a": [1, 3], "b": big_array}
+    """
+
+    def __init__(self, max_depth: int = 20, max_bytes: Optional[int] = None):
+        """Initializes a StateHistory instance.
+
+        Args:
+            max_depth (int, optional): The maximal number of versions to keep. Defaults to 20.
+            max_bytes (Optional[int], optional): The (approximate) maximal number of bytes the versions may occupy.
+                The oldest versions are discarded when the budget is exceeded, but the latest version is always kept.
+                Defaults to None (no budget).
+        """
+        if max_depth < 1:
+            raise ValueError(f"The history depth must be a positive integer, got {max_depth}.")
+
+        self._max_depth = max_depth
+        self._max_bytes = max_bytes
+        self._versions: List[Dict[str, Any]] = []
+
+        # The number of bytes each version adds on top of the previous one. The first (oldest) version is
+        # charged for its full size.
+        self._versions_bytes: List[int] = []
+        self._position = -1
+
+    @property
+    def can_undo(self) -> bool:
+        return self._position > 0
+
+    @property
+    def can_redo(self) -> bool:
+        return self._position < len(self._versions) - 1
+
+    @property
+    def size_in_bytes(self) -> int:
+        """The approximate number of bytes occupied by the stored versions.
+        """
+        return sum(self._versions_bytes)
+
+    @property
+    def current(self) -> Optional[Dict[str, Any]]:
+        """The version that the state was last recorded as or restored to.
+        """
+        return self._versions[self._position] if self._position >= 0 else None
+
+    def record(self, values: Dict[str, Any]) -> bool:
+        """Records the given values as a new version.
+
+        Recording a new version discards the versions that could have been redone.
+
+        Args:
+            values (Dict[str, Any]): The state values to record.
+
+        Returns:
+            bool: True if a new version was recorded, False if the values did not change since the current version.
+        """
+        previous = self.current or {}
+        added_bytes = [0]
+        snapshot = {key: self._share(value, previous.get(key, _MISSING), added_bytes) for key, value in values.items()}
+
+        if snapshot.keys() == previous.keys() and all(snapshot[key] is previous[key] for key in snapshot):
+            return False
+
+        del self._versions[self._position + 1:]
+        del self._versions_bytes[self._position + 1:]
+
+        self._versions.append(snapshot)
+        self._versions_bytes.append(added_bytes[0] if self._versions_bytes else self._get_size(snapshot))
+        self._position = len(self._versions) - 1
+
+        self._discard_old_versions()
+        return True
+
+    def undo(self) -> Optional[Dict[str, Any]]:
+        """Moves to the previous version.
+
+        Returns:
+            Optional[Dict[str, Any]]: The previous version, or None if there is no version to undo to.
+        """
+        if not self.can_undo:
+            return None
+
+        self._position -= 1
+        return self.current
+
+    def redo(self) -> Optional[Dict[str, Any]]:
+        """Moves to the next version.
+
+        Returns:
+            Optional[Dict[str, Any]]: The next version, or None if there is no version to redo to.
+        """
+        if not self.can_redo:
+            return None
+
+        self._position += 1
+        return self.current
+
+    def clear(self):
+        self._versions.clear()
+        self._versions_bytes.clear()
+        self._position = -1
+
+    def _discard_old_versions(self):
+        """Discards the oldest versions until both the depth and the byte budget are respected.
+        """
+        def exceeds_budget() -> bool:
+            return self._max_bytes is not None and self.size_in_bytes > self._max_bytes
+
+        while len(self._versions) > self._max_depth or (len(self._versions) > 1 and exceeds_budget()):
+            self._versions.pop(0)
+            self._versions_bytes.pop(0)
+            self._position -= 1
+
+            # The new oldest version may share values with the discarded one, so it's now charged for its full size.
+            self._versions_bytes[0] = self._get_size(self._versions[0])
+
+    def _share(self, value: Any, previous: Any, added_bytes: List[int]) -> Any:
+        """Returns a private copy of a value that reuses the unchanged parts of its previous version.
+
+        Args:
+            value (Any): The value to record.
+            previous (Any): The version of the value in the previous snapshot (or _MISSING).
+            added_bytes (List[int]): A single-item list that accumulates the number of newly allocated bytes.
+
+        Returns:
+            Any: Either "previous" (if the value did not change) or a new value.
+        """
+        if isinstance(value, np.ndarray):
+            if isinstance(previous, np.ndarray) and previous.dtype == value.dtype and np.array_equal(previous, value):
+                return previous
+
+            array_copy = value.copy()
+            array_copy.flags.writeable = False
+            added_bytes[0] += array_copy.nbytes
+            return array_copy
+
+        if type(value) is dict:
+            previous_items = previous if type(previous) is dict else {}
+            shared = {
+                key: self._share(item, previous_items.get(key, _MISSING), added_bytes)
+                for key, item in value.items()
+            }
+
+            if type(previous) is dict and shared.keys() == previous_items.keys() \
+                    and all(shared[key] is previous_items[key] for key in shared):
+                return previous
+
+            added_bytes[0] += sys.getsizeof(shared)
+            return shared
+
+        if type(value) in (list, tuple):
+            previous_items = previous if type(previous) is type(value) else ()
+            shared = [
+                self._share(item, previous_items[i] if i < len(previous_items) else _MISSING, added_bytes)
+                for i, item in enumerate(value)
+            ]
+
+            if type(previous) is type(value) and len(shared) == len(previous_items) \
+                    and all(item is previous_item for item, previous_item in zip(shared, previous_items)):
+                return previous
+
+            shared = type(value)(shared)
+            added_bytes[0] += sys.getsizeof(shared)
+            return shared
+
+        try:
+            if type(previous) is type(value) and bool(previous == value):
+                return previous
+        except (ValueError, TypeError):
+            # Values whose comparison is ambiguous (e.g. data frames) are considered changed.
+            pass
+
+        value_copy = copy.deepcopy(value)
+        added_bytes[0] += self._get_size(value_copy)
+        return value_copy
+
+    @classmethod
+    def _get_size(cls, value: Any, seen: Optional[Set[int]] = None) -> int:
+        """Returns the approximate number of bytes occupied by a value, counting shared parts once.
+        """
+        seen = set() if seen is None else seen
+        if id(value) in seen:
+            return 0
+        seen.add(id(value))
+
+        if isinstance(value, np.ndarray):
+            return value.nbytes
+        if isinstance(value, dict):
+            return sys.getsizeof(value) + sum(cls._get_size(item, seen) for item in value.values())
+        if isinstance(value, (list, tuple)):
+            return sys.getsizeof(value) + sum(cls._get_size(item, seen) for item in value)
+        return sys.getsizeof(value)
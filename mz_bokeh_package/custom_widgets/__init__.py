@@ -1,3 +1,4 @@
 from .custom_select import CustomSelect  # noqa F401
 from .custom_multiselect import CustomMultiSelect  # noqa F401
 from .custom_toggle import CustomToggle  # noqa F401
+from .custom_loading_indicator import LoadingIndicator  # noqa F401
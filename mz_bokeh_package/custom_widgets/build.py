@@ -0,0 +1,9 @@
+"""Builds the extension bundle of the custom widgets and records its build info (see extension.build_bundle).
+
+Run from the repository's directory:
+    python -m mz_bokeh_package.custom_widgets.build
+"""
+from .extension import build_bundle
+
+if __name__ == "__main__":
+    build_bundle()
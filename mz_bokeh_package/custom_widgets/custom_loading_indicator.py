@@ -0,0 +1,31 @@
+import os
+from bokeh.models import Widget
+from bokeh.core.properties import Bool, Int, String
+
+from .extension import IS_BUNDLE_BUILT, get_implementation
+
+
+class LoadingIndicator(Widget):
+    ''' A non-visual widget that shows/hides the loading spinner element of the page.
+
+    The spinner is shown only if "active" is still True after "show_delay" milliseconds, and once shown it
+    stays visible for at least "min_display_time" milliseconds. Hence, short activations cause no flicker.
+    '''
+    if not IS_BUNDLE_BUILT:
+        __implementation__ = get_implementation(os.path.join("implementation_files", "loading_indicator.ts"))
+
+    active = Bool(default=False, help="""
+    Whether the app is loading or not.
+    """)
+
+    show_delay = Int(default=300, help="""
+    The number of milliseconds to wait after activation before showing the spinner.
+    """)
+
+    min_display_time = Int(default=500, help="""
+    The minimal number of milliseconds the spinner is displayed once shown.
+    """)
+
+    target_id = String(default="loading-spinner-invoker", help="""
+    The id of the HTML element of the loading spinner.
+    """)
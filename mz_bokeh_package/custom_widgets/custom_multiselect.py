@@ -5,13 +5,17 @@ from bokeh.models import InputWidget
 from bokeh.core.properties import List, Either, String, Tuple, Bool, Int, Nullable, Dict
 from typing import TypeVar, Type
 
+from .extension import IS_BUNDLE_BUILT, get_implementation
+
 T = TypeVar("T", bound="CustomMultiSelect")
 
 
 class CustomMultiSelect(InputWidget):
     ''' Custom Multi-select widget.
     '''
-    __implementation__ = "multiselect.ts"
+    if not IS_BUNDLE_BUILT:
+        __implementation__ = get_implementation("multiselect.ts")
+
     __javascript__ = [
         "https://ajax.googleapis.com/ajax/libs/jquery/3.5.1/jquery.min.js",
         "https://cdnjs.cloudflare.com/ajax/libs/twitter-bootstrap/4.6.2/js/bootstrap.bundle.min.js",
@@ -5,13 +5,17 @@ from bokeh.models import InputWidget
 from bokeh.core.properties import List, Either, String, Tuple, Bool, Dict
 from typing import TypeVar, Type
 
+from .extension import IS_BUNDLE_BUILT, get_implementation
+
 T = TypeVar("T", bound="CustomSelect")
 
 
 class CustomSelect(InputWidget):
     ''' Custom select widget.
     '''
-    __implementation__ = "select.ts"
+    if not IS_BUNDLE_BUILT:
+        __implementation__ = get_implementation("select.ts")
+
     __javascript__ = [
         "https://ajax.googleapis.com/ajax/libs/jquery/3.5.1/jquery.min.js",
         "https://cdnjs.cloudflare.com/ajax/libs/twitter-bootstrap/4.6.2/js/bootstrap.bundle.min.js",
@@ -2,11 +2,14 @@ import os
 from bokeh.models.widgets.markups import Markup
 from bokeh.core.properties import Bool, String
 
+from .extension import IS_BUNDLE_BUILT, get_implementation
+
 
 class CustomToggle(Markup):
     ''' Custom Toggle widget.
     '''
-    __implementation__ = os.path.join("implementation_files", "toggle_btn.ts")
+    if not IS_BUNDLE_BUILT:
+        __implementation__ = get_implementation(os.path.join("implementation_files", "toggle_btn.ts"))
 
     __javascript__ = [
         "https://ajax.googleapis.com/ajax/libs/jquery/3.5.1/jquery.min.js",
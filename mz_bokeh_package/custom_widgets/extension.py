@@ -0,0 +1,100 @@
+"""This module determines how the implementations (TypeScript) of the custom widgets are loaded.
+
+The implementations are built into a Bokeh extension bundle ("dist/mz_bokeh_package.js", see "bokeh.ext.json" in the
+package's directory), which Bokeh loads as it is. If the bundle isn't built, the widgets declare their implementations
+("__implementation__"), which Bokeh compiles (using Node.js) when the widgets are first used.
+
+The bundle is (re)built by running the following command from the repository's directory (see build_bundle). It
+also records the hash of the sources and the version of Bokeh that the bundle was built from (see BUILD_INFO_PATH),
+which the unit tests compare to the current sources and Bokeh version.
+    python -m mz_bokeh_package.custom_widgets.build
+"""
+import glob
+import hashlib
+import json
+import os
+import re
+from typing import Any, Dict
+
+import bokeh
+from bokeh.ext import build
+from bokeh.util.compiler import TypeScript
+
+BASE_DIR = os.path.dirname(__file__)
+PACKAGE_DIR = os.path.dirname(BASE_DIR)
+BUNDLE_PATH = os.path.join(PACKAGE_DIR, "dist", "mz_bokeh_package.js")
+BUILD_INFO_PATH = os.path.join(PACKAGE_DIR, "dist", "build_info.json")
+
+# The files (relative to the package's directory) that the bundle is built from.
+SOURCE_PATTERNS = ("bokeh.ext.json", "tsconfig.json", "index.ts", "custom_widgets/**/*.ts")
+
+# Whether the widgets are loaded from the extension bundle.
+IS_BUNDLE_BUILT = os.path.exists(BUNDLE_PATH)
+
+# The prefix of BokehJS modules in the imports of extensions (e.g. "@bokehjs/core/dom").
+BOKEHJS_IMPORT_PATTERN = re.compile(r"""(from\s+["'])@bokehjs/""")
+
+
+def get_implementation(path: str) -> TypeScript:
+    """Returns the implementation of a custom widget, for compiling it when the widget is first used.
+
+    The implementation imports BokehJS modules as extensions do (e.g. "@bokehjs/core/dom"), and the imports are
+    converted to the form that the compiler of Bokeh expects (e.g. "core/dom").
+
+    Args:
+        path (str): The path of the TypeScript file, relative to the custom widgets' directory.
+
+    Returns:
+        TypeScript: The implementation.
+    """
+    path = os.path.join(BASE_DIR, path)
+    with open(path, encoding="utf-8") as f:
+        code = f.read()
+
+    return TypeScript(BOKEHJS_IMPORT_PATTERN.sub(r"\1", code), file=path)
+
+
+def get_sources_hash() -> str:
+    """Returns the SHA-256 hash of the files that the bundle is built from (see SOURCE_PATTERNS).
+    """
+    paths = sorted({
+        os.path.relpath(path, PACKAGE_DIR).replace(os.sep, "/")
+        for pattern in SOURCE_PATTERNS
+        for path in glob.glob(os.path.join(PACKAGE_DIR, pattern), recursive=True)
+    })
+
+    sources_hash = hashlib.sha256()
+    for path in paths:
+        with open(os.path.join(PACKAGE_DIR, path), "rb") as f:
+            sources_hash.update(path.encode() + b"\0" + f.read() + b"\0")
+
+    return sources_hash.hexdigest()
+
+
+def get_build_info() -> Dict[str, Any]:
+    """Returns the hash of the sources and the version of Bokeh that the bundle was built from.
+    """
+    return {"sources_hash": get_sources_hash(), "bokeh_version": bokeh.__version__}
+
+
+def build_bundle(rebuild: bool = False):
+    """Builds the extension bundle (using Node.js) and records its build info (see record_build_info).
+
+    Args:
+        rebuild (bool, optional): Whether to ignore the caches of previous builds. Defaults to False.
+
+    Raises:
+        RuntimeError: If the build fails.
+    """
+    if not build(PACKAGE_DIR, rebuild=rebuild):
+        raise RuntimeError("Failed to build the extension bundle of the custom widgets")
+
+    record_build_info()
+
+
+def record_build_info():
+    """Records the build info (see get_build_info) of a newly built bundle in BUILD_INFO_PATH.
+    """
+    with open(BUILD_INFO_PATH, "w", encoding="utf-8") as f:
+        json.dump(get_build_info(), f, indent=2)
+        f.write("\n")
@@ -0,0 +1,98 @@
+import {Widget, WidgetView} from "@bokehjs/models/widgets/widget"
+import * as p from "@bokehjs/core/properties"
+
+export class LoadingIndicatorView extends WidgetView {
+  model: LoadingIndicator
+  protected shown_at: number | null = null
+  protected show_timer: number | null = null
+  protected hide_timer: number | null = null
+
+  connect_signals(): void {
+    super.connect_signals()
+
+    const {active} = this.model.properties
+    this.on_change(active, () => this.update_visibility())
+  }
+
+  render(): void {
+    super.render()
+
+    // The app is loading when the page is rendered, hence there's no reason to delay showing the spinner.
+    if (this.model.active)
+      this.set_spinner_visibility(true)
+  }
+
+  update_visibility(): void {
+    if (this.model.active) {
+      // Keep the spinner visible if it's about to be hidden
+      if (this.hide_timer != null) {
+        clearTimeout(this.hide_timer)
+        this.hide_timer = null
+      }
+
+      // Show the spinner only if the app is still loading after "show_delay" milliseconds
+      if (this.shown_at == null && this.show_timer == null) {
+        this.show_timer = setTimeout(() => {
+          this.show_timer = null
+          this.set_spinner_visibility(true)
+        }, this.model.show_delay)
+      }
+    } else {
+      // The app finished loading before the spinner was shown, so it's never shown
+      if (this.show_timer != null) {
+        clearTimeout(this.show_timer)
+        this.show_timer = null
+      }
+
+      // Keep the spinner visible for at least "min_display_time" milliseconds to avoid flickering
+      if (this.shown_at != null && this.hide_timer == null) {
+        const remaining_time = Math.max(0, this.model.min_display_time - (Date.now() - this.shown_at))
+        this.hide_timer = setTimeout(() => {
+          this.hide_timer = null
+          this.set_spinner_visibility(false)
+        }, remaining_time)
+      }
+    }
+  }
+
+  set_spinner_visibility(visible: boolean): void {
+    this.shown_at = visible ? Date.now() : null
+
+    const spinner_el = document.getElementById(this.model.target_id)
+    if (spinner_el != null)
+      spinner_el.style.visibility = visible ? "visible" : "hidden"
+  }
+}
+
+export namespace LoadingIndicator {
+  export type Attrs = p.AttrsOf<Props>
+
+  export type Props = Widget.Props & {
+    active: p.Property<boolean>
+    show_delay: p.Property<number>
+    min_display_time: p.Property<number>
+    target_id: p.Property<string>
+  }
+}
+
+export interface LoadingIndicator extends LoadingIndicator.Attrs {}
+
+export class LoadingIndicator extends Widget {
+  properties: LoadingIndicator.Props
+  __view_type__: LoadingIndicatorView
+
+  constructor(attrs?: Partial<LoadingIndicator.Attrs>) {
+    super(attrs)
+  }
+
+  static init_LoadingIndicator(): void {
+    this.prototype.default_view = LoadingIndicatorView
+
+    this.define<LoadingIndicator.Props>(({Boolean, Int, String}) => ({
+      active:           [ Boolean, false ],
+      show_delay:       [ Int, 300 ],
+      min_display_time: [ Int, 500 ],
+      target_id:        [ String, "loading-spinner-invoker" ],
+    }))
+  }
+}
@@ -1,6 +1,6 @@
-import {label, input, span} from "core/dom"
-import {Markup, MarkupView} from "models/widgets/markup"
-import * as p from "core/properties"
+import {label, input, span} from "@bokehjs/core/dom"
+import {Markup, MarkupView} from "@bokehjs/models/widgets/markup"
+import * as p from "@bokehjs/core/properties"
 
 declare function $(...args: any[]): any
 
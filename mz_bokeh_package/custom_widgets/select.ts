@@ -1,8 +1,8 @@
-import {select} from "core/dom"
-import {isString} from "core/util/types"
-import * as p from "core/properties"
+import {select} from "@bokehjs/core/dom"
+import {isString} from "@bokehjs/core/util/types"
+import * as p from "@bokehjs/core/properties"
 
-import {InputWidget, InputWidgetView} from "models/widgets/input_widget"
+import {InputWidget, InputWidgetView} from "@bokehjs/models/widgets/input_widget"
 
 import {
   common_styles, 
@@ -0,0 +1,891 @@
+/*!
+ * Copyright (c) 2012 - 2022, Anaconda, Inc., and Bokeh Contributors
+ * All rights reserved.
+ * 
+ * Redistribution and use in source and binary forms, with or without modification,
+ * are permitted provided that the following conditions are met:
+ * 
+ * Redistributions of source code must retain the above copyright notice,
+ * this list of conditions and the following disclaimer.
+ * 
+ * Redistributions in binary form must reproduce the above copyright notice,
+ * this list of conditions and the following disclaimer in the documentation
+ * and/or other materials provided with the distribution.
+ * 
+ * Neither the name of Anaconda nor the names of any contributors
+ * may be used to endorse or promote products derived from this software
+ * without specific prior written permission.
+ * 
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+ * AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+ * IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+ * ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+ * LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+ * CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+ * SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+ * INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+ * CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+ * ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF
+ * THE POSSIBILITY OF SUCH DAMAGE.
+ */
+(function(root, factory) {
+  factory(root["Bokeh"], undefined);
+})(this, function(Bokeh, version) {
+  let define;
+  return (function(modules, entry, aliases, externals) {
+    const bokeh = typeof Bokeh !== "undefined" && (version != null ? Bokeh[version] : Bokeh);
+    if (bokeh != null) {
+      return bokeh.register_plugin(modules, entry, aliases);
+    } else {
+      throw new Error("Cannot find Bokeh " + version + ". You have to load it prior to loading plugins.");
+    }
+  })
+({
+"5e880641a5": /* index.js */ function _(require, module, exports, __esModule, __esExport) {
+    __esModule();
+    // The entry point of the Bokeh extension bundle of the custom widgets (see custom_widgets/extension.py).
+    const base_1 = require("@bokehjs/base");
+    const select_1 = require("cf02b47aeb") /* ./custom_widgets/select */;
+    __esExport("CustomSelect", select_1.CustomSelect);
+    const multiselect_1 = require("5064499600") /* ./custom_widgets/multiselect */;
+    __esExport("CustomMultiSelect", multiselect_1.CustomMultiSelect);
+    const toggle_btn_1 = require("8923166056") /* ./custom_widgets/implementation_files/toggle_btn */;
+    __esExport("CustomToggle", toggle_btn_1.CustomToggle);
+    const loading_indicator_1 = require("5e2d22eca0") /* ./custom_widgets/implementation_files/loading_indicator */;
+    __esExport("LoadingIndicator", loading_indicator_1.LoadingIndicator);
+    // Models that are loaded from an extension are identified by the qualified names of their Python classes.
+    select_1.CustomSelect.__module__ = "mz_bokeh_package.custom_widgets.custom_select";
+    multiselect_1.CustomMultiSelect.__module__ = "mz_bokeh_package.custom_widgets.custom_multiselect";
+    toggle_btn_1.CustomToggle.__module__ = "mz_bokeh_package.custom_widgets.custom_toggle";
+    loading_indicator_1.LoadingIndicator.__module__ = "mz_bokeh_package.custom_widgets.custom_loading_indicator";
+    (0, base_1.register_models)({ CustomSelect: select_1.CustomSelect, CustomMultiSelect: multiselect_1.CustomMultiSelect, CustomToggle: toggle_btn_1.CustomToggle, LoadingIndicator: loading_indicator_1.LoadingIndicator });
+},
+"cf02b47aeb": /* custom_widgets/select.js */ function _(require, module, exports, __esModule, __esExport) {
+    __esModule();
+    const dom_1 = require("@bokehjs/core/dom");
+    const types_1 = require("@bokehjs/core/util/types");
+    const input_widget_1 = require("@bokehjs/models/widgets/input_widget");
+    const select_widgets_common_components_1 = require("04ff99c7d8") /* ./select_widgets_common_components */;
+    const default_styles = select_widgets_common_components_1.common_styles + `
+  .multiselect-group.dropdown-item-text {
+    padding-left: 10px;
+  }
+  label.form-check-label.single-select::before {
+    border-radius: 50%;
+  }
+`;
+    class CustomSelectView extends input_widget_1.InputWidgetView {
+        connect_signals() {
+            super.connect_signals();
+            const { value, options, name, title, enabled } = this.model.properties;
+            this.on_change([value, options, name, title], () => this.render());
+            this.on_change(enabled, () => this.enable_widget());
+        }
+        styles() {
+            return [...super.styles(), default_styles];
+        }
+        initialize() {
+            super.initialize();
+            super.render();
+            this.select_el = this.init_select_element();
+        }
+        init_select_element() {
+            // Create a "Select" web element
+            const select_el = (0, dom_1.select)({
+                size: this.model.allow_non_selected ? 2 : 1,
+                class: "custom-select",
+                name: this.model.name,
+                style: "display: none;",
+            });
+            // Add the "Select" web element to its container 
+            this.group_el.appendChild(select_el);
+            return select_el;
+        }
+        parse_options_list(options) {
+            return options.map((opt) => {
+                let label, value, selected;
+                if ((0, types_1.isString)(opt)) {
+                    value = label = opt;
+                }
+                else {
+                    [value, label] = opt;
+                }
+                if (!this.model.value) {
+                    selected = false;
+                }
+                else if (this.model.is_opt_grouped && this.model.value instanceof Array) {
+                    /* Note! an assumption is made that the option's value is
+                    unique across all other options (not only in its group) */
+                    selected = this.model.value[1] === value;
+                }
+                else {
+                    selected = (0, types_1.isString)(this.model.value) && this.model.value === value;
+                }
+                return { value, label, selected };
+            });
+        }
+        // Build an "options" object based on "CustomMultiSelect" properties
+        parse_options() {
+            // options are not grouped
+            if (Array.isArray(this.model.options)) {
+                this.model.is_opt_grouped = false;
+                const options = this.parse_options_list(this.model.options);
+                this.all_values = options.map(opt => opt.value);
+                return options;
+            }
+            // options are grouped
+            this.model.is_opt_grouped = true;
+            const options = Object.entries(this.model.options).map(([group, children]) => {
+                return {
+                    label: group,
+                    children: this.parse_options_list(children)
+                };
+            });
+            this.all_values = options.reduce((acc, { label: group, children }) => {
+                return acc.concat(children.map((c) => [group, c.value]));
+            }, []);
+            return options;
+        }
+        set_plugin_config() {
+            const plugin_config = {
+                maxHeight: 200,
+                disableIfEmpty: true,
+                nonSelectedText: this.model.non_selected_text,
+                enableCaseInsensitiveFiltering: this.model.enable_filtering,
+                buttonWidth: '100%',
+                numberDisplayed: 1,
+                onChange: this.on_dropdown_change.bind(this),
+                onDropdownShown: this.on_dropdown_opened.bind(this),
+                onDropdownHidden: this.on_dropdown_closed.bind(this),
+                enableCollapsibleOptGroups: this.model.collapsible,
+                collapseOptGroupsByDefault: this.model.collapsed_by_default,
+            };
+            if (this.model.width) {
+                plugin_config.buttonWidth = `${this.model.width}px`;
+            }
+            if (!this.model.collapsible) {
+                plugin_config.collapseOptGroupsByDefault = false;
+            }
+            return plugin_config;
+        }
+        // Apply styles specifically for the current widget
+        apply_unique_styles() {
+            const root_el = $(this.group_el).parents('.bk-root')[0];
+            const width = this.model.width ? `${this.model.width}px` : 'calc(100% - 4px)';
+            const styles = {
+                "> .bk.custom_select": {
+                    "width": width,
+                    "max-width": width,
+                }
+            };
+            for (const selector in styles) {
+                for (const property in styles[selector]) {
+                    $(selector, root_el).css(property, styles[selector][property]);
+                }
+            }
+        }
+        apply_plugin() {
+            this.options = this.parse_options();
+            this.plugin_config = this.set_plugin_config();
+            $(this.select_el).multiselect(this.plugin_config).multiselect('dataprovider', this.options).multiselect('rebuild');
+            // fixes the scroll issue on mobile
+            $('.multiselect-container.dropdown-menu', this.group_el).unbind('touchstart');
+            // Add a class to differentiate between css rules
+            $('label.form-check-label', this.group_el).addClass('single-select');
+            this.apply_unique_styles();
+            let is_non_selected;
+            if (this.model.is_opt_grouped) {
+                is_non_selected = this.options.length ? this.options.every((group) => group.children.every((child) => !child.selected)) : true;
+            }
+            else {
+                is_non_selected = this.options.length ? this.options.every((opt) => !opt.selected) : true;
+            }
+            // set the "value" property when "allow_non_selected" is set to False
+            if (!this.model.allow_non_selected && is_non_selected && this.all_values.length) {
+                const value = this.all_values[0];
+                this.model.setv({ value }, { silent: true });
+            }
+            // allow for deselecting and leaving the widget in the unselected state.
+            const selected_button = $('button.multiselect-option.dropdown-item.active', this.group_el);
+            if (this.model.allow_non_selected && selected_button.length)
+                selected_button[0].onclick = this.deselect_option.bind(this);
+            if (this.model.collapsed_by_default && this.model.collapsible)
+                (0, select_widgets_common_components_1.fix_collapsed_by_default)(this.group_el);
+        }
+        render() {
+            this.apply_plugin();
+            // Enable/disable the widget in case it has options 
+            // (if there are no options it is disabled automatically) 
+            this.enable_widget();
+        }
+        enable_widget() {
+            const hasOptions = (this.model.is_opt_grouped && this.options.some((opt) => opt.children.length)) || this.options.length;
+            if (hasOptions) {
+                $(document).ready(() => $(this.select_el).multiselect(`${this.model.enabled ? 'enable' : 'disable'}`));
+            }
+        }
+        // function to bind to selected item for allowing to deselect it again.
+        // this function is called twice, but the python event is raised only once.
+        deselect_option() {
+            this.model.value = "";
+            const dropdown_menu = $('div.multiselect-container.dropdown-menu', this.group_el);
+            dropdown_menu.removeClass("show");
+        }
+        // Runs after a change occurs 
+        on_dropdown_change() {
+            if (this.model.allow_non_selected)
+                return;
+            const selected = $('button.multiselect-option.dropdown-item.active', this.group_el);
+            if (!selected.length) {
+                $(this.select_el).multiselect('select', this.model.value).multiselect('refresh');
+            }
+        }
+        // Runs after the drop-down is opened
+        on_dropdown_opened() {
+            const selected = $('button.multiselect-option.dropdown-item.active', this.group_el);
+            if (selected.length) {
+                const position = selected[0].offsetTop;
+                const dropdownMenu = $('.multiselect-container.dropdown-menu', this.group_el);
+                const dropdownMenuHeight = dropdownMenu.outerHeight();
+                dropdownMenu[0].scrollTo(0, position - dropdownMenuHeight / 2);
+            }
+        }
+        // Runs after the drop-down is closed
+        on_dropdown_closed() {
+            let value;
+            let was_value_changed;
+            const selectedValue = $(this.select_el).val() || "";
+            if (this.model.is_opt_grouped) {
+                value = this.all_values.find((v) => v[1] === selectedValue) || "";
+                was_value_changed = !(this.model.value instanceof Array) || this.model.value[1] !== value[1];
+            }
+            else {
+                value = selectedValue;
+                was_value_changed = this.model.value !== value;
+            }
+            if (was_value_changed) {
+                this.model.setv({ value });
+                super.change_input();
+            }
+        }
+    }
+    exports.CustomSelectView = CustomSelectView;
+    CustomSelectView.__name__ = "CustomSelectView";
+    class CustomSelect extends input_widget_1.InputWidget {
+        constructor(attrs) {
+            super(attrs);
+        }
+        static init_CustomSelect() {
+            this.prototype.default_view = CustomSelectView;
+            this.define(({ String, Array, Tuple, Or, Boolean, Dict }) => ({
+                value: [Or(String, Array(String)), ""],
+                options: [Or(Dict(Array(Or(String, Tuple(String, String)))), Array(Or(String, Tuple(String, String)))), []],
+                enable_filtering: [Boolean, false],
+                enabled: [Boolean, true],
+                allow_non_selected: [Boolean, true],
+                non_selected_text: [String, "Select..."],
+                is_opt_grouped: [Boolean, false],
+                collapsible: [Boolean, false],
+                collapsed_by_default: [Boolean, false],
+            }));
+        }
+    }
+    exports.CustomSelect = CustomSelect;
+    CustomSelect.__name__ = "CustomSelect";
+    CustomSelect.init_CustomSelect();
+},
+"04ff99c7d8": /* custom_widgets/select_widgets_common_components.js */ function _(require, module, exports, __esModule, __esExport) {
+    __esModule();
+    // styles that are common to both single and multi select widgets
+    exports.common_styles = `
+  /* Expand clickable area of the caret for collapsing groups */
+  .custom_select .dropdown-toggle.caret-container {
+    margin-left: -12px;
+    padding: 7px 3px 8px 12px;
+  }
+  .dropdown-toggle.custom-select {
+    font-size: inherit;
+    display: flex;
+    background: #fff url('data:image/svg+xml;utf8,<svg version="1.1" viewBox="0 0 25 20" xmlns="http://www.w3.org/2000/svg"><path d="M 0,0 25,0 12.5,20 Z" fill="black" /></svg>') no-repeat right 7px center/7px 10px;
+  }
+  .multiselect-container.dropdown-menu {
+    width: inherit;
+    overflow: auto auto !important;
+  }
+  .multiselect-option.dropdown-item {
+    color: inherit;
+    padding: 0 24px;
+  }
+  .multiselect-option.dropdown-item.active,
+  .multiselect-option.dropdown-item:active {
+    color: inherit;
+    background-color: #FFFFFF;
+  }
+  .multiselect-option.dropdown-item:focus {
+    outline: none;
+  }
+  .multiselect-group.dropdown-item-text {
+    font-size: 13px;
+  }
+  .form-check-input {
+    display: none;
+  }
+  .form-check-label {
+    font-size: 13px;
+  }
+  .dropdown-item.active label.form-check-label::before {
+    background-color: #60cbe0;
+    border: 1px solid #60cbe0;
+  }
+  .dropdown-item.active label.form-check-label::after {
+    display: block;
+  }
+  label.form-check-label::before {
+    content: "";
+    width: 14px;
+    height: 14px;
+    display: block;
+    border: 1px solid currentColor;
+    border-radius: 2px;
+    box-sizing: border-box;
+    left: -21px;
+    top: calc(50% - 7px);
+    position: absolute;
+  }
+  label.form-check-label {
+    position: relative;
+  }
+  label.form-check-label::after {
+    content: "";
+    width: 5px;
+    height: 8px;
+    box-sizing: border-box;
+    border-bottom: 2px solid white;
+    border-right: 2px solid white;
+    position: absolute;
+    display: none;
+    transform: rotate(45deg);
+    left: -16px;
+    top: calc(50% - 5px);
+    z-index: 1;
+  }
+  div.input-group-prepend > svg.input-group-text {
+    width: 30px !important;
+    height: inherit !important;
+  }
+  .multiselect-filter {
+    position: sticky;
+    top: -6px;
+    left: 0;
+    right: 0;
+    z-index: 2;
+  }
+  .multiselect-filter .input-group-prepend,
+  .multiselect-filter .input-group-append {
+    height: 31px;
+  }
+  span.multiselect-selected-text {
+    width: 100%;
+    overflow: hidden;
+    text-overflow: ellipsis;
+    text-align: left;
+  }
+  span.multiselect-native-select {
+    width: inherit;
+  }
+  .dropdown-item.active:hover {
+    background-color: #f8f9fa;
+  }
+  .multiselect-clear-filter.input-group-text {
+    outline: none;
+  }
+  `;
+    // Fixes an issue with the "collapseOptGroupsByDefault" plugin setting
+    // where the caret icon indicates that the groups are expanded instead of collapsed.
+    function fix_collapsed_by_default(group_el) {
+        $('.multiselect-group', group_el).addClass('closed');
+    }
+    exports.fix_collapsed_by_default = fix_collapsed_by_default;
+},
+"5064499600": /* custom_widgets/multiselect.js */ function _(require, module, exports, __esModule, __esExport) {
+    __esModule();
+    const dom_1 = require("@bokehjs/core/dom");
+    const types_1 = require("@bokehjs/core/util/types");
+    const input_widget_1 = require("@bokehjs/models/widgets/input_widget");
+    const select_widgets_common_components_1 = require("04ff99c7d8") /* ./select_widgets_common_components */;
+    const default_styles = select_widgets_common_components_1.common_styles + `
+  .multiselect-group.dropdown-item,
+  .multiselect-all.dropdown-item {
+    padding-left: 10px;
+  }
+  .multiselect-all.dropdown-item {
+    padding-bottom: 0;
+  }
+  button.multiselect-group.dropdown-item.active,
+  button.multiselect-group.dropdown-item:active,
+  .multiselect-all.dropdown-item.active,
+  .multiselect-all.dropdown-item:active {
+    background-color: #FFFFFF;
+    color: inherit;
+  }
+  button.multiselect-group.dropdown-item:focus,
+  .multiselect-all.dropdown-item:focus {
+    outline: none;
+  }
+  button.multiselect-group.dropdown-item.active:hover {
+    background-color: #f8f9fa;
+  }
+`;
+    class CustomMultiSelectView extends input_widget_1.InputWidgetView {
+        constructor() {
+            super(...arguments);
+            this.should_select_all = true;
+            this.all_values = [];
+        }
+        connect_signals() {
+            super.connect_signals();
+            const { value, options, name, title, enabled } = this.model.properties;
+            this.on_change(value, () => this.update_value());
+            this.on_change([name, title], () => this.render());
+            this.on_change(enabled, () => this.enable_widget());
+            this.on_change(options, () => this.update_options());
+        }
+        styles() {
+            return [...super.styles(), default_styles];
+        }
+        initialize() {
+            super.initialize();
+            super.render();
+            this.select_el = this.init_select_element();
+            // initialize "value" to empty list if "select_all" is false 
+            if (!this.model.value && !this.model.select_all) {
+                this.model.setv({ value: [] }, { silent: true });
+            }
+        }
+        init_select_element() {
+            // Create a "Select" web element
+            const select_el = (0, dom_1.select)({
+                multiple: "multiple",
+                class: "custom-multiselect",
+                name: this.model.name,
+                style: "display: none;",
+            });
+            // Add the "Select" web element to its container 
+            this.group_el.appendChild(select_el);
+            return select_el;
+        }
+        parse_options_list(options) {
+            return options.map((opt) => {
+                let label, value, selected;
+                if ((0, types_1.isString)(opt)) {
+                    value = label = opt;
+                }
+                else {
+                    [value, label] = opt;
+                }
+                if (!this.model.value) {
+                    selected = false;
+                }
+                else if (this.model.is_opt_grouped) {
+                    /* Note! an assumption is made that the option's value is
+                    unique across all other options (not only in its group) */
+                    selected = this.model.value.some((v) => v[1] === value);
+                }
+                else {
+                    selected = this.model.value.includes(value);
+                }
+                return { value, label, selected };
+            });
+        }
+        // Build an "options" object based on "CustomMultiSelect" properties
+        parse_options() {
+            // options are not grouped
+            if (Array.isArray(this.model.options)) {
+                this.model.is_opt_grouped = false;
+                const options = this.parse_options_list(this.model.options);
+                this.all_values = options.map(opt => opt.value);
+                return options;
+            }
+            // options are grouped
+            this.model.is_opt_grouped = true;
+            const options = Object.entries(this.model.options).map(([group, children]) => {
+                return {
+                    label: group,
+                    children: this.parse_options_list(children)
+                };
+            });
+            this.all_values = options.reduce((acc, { label: group, children }) => {
+                return acc.concat(children.map((c) => [group, c.value]));
+            }, []);
+            return options;
+        }
+        set_plugin_config() {
+            const plugin_config = {
+                maxHeight: 200,
+                selectAllText: 'Select All',
+                selectAllValue: 'Select All',
+                disableIfEmpty: true,
+                nonSelectedText: this.model.non_selected_text,
+                enableCollapsibleOptGroups: this.model.collapsible,
+                collapseOptGroupsByDefault: this.model.collapsed_by_default,
+                enableCaseInsensitiveFiltering: this.model.enable_filtering,
+                numberDisplayed: this.model.number_displayed,
+                buttonWidth: '100%',
+                includeSelectAllOption: this.model.include_select_all,
+                enableClickableOptGroups: true,
+                onDropdownShown: this.on_dropdown_opened.bind(this),
+                onDropdownHidden: this.on_dropdown_closed.bind(this),
+            };
+            if (this.model.width) {
+                plugin_config.buttonWidth = `${this.model.width}px`;
+            }
+            if (!this.model.collapsible) {
+                plugin_config.collapseOptGroupsByDefault = false;
+            }
+            return plugin_config;
+        }
+        // Apply styles specifically for the current widget
+        apply_unique_styles() {
+            const root_el = $(this.group_el).parents('.bk-root')[0];
+            const width = this.model.width ? `${this.model.width}px` : 'calc(100% - 4px)';
+            const styles = {
+                "> .bk.custom_select": {
+                    "width": width,
+                    "max-width": width,
+                }
+            };
+            for (const selector in styles) {
+                for (const property in styles[selector]) {
+                    $(selector, root_el).css(property, styles[selector][property]);
+                }
+            }
+        }
+        apply_plugin() {
+            this.options = this.parse_options();
+            this.plugin_config = this.set_plugin_config();
+            $(this.select_el).multiselect(this.plugin_config).multiselect('dataprovider', this.options).multiselect('refresh');
+            // fixes the scroll issue on mobile
+            $('.multiselect-container.dropdown-menu', this.group_el).unbind('touchstart');
+            this.apply_unique_styles();
+            /* adds a wrapper around dropdown items.
+            this solves the issue that the dropdown items width doesn't
+            stretch when the dropdown overflows on the x axis */
+            this.add_options_wrapper();
+            if (this.model.collapsed_by_default && this.model.collapsible)
+                (0, select_widgets_common_components_1.fix_collapsed_by_default)(this.group_el);
+        }
+        render() {
+            this.apply_plugin();
+            // Enable/disable the widget in case it has options 
+            // (if there are no options it is disabled automatically) 
+            this.enable_widget();
+            // select the "Select All" option (if needed)
+            this.select_all(true);
+        }
+        enable_widget() {
+            const hasOptions = (this.model.is_opt_grouped && this.options.some((opt) => opt.children.length)) || this.options.length;
+            if (hasOptions) {
+                $(document).ready(() => $(this.select_el).multiselect(`${this.model.enabled ? 'enable' : 'disable'}`));
+            }
+        }
+        // Runs after the drop-down is opened
+        on_dropdown_opened() {
+            const selected = $('button.multiselect-option.dropdown-item.active', this.group_el);
+            if (!this.model.select_all && selected.length) {
+                const position = selected[0].offsetTop;
+                const dropdownMenu = $('.multiselect-container.dropdown-menu', this.group_el);
+                const dropdownMenuHeight = dropdownMenu.outerHeight();
+                dropdownMenu[0].scrollTo(0, position - dropdownMenuHeight / 2);
+            }
+        }
+        // Runs after the drop-down is closed
+        on_dropdown_closed() {
+            this.model.setv({ dropdown_closed: !this.model.dropdown_closed });
+            setTimeout(() => {
+                const new_value = this.get_selected_options();
+                const new_select_all = new_value.length === this.all_values.length ? true : false;
+                const was_value_changed = this.model.value && (new_value.length !== this.model.value.length ||
+                    this.model.value.some((el, i) => el !== new_value[i]));
+                if (new_select_all !== this.model.select_all || was_value_changed) {
+                    this.model.setv({ select_all: new_select_all, value: new_value });
+                }
+            }, 200);
+        }
+        select_all(is_silent) {
+            if (this.model.select_all) {
+                $(this.select_el).multiselect('selectAll', false).multiselect('refresh');
+                this.model.setv({ value: this.all_values }, { silent: is_silent ? true : false });
+            }
+        }
+        update_value() {
+            this.apply_plugin();
+            if (this.model.value && this.model.value.length == 0) {
+                this.model.setv({ select_all: false }, { silent: true });
+            }
+        }
+        update_options() {
+            this.apply_plugin();
+            this.select_all(true);
+        }
+        get_selected_options() {
+            const selectedValues = $(this.select_el).val();
+            if (this.model.is_opt_grouped) {
+                return this.all_values.filter(v => selectedValues.includes(v[1]));
+            }
+            else {
+                return selectedValues;
+            }
+        }
+        add_options_wrapper() {
+            if (!$("#items-container", this.group_el).length) {
+                $(document).ready(() => $(".dropdown-item, .multiselect-group", this.group_el).wrapAll("<div id=items-container style='width: max-content; min-width: 100%' />"));
+            }
+        }
+    }
+    exports.CustomMultiSelectView = CustomMultiSelectView;
+    CustomMultiSelectView.__name__ = "CustomMultiSelectView";
+    class CustomMultiSelect extends input_widget_1.InputWidget {
+        constructor(attrs) {
+            super(attrs);
+        }
+        static init_CustomMultiSelect() {
+            this.prototype.default_view = CustomMultiSelectView;
+            this.define(({ String, Array, Tuple, Or, Boolean, Number, Nullable, Dict }) => ({
+                value: [Nullable(Array(Or(String, Array(String)))), null],
+                options: [Or(Dict(Array(Or(String, Tuple(String, String)))), Array(Or(String, Tuple(String, String)))), []],
+                include_select_all: [Boolean, false],
+                select_all: [Boolean, false],
+                number_displayed: [Number, 1],
+                enable_filtering: [Boolean, false],
+                enabled: [Boolean, true],
+                non_selected_text: [String, "Select..."],
+                is_opt_grouped: [Boolean, false],
+                dropdown_closed: [Boolean, false],
+                collapsible: [Boolean, false],
+                collapsed_by_default: [Boolean, false],
+            }));
+        }
+    }
+    exports.CustomMultiSelect = CustomMultiSelect;
+    CustomMultiSelect.__name__ = "CustomMultiSelect";
+    CustomMultiSelect.init_CustomMultiSelect();
+},
+"8923166056": /* custom_widgets/implementation_files/toggle_btn.js */ function _(require, module, exports, __esModule, __esExport) {
+    __esModule();
+    const dom_1 = require("@bokehjs/core/dom");
+    const markup_1 = require("@bokehjs/models/widgets/markup");
+    const default_styles = `
+/* The toggle-btn - the box around the slider */
+.toggle-btn {
+  position: relative;
+  display: inline-block;
+  width: 30px;
+  height: 13px;
+}
+
+/* Hide default HTML checkbox */
+.toggle-btn input {
+  opacity: 0;
+  width: 0;
+  height: 0;
+}
+
+/* The slider */
+.slider {
+  position: absolute;
+  cursor: pointer;
+  top: 0;
+  left: 0;
+  right: 0;
+  bottom: 0;
+  background-color: #B0AFAF;
+  -webkit-transition: .15s;
+  transition: .15s;
+}
+
+.slider:before {
+  position: absolute;
+  content: "";
+  height: 17px;
+  width: 17px;
+  left: 0px;
+  bottom: -2px;
+  background-color: #F1F1F1;
+  -webkit-transition: .15s;
+  -moz-transition: .15s;
+  transition: .15s;
+}
+
+input:checked + .slider {
+  background-color: #ABDAE0;
+}
+
+input:focus + .slider {
+  box-shadow: 0 0 1px #a8ebf8f5;
+}
+
+input:checked + .slider:before {
+  background-color: #00BCD4;
+  -webkit-transform: translateX(14px);
+  -ms-transform: translateX(14px);
+  transform: translateX(14px);
+}
+
+.slider.round {
+  border-radius: 34px;
+}
+
+.slider.round:before {
+  border-radius: 50%;
+  border: none;
+  box-shadow: 0 0 3px -1px;
+}
+
+.bk.toggle-container {
+  display: flex !important;
+  width: unset !important;
+  align-items: center;
+}
+
+.bk.bk-clearfix.toggle-title {
+  margin-right: 6px;
+}
+`;
+    class CustomToggleView extends markup_1.MarkupView {
+        styles() {
+            return [...super.styles(), default_styles + this.model.styles];
+        }
+        initialize() {
+            super.initialize();
+            super.render();
+            this.toggle_btn = this.init_toggle_btn();
+        }
+        init_toggle_btn() {
+            const label_el = (0, dom_1.label)({ class: "toggle-btn" });
+            const span_el = (0, dom_1.span)({ class: "slider round" });
+            const input_el = (0, dom_1.input)({ class: "toggle-checkbox", type: "checkbox" });
+            // Add "click" listener on the toggle-checkbox element to toggle "active" value
+            input_el.addEventListener("click", this.toggle_active.bind(this));
+            label_el.appendChild(input_el);
+            label_el.appendChild(span_el);
+            return label_el;
+        }
+        render() {
+            super.render();
+            this.markup_el.textContent = this.model.text;
+            $(document).ready(this.on_document_ready.bind(this));
+        }
+        toggle_active() {
+            setTimeout(() => {
+                this.model.active = !this.model.active;
+            }, 200);
+        }
+        on_document_ready() {
+            const toggle_container = $(this.markup_el).parent();
+            toggle_container.addClass('toggle-container');
+            $(this.markup_el).addClass('toggle-title');
+            // Set "checked" attribute of the checkbox based on "active" property
+            $(".toggle-checkbox", this.toggle_btn).prop("checked", this.model.active);
+            // Add the toggle button as a child of the toggle container
+            toggle_container.append(this.toggle_btn);
+        }
+    }
+    exports.CustomToggleView = CustomToggleView;
+    CustomToggleView.__name__ = "CustomToggleView";
+    class CustomToggle extends markup_1.Markup {
+        constructor(attrs) {
+            super(attrs);
+        }
+        static init_CustomToggle() {
+            this.prototype.default_view = CustomToggleView;
+            this.define(({ Boolean, String }) => ({
+                active: [Boolean, false],
+                styles: [String, ''],
+            }));
+        }
+    }
+    exports.CustomToggle = CustomToggle;
+    CustomToggle.__name__ = "CustomToggle";
+    CustomToggle.init_CustomToggle();
+},
+"5e2d22eca0": /* custom_widgets/implementation_files/loading_indicator.js */ function _(require, module, exports, __esModule, __esExport) {
+    __esModule();
+    const widget_1 = require("@bokehjs/models/widgets/widget");
+    class LoadingIndicatorView extends widget_1.WidgetView {
+        constructor() {
+            super(...arguments);
+            this.shown_at = null;
+            this.show_timer = null;
+            this.hide_timer = null;
+        }
+        connect_signals() {
+            super.connect_signals();
+            const { active } = this.model.properties;
+            this.on_change(active, () => this.update_visibility());
+        }
+        render() {
+            super.render();
+            // The app is loading when the page is rendered, hence there's no reason to delay showing the spinner.
+            if (this.model.active)
+                this.set_spinner_visibility(true);
+        }
+        update_visibility() {
+            if (this.model.active) {
+                // Keep the spinner visible if it's about to be hidden
+                if (this.hide_timer != null) {
+                    clearTimeout(this.hide_timer);
+                    this.hide_timer = null;
+                }
+                // Show the spinner only if the app is still loading after "show_delay" milliseconds
+                if (this.shown_at == null && this.show_timer == null) {
+                    this.show_timer = setTimeout(() => {
+                        this.show_timer = null;
+                        this.set_spinner_visibility(true);
+                    }, this.model.show_delay);
+                }
+            }
+            else {
+                // The app finished loading before the spinner was shown, so it's never shown
+                if (this.show_timer != null) {
+                    clearTimeout(this.show_timer);
+                    this.show_timer = null;
+                }
+                // Keep the spinner visible for at least "min_display_time" milliseconds to avoid flickering
+                if (this.shown_at != null && this.hide_timer == null) {
+                    const remaining_time = Math.max(0, this.model.min_display_time - (Date.now() - this.shown_at));
+                    this.hide_timer = setTimeout(() => {
+                        this.hide_timer = null;
+                        this.set_spinner_visibility(false);
+                    }, remaining_time);
+                }
+            }
+        }
+        set_spinner_visibility(visible) {
+            this.shown_at = visible ? Date.now() : null;
+            const spinner_el = document.getElementById(this.model.target_id);
+            if (spinner_el != null)
+                spinner_el.style.visibility = visible ? "visible" : "hidden";
+        }
+    }
+    exports.LoadingIndicatorView = LoadingIndicatorView;
+    LoadingIndicatorView.__name__ = "LoadingIndicatorView";
+    class LoadingIndicator extends widget_1.Widget {
+        constructor(attrs) {
+            super(attrs);
+        }
+        static init_LoadingIndicator() {
+            this.prototype.default_view = LoadingIndicatorView;
+            this.define(({ Boolean, Int, String }) => ({
+                active: [Boolean, false],
+                show_delay: [Int, 300],
+                min_display_time: [Int, 500],
+                target_id: [String, "loading-spinner-invoker"],
+            }));
+        }
+    }
+    exports.LoadingIndicator = LoadingIndicator;
+    LoadingIndicator.__name__ = "LoadingIndicator";
+    LoadingIndicator.init_LoadingIndicator();
+},
+}, "5e880641a5", {"index":"5e880641a5","custom_widgets/select":"cf02b47aeb","custom_widgets/select_widgets_common_components":"04ff99c7d8","custom_widgets/multiselect":"5064499600","custom_widgets/implementation_files/toggle_btn":"8923166056","custom_widgets/implementation_files/loading_indicator":"5e2d22eca0"}, {});});
+//# sourceMappingURL=mz_bokeh_package.js.map
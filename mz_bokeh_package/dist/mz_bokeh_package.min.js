@@ -0,0 +1,50 @@
+/*!
+ * Copyright (c) 2012 - 2022, Anaconda, Inc., and Bokeh Contributors
+ * All rights reserved.
+ * 
+ * Redistribution and use in source and binary forms, with or without modification,
+ * are permitted provided that the following conditions are met:
+ * 
+ * Redistributions of source code must retain the above copyright notice,
+ * this list of conditions and the following disclaimer.
+ * 
+ * Redistributions in binary form must reproduce the above copyright notice,
+ * this list of conditions and the following disclaimer in the documentation
+ * and/or other materials provided with the distribution.
+ * 
+ * Neither the name of Anaconda nor the names of any contributors
+ * may be used to endorse or promote products derived from this software
+ * without specific prior written permission.
+ * 
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+ * AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+ * IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+ * ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+ * LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+ * CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+ * SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+ * INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+ * CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+ * ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF
+ * THE POSSIBILITY OF SUCH DAMAGE.
+ */
+(function(root, factory) {
+  factory(root["Bokeh"], undefined);
+})(this, function(Bokeh, version) {
+  let define;
+  return (function(modules, entry, aliases, externals) {
+    const bokeh = typeof Bokeh !== "undefined" && (version != null ? Bokeh[version] : Bokeh);
+    if (bokeh != null) {
+      return bokeh.register_plugin(modules, entry, aliases);
+    } else {
+      throw new Error("Cannot find Bokeh " + version + ". You have to load it prior to loading plugins.");
+    }
+  })
+({
+"5e880641a5": function _(t,o,e,c,s){c();const _=t("@bokehjs/base"),u=t("cf02b47aeb");s("CustomSelect",u.CustomSelect);const m=t("5064499600");s("CustomMultiSelect",m.CustomMultiSelect);const l=t("8923166056");s("CustomToggle",l.CustomToggle);const g=t("5e2d22eca0");s("LoadingIndicator",g.LoadingIndicator),u.CustomSelect.__module__="mz_bokeh_package.custom_widgets.custom_select",m.CustomMultiSelect.__module__="mz_bokeh_package.custom_widgets.custom_multiselect",l.CustomToggle.__module__="mz_bokeh_package.custom_widgets.custom_toggle",g.LoadingIndicator.__module__="mz_bokeh_package.custom_widgets.custom_loading_indicator",(0,_.register_models)({CustomSelect:u.CustomSelect,CustomMultiSelect:m.CustomMultiSelect,CustomToggle:l.CustomToggle,LoadingIndicator:g.LoadingIndicator})},
+"cf02b47aeb": function _(e,t,l,s,i){s();const o=e("@bokehjs/core/dom"),n=e("@bokehjs/core/util/types"),d=e("@bokehjs/models/widgets/input_widget"),a=e("04ff99c7d8"),p=a.common_styles+"\n  .multiselect-group.dropdown-item-text {\n    padding-left: 10px;\n  }\n  label.form-check-label.single-select::before {\n    border-radius: 50%;\n  }\n";class h extends d.InputWidgetView{connect_signals(){super.connect_signals();const{value:e,options:t,name:l,title:s,enabled:i}=this.model.properties;this.on_change([e,t,l,s],(()=>this.render())),this.on_change(i,(()=>this.enable_widget()))}styles(){return[...super.styles(),p]}initialize(){super.initialize(),super.render(),this.select_el=this.init_select_element()}init_select_element(){const e=(0,o.select)({size:this.model.allow_non_selected?2:1,class:"custom-select",name:this.model.name,style:"display: none;"});return this.group_el.appendChild(e),e}parse_options_list(e){return e.map((e=>{let t,l,s;return(0,n.isString)(e)?l=t=e:[l,t]=e,s=!!this.model.value&&(this.model.is_opt_grouped&&this.model.value instanceof Array?this.model.value[1]===l:(0,n.isString)(this.model.value)&&this.model.value===l),{value:l,label:t,selected:s}}))}parse_options(){if(Array.isArray(this.model.options)){this.model.is_opt_grouped=!1;const e=this.parse_options_list(this.model.options);return this.all_values=e.map((e=>e.value)),e}this.model.is_opt_grouped=!0;const e=Object.entries(this.model.options).map((([e,t])=>({label:e,children:this.parse_options_list(t)})));return this.all_values=e.reduce(((e,{label:t,children:l})=>e.concat(l.map((e=>[t,e.value])))),[]),e}set_plugin_config(){const e={maxHeight:200,disableIfEmpty:!0,nonSelectedText:this.model.non_selected_text,enableCaseInsensitiveFiltering:this.model.enable_filtering,buttonWidth:"100%",numberDisplayed:1,onChange:this.on_dropdown_change.bind(this),onDropdownShown:this.on_dropdown_opened.bind(this),onDropdownHidden:this.on_dropdown_closed.bind(this),enableCollapsibleOptGroups:this.model.collapsible,collapseOptGroupsByDefault:this.model.collapsed_by_default};return this.model.width&&(e.buttonWidth=`${this.model.width}px`),this.model.collapsible||(e.collapseOptGroupsByDefault=!1),e}apply_unique_styles(){const e=$(this.group_el).parents(".bk-root")[0],t=this.model.width?`${this.model.width}px`:"calc(100% - 4px)",l={"> .bk.custom_select":{width:t,"max-width":t}};for(const t in l)for(const s in l[t])$(t,e).css(s,l[t][s])}apply_plugin(){let e;if(this.options=this.parse_options(),this.plugin_config=this.set_plugin_config(),$(this.select_el).multiselect(this.plugin_config).multiselect("dataprovider",this.options).multiselect("rebuild"),$(".multiselect-container.dropdown-menu",this.group_el).unbind("touchstart"),$("label.form-check-label",this.group_el).addClass("single-select"),this.apply_unique_styles(),e=this.model.is_opt_grouped?!this.options.length||this.options.every((e=>e.children.every((e=>!e.selected)))):!this.options.length||this.options.every((e=>!e.selected)),!this.model.allow_non_selected&&e&&this.all_values.length){const e=this.all_values[0];this.model.setv({value:e},{silent:!0})}const t=$("button.multiselect-option.dropdown-item.active",this.group_el);this.model.allow_non_selected&&t.length&&(t[0].onclick=this.deselect_option.bind(this)),this.model.collapsed_by_default&&this.model.collapsible&&(0,a.fix_collapsed_by_default)(this.group_el)}render(){this.apply_plugin(),this.enable_widget()}enable_widget(){(this.model.is_opt_grouped&&this.options.some((e=>e.children.length))||this.options.length)&&$(document).ready((()=>$(this.select_el).multiselect(""+(this.model.enabled?"enable":"disable"))))}deselect_option(){this.model.value="";$("div.multiselect-container.dropdown-menu",this.group_el).removeClass("show")}on_dropdown_change(){if(this.model.allow_non_selected)return;$("button.multiselect-option.dropdown-item.active",this.group_el).length||$(this.select_el).multiselect("select",this.model.value).multiselect("refresh")}on_dropdown_opened(){const e=$("button.multiselect-option.dropdown-item.active",this.group_el);if(e.length){const t=e[0].offsetTop,l=$(".multiselect-container.dropdown-menu",this.group_el),s=l.outerHeight();l[0].scrollTo(0,t-s/2)}}on_dropdown_closed(){let e,t;const l=$(this.select_el).val()||"";this.model.is_opt_grouped?(e=this.all_values.find((e=>e[1]===l))||"",t=!(this.model.value instanceof Array)||this.model.value[1]!==e[1]):(e=l,t=this.model.value!==e),t&&(this.model.setv({value:e}),super.change_input())}}l.CustomSelectView=h,h.__name__="CustomSelectView";class c extends d.InputWidget{constructor(e){super(e)}static init_CustomSelect(){this.prototype.default_view=h,this.define((({String:e,Array:t,Tuple:l,Or:s,Boolean:i,Dict:o})=>({value:[s(e,t(e)),""],options:[s(o(t(s(e,l(e,e)))),t(s(e,l(e,e)))),[]],enable_filtering:[i,!1],enabled:[i,!0],allow_non_selected:[i,!0],non_selected_text:[e,"Select..."],is_opt_grouped:[i,!1],collapsible:[i,!1],collapsed_by_default:[i,!1]})))}}l.CustomSelect=c,c.__name__="CustomSelect",c.init_CustomSelect()},
+"04ff99c7d8": function _(n,e,t,o,i){o(),t.common_styles='\n  /* Expand clickable area of the caret for collapsing groups */\n  .custom_select .dropdown-toggle.caret-container {\n    margin-left: -12px;\n    padding: 7px 3px 8px 12px;\n  }\n  .dropdown-toggle.custom-select {\n    font-size: inherit;\n    display: flex;\n    background: #fff url(\'data:image/svg+xml;utf8,<svg version="1.1" viewBox="0 0 25 20" xmlns="http://www.w3.org/2000/svg"><path d="M 0,0 25,0 12.5,20 Z" fill="black" /></svg>\') no-repeat right 7px center/7px 10px;\n  }\n  .multiselect-container.dropdown-menu {\n    width: inherit;\n    overflow: auto auto !important;\n  }\n  .multiselect-option.dropdown-item {\n    color: inherit;\n    padding: 0 24px;\n  }\n  .multiselect-option.dropdown-item.active,\n  .multiselect-option.dropdown-item:active {\n    color: inherit;\n    background-color: #FFFFFF;\n  }\n  .multiselect-option.dropdown-item:focus {\n    outline: none;\n  }\n  .multiselect-group.dropdown-item-text {\n    font-size: 13px;\n  }\n  .form-check-input {\n    display: none;\n  }\n  .form-check-label {\n    font-size: 13px;\n  }\n  .dropdown-item.active label.form-check-label::before {\n    background-color: #60cbe0;\n    border: 1px solid #60cbe0;\n  }\n  .dropdown-item.active label.form-check-label::after {\n    display: block;\n  }\n  label.form-check-label::before {\n    content: "";\n    width: 14px;\n    height: 14px;\n    display: block;\n    border: 1px solid currentColor;\n    border-radius: 2px;\n    box-sizing: border-box;\n    left: -21px;\n    top: calc(50% - 7px);\n    position: absolute;\n  }\n  label.form-check-label {\n    position: relative;\n  }\n  label.form-check-label::after {\n    content: "";\n    width: 5px;\n    height: 8px;\n    box-sizing: border-box;\n    border-bottom: 2px solid white;\n    border-right: 2px solid white;\n    position: absolute;\n    display: none;\n    transform: rotate(45deg);\n    left: -16px;\n    top: calc(50% - 5px);\n    z-index: 1;\n  }\n  div.input-group-prepend > svg.input-group-text {\n    width: 30px !important;\n    height: inherit !important;\n  }\n  .multiselect-filter {\n    position: sticky;\n    top: -6px;\n    left: 0;\n    right: 0;\n    z-index: 2;\n  }\n  .multiselect-filter .input-group-prepend,\n  .multiselect-filter .input-group-append {\n    height: 31px;\n  }\n  span.multiselect-selected-text {\n    width: 100%;\n    overflow: hidden;\n    text-overflow: ellipsis;\n    text-align: left;\n  }\n  span.multiselect-native-select {\n    width: inherit;\n  }\n  .dropdown-item.active:hover {\n    background-color: #f8f9fa;\n  }\n  .multiselect-clear-filter.input-group-text {\n    outline: none;\n  }\n  ',t.fix_collapsed_by_default=function(n){$(".multiselect-group",n).addClass("closed")}},
+"5064499600": function _(e,t,l,s,i){s();const o=e("@bokehjs/core/dom"),n=e("@bokehjs/core/util/types"),d=e("@bokehjs/models/widgets/input_widget"),a=e("04ff99c7d8"),u=a.common_styles+"\n  .multiselect-group.dropdown-item,\n  .multiselect-all.dropdown-item {\n    padding-left: 10px;\n  }\n  .multiselect-all.dropdown-item {\n    padding-bottom: 0;\n  }\n  button.multiselect-group.dropdown-item.active,\n  button.multiselect-group.dropdown-item:active,\n  .multiselect-all.dropdown-item.active,\n  .multiselect-all.dropdown-item:active {\n    background-color: #FFFFFF;\n    color: inherit;\n  }\n  button.multiselect-group.dropdown-item:focus,\n  .multiselect-all.dropdown-item:focus {\n    outline: none;\n  }\n  button.multiselect-group.dropdown-item.active:hover {\n    background-color: #f8f9fa;\n  }\n";class p extends d.InputWidgetView{constructor(){super(...arguments),this.should_select_all=!0,this.all_values=[]}connect_signals(){super.connect_signals();const{value:e,options:t,name:l,title:s,enabled:i}=this.model.properties;this.on_change(e,(()=>this.update_value())),this.on_change([l,s],(()=>this.render())),this.on_change(i,(()=>this.enable_widget())),this.on_change(t,(()=>this.update_options()))}styles(){return[...super.styles(),u]}initialize(){super.initialize(),super.render(),this.select_el=this.init_select_element(),this.model.value||this.model.select_all||this.model.setv({value:[]},{silent:!0})}init_select_element(){const e=(0,o.select)({multiple:"multiple",class:"custom-multiselect",name:this.model.name,style:"display: none;"});return this.group_el.appendChild(e),e}parse_options_list(e){return e.map((e=>{let t,l,s;return(0,n.isString)(e)?l=t=e:[l,t]=e,s=!!this.model.value&&(this.model.is_opt_grouped?this.model.value.some((e=>e[1]===l)):this.model.value.includes(l)),{value:l,label:t,selected:s}}))}parse_options(){if(Array.isArray(this.model.options)){this.model.is_opt_grouped=!1;const e=this.parse_options_list(this.model.options);return this.all_values=e.map((e=>e.value)),e}this.model.is_opt_grouped=!0;const e=Object.entries(this.model.options).map((([e,t])=>({label:e,children:this.parse_options_list(t)})));return this.all_values=e.reduce(((e,{label:t,children:l})=>e.concat(l.map((e=>[t,e.value])))),[]),e}set_plugin_config(){const e={maxHeight:200,selectAllText:"Select All",selectAllValue:"Select All",disableIfEmpty:!0,nonSelectedText:this.model.non_selected_text,enableCollapsibleOptGroups:this.model.collapsible,collapseOptGroupsByDefault:this.model.collapsed_by_default,enableCaseInsensitiveFiltering:this.model.enable_filtering,numberDisplayed:this.model.number_displayed,buttonWidth:"100%",includeSelectAllOption:this.model.include_select_all,enableClickableOptGroups:!0,onDropdownShown:this.on_dropdown_opened.bind(this),onDropdownHidden:this.on_dropdown_closed.bind(this)};return this.model.width&&(e.buttonWidth=`${this.model.width}px`),this.model.collapsible||(e.collapseOptGroupsByDefault=!1),e}apply_unique_styles(){const e=$(this.group_el).parents(".bk-root")[0],t=this.model.width?`${this.model.width}px`:"calc(100% - 4px)",l={"> .bk.custom_select":{width:t,"max-width":t}};for(const t in l)for(const s in l[t])$(t,e).css(s,l[t][s])}apply_plugin(){this.options=this.parse_options(),this.plugin_config=this.set_plugin_config(),$(this.select_el).multiselect(this.plugin_config).multiselect("dataprovider",this.options).multiselect("refresh"),$(".multiselect-container.dropdown-menu",this.group_el).unbind("touchstart"),this.apply_unique_styles(),this.add_options_wrapper(),this.model.collapsed_by_default&&this.model.collapsible&&(0,a.fix_collapsed_by_default)(this.group_el)}render(){this.apply_plugin(),this.enable_widget(),this.select_all(!0)}enable_widget(){(this.model.is_opt_grouped&&this.options.some((e=>e.children.length))||this.options.length)&&$(document).ready((()=>$(this.select_el).multiselect(""+(this.model.enabled?"enable":"disable"))))}on_dropdown_opened(){const e=$("button.multiselect-option.dropdown-item.active",this.group_el);if(!this.model.select_all&&e.length){const t=e[0].offsetTop,l=$(".multiselect-container.dropdown-menu",this.group_el),s=l.outerHeight();l[0].scrollTo(0,t-s/2)}}on_dropdown_closed(){this.model.setv({dropdown_closed:!this.model.dropdown_closed}),setTimeout((()=>{const e=this.get_selected_options(),t=e.length===this.all_values.length,l=this.model.value&&(e.length!==this.model.value.length||this.model.value.some(((t,l)=>t!==e[l])));(t!==this.model.select_all||l)&&this.model.setv({select_all:t,value:e})}),200)}select_all(e){this.model.select_all&&($(this.select_el).multiselect("selectAll",!1).multiselect("refresh"),this.model.setv({value:this.all_values},{silent:!!e}))}update_value(){this.apply_plugin(),this.model.value&&0==this.model.value.length&&this.model.setv({select_all:!1},{silent:!0})}update_options(){this.apply_plugin(),this.select_all(!0)}get_selected_options(){const e=$(this.select_el).val();return this.model.is_opt_grouped?this.all_values.filter((t=>e.includes(t[1]))):e}add_options_wrapper(){$("#items-container",this.group_el).length||$(document).ready((()=>$(".dropdown-item, .multiselect-group",this.group_el).wrapAll("<div id=items-container style='width: max-content; min-width: 100%' />")))}}l.CustomMultiSelectView=p,p.__name__="CustomMultiSelectView";class c extends d.InputWidget{constructor(e){super(e)}static init_CustomMultiSelect(){this.prototype.default_view=p,this.define((({String:e,Array:t,Tuple:l,Or:s,Boolean:i,Number:o,Nullable:n,Dict:d})=>({value:[n(t(s(e,t(e)))),null],options:[s(d(t(s(e,l(e,e)))),t(s(e,l(e,e)))),[]],include_select_all:[i,!1],select_all:[i,!1],number_displayed:[o,1],enable_filtering:[i,!1],enabled:[i,!0],non_selected_text:[e,"Select..."],is_opt_grouped:[i,!1],dropdown_closed:[i,!1],collapsible:[i,!1],collapsed_by_default:[i,!1]})))}}l.CustomMultiSelect=c,c.__name__="CustomMultiSelect",c.init_CustomMultiSelect()},
+"8923166056": function _(n,t,e,o,i){o();const s=n("@bokehjs/core/dom"),r=n("@bokehjs/models/widgets/markup");class l extends r.MarkupView{styles(){return[...super.styles(),'\n/* The toggle-btn - the box around the slider */\n.toggle-btn {\n  position: relative;\n  display: inline-block;\n  width: 30px;\n  height: 13px;\n}\n\n/* Hide default HTML checkbox */\n.toggle-btn input {\n  opacity: 0;\n  width: 0;\n  height: 0;\n}\n\n/* The slider */\n.slider {\n  position: absolute;\n  cursor: pointer;\n  top: 0;\n  left: 0;\n  right: 0;\n  bottom: 0;\n  background-color: #B0AFAF;\n  -webkit-transition: .15s;\n  transition: .15s;\n}\n\n.slider:before {\n  position: absolute;\n  content: "";\n  height: 17px;\n  width: 17px;\n  left: 0px;\n  bottom: -2px;\n  background-color: #F1F1F1;\n  -webkit-transition: .15s;\n  -moz-transition: .15s;\n  transition: .15s;\n}\n\ninput:checked + .slider {\n  background-color: #ABDAE0;\n}\n\ninput:focus + .slider {\n  box-shadow: 0 0 1px #a8ebf8f5;\n}\n\ninput:checked + .slider:before {\n  background-color: #00BCD4;\n  -webkit-transform: translateX(14px);\n  -ms-transform: translateX(14px);\n  transform: translateX(14px);\n}\n\n.slider.round {\n  border-radius: 34px;\n}\n\n.slider.round:before {\n  border-radius: 50%;\n  border: none;\n  box-shadow: 0 0 3px -1px;\n}\n\n.bk.toggle-container {\n  display: flex !important;\n  width: unset !important;\n  align-items: center;\n}\n\n.bk.bk-clearfix.toggle-title {\n  margin-right: 6px;\n}\n'+this.model.styles]}initialize(){super.initialize(),super.render(),this.toggle_btn=this.init_toggle_btn()}init_toggle_btn(){const n=(0,s.label)({class:"toggle-btn"}),t=(0,s.span)({class:"slider round"}),e=(0,s.input)({class:"toggle-checkbox",type:"checkbox"});return e.addEventListener("click",this.toggle_active.bind(this)),n.appendChild(e),n.appendChild(t),n}render(){super.render(),this.markup_el.textContent=this.model.text,$(document).ready(this.on_document_ready.bind(this))}toggle_active(){setTimeout((()=>{this.model.active=!this.model.active}),200)}on_document_ready(){const n=$(this.markup_el).parent();n.addClass("toggle-container"),$(this.markup_el).addClass("toggle-title"),$(".toggle-checkbox",this.toggle_btn).prop("checked",this.model.active),n.append(this.toggle_btn)}}e.CustomToggleView=l,l.__name__="CustomToggleView";class a extends r.Markup{constructor(n){super(n)}static init_CustomToggle(){this.prototype.default_view=l,this.define((({Boolean:n,String:t})=>({active:[n,!1],styles:[t,""]})))}}e.CustomToggle=a,a.__name__="CustomToggle",a.init_CustomToggle()},
+"5e2d22eca0": function _(i,t,e,s,n){s();const l=i("@bokehjs/models/widgets/widget");class o extends l.WidgetView{constructor(){super(...arguments),this.shown_at=null,this.show_timer=null,this.hide_timer=null}connect_signals(){super.connect_signals();const{active:i}=this.model.properties;this.on_change(i,(()=>this.update_visibility()))}render(){super.render(),this.model.active&&this.set_spinner_visibility(!0)}update_visibility(){if(this.model.active)null!=this.hide_timer&&(clearTimeout(this.hide_timer),this.hide_timer=null),null==this.shown_at&&null==this.show_timer&&(this.show_timer=setTimeout((()=>{this.show_timer=null,this.set_spinner_visibility(!0)}),this.model.show_delay));else if(null!=this.show_timer&&(clearTimeout(this.show_timer),this.show_timer=null),null!=this.shown_at&&null==this.hide_timer){const i=Math.max(0,this.model.min_display_time-(Date.now()-this.shown_at));this.hide_timer=setTimeout((()=>{this.hide_timer=null,this.set_spinner_visibility(!1)}),i)}}set_spinner_visibility(i){this.shown_at=i?Date.now():null;const t=document.getElementById(this.model.target_id);null!=t&&(t.style.visibility=i?"visible":"hidden")}}e.LoadingIndicatorView=o,o.__name__="LoadingIndicatorView";class h extends l.Widget{constructor(i){super(i)}static init_LoadingIndicator(){this.prototype.default_view=o,this.define((({Boolean:i,Int:t,String:e})=>({active:[i,!1],show_delay:[t,300],min_display_time:[t,500],target_id:[e,"loading-spinner-invoker"]})))}}e.LoadingIndicator=h,h.__name__="LoadingIndicator",h.init_LoadingIndicator()},
+}, "5e880641a5", {"index":"5e880641a5","custom_widgets/select":"cf02b47aeb","custom_widgets/select_widgets_common_components":"04ff99c7d8","custom_widgets/multiselect":"5064499600","custom_widgets/implementation_files/toggle_btn":"8923166056","custom_widgets/implementation_files/loading_indicator":"5e2d22eca0"}, {});});
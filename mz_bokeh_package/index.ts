@@ -0,0 +1,17 @@
+// The entry point of the Bokeh extension bundle of the custom widgets (see custom_widgets/extension.py).
+import {register_models} from "@bokehjs/base"
+
+import {CustomSelect} from "./custom_widgets/select"
+import {CustomMultiSelect} from "./custom_widgets/multiselect"
+import {CustomToggle} from "./custom_widgets/implementation_files/toggle_btn"
+import {LoadingIndicator} from "./custom_widgets/implementation_files/loading_indicator"
+
+// Models that are loaded from an extension are identified by the qualified names of their Python classes.
+CustomSelect.__module__ = "mz_bokeh_package.custom_widgets.custom_select"
+CustomMultiSelect.__module__ = "mz_bokeh_package.custom_widgets.custom_multiselect"
+CustomToggle.__module__ = "mz_bokeh_package.custom_widgets.custom_toggle"
+LoadingIndicator.__module__ = "mz_bokeh_package.custom_widgets.custom_loading_indicator"
+
+export {CustomSelect, CustomMultiSelect, CustomToggle, LoadingIndicator}
+
+register_models({CustomSelect, CustomMultiSelect, CustomToggle, LoadingIndicator})
@@ -1,3 +1,8 @@
 from .current_user import CurrentUser, FetchUserInfoError  # noqa F401
 from .environment import Environment  # noqa F401
 from .bokeh_utilities import BokehUtilities  # noqa F401
+from .profiling import HandlerProfiler  # noqa F401
+from .patch_accounting import PatchAccountant  # noqa F401
+from .group_index import GroupIndex  # noqa F401
+from .decimation import RangeDecimator  # noqa F401
+from .consolidation import consolidate_renderers  # noqa F401
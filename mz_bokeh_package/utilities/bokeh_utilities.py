@@ -1,16 +1,40 @@
 import re
 import inspect
-from functools import partial
-from typing import Optional
+import numbers
+from concurrent.futures import Executor
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+import numpy as np
+from bokeh.document import Document
+from bokeh.models import ColumnDataSource
 from bokeh.io import curdoc
+from bokeh.util.serialization import BINARY_ARRAY_TYPES, convert_datetime_array
+
+from .event_handler_scheduler import EventHandlerScheduler, is_current_invocation_cancelled
+from .group_index import factorize
+from .profiling import InvocationProfile
 
 TYPE_HINT_PATTERN = r"\: ?[^ ,)]+"
+INT_DTYPES = (np.int8, np.uint8, np.int16, np.uint16, np.int32, np.uint32)
+
+# Floats are converted to float32 only if the conversion error is negligible relative to the values' span.
+FLOAT32_MAX_RELATIVE_ERROR = 1e-6
 
 
 class BokehUtilities:
 
     @staticmethod
-    def async_event_handler(_func=None, *, function_to_execute: Optional[str] = None):
+    def async_event_handler(
+        _func=None,
+        *,
+        function_to_execute: Optional[str] = None,
+        executor: Optional[Union[str, Executor]] = None,
+        policy: Optional[str] = None,
+        wait: int = 300,
+        combine_updates: bool = False,
+        profile: bool = False,
+    ):
         """A decorator for event handlers to run them asynchronously and display the loading spinner while they run
 
         This decorator will cause the decorated event handler to run asynchronously, the loading spinner
@@ -18,25 +42,60 @@ class BokehUtilities:
         event handler is executed with a True parameter and after with a False parameter.
         The latter can be used, for example, to disable certain controls while the event handler is executing.
 
+        By default, the event handler runs in a next tick callback, i.e. on the server's IOLoop while holding the
+        document lock, which blocks all the sessions that are served by the same process. When an executor is
+        given, the event handler runs in a worker thread instead, outside the document lock.
+        Such an event handler must not modify the document directly. Instead, it may return a callable that
+        applies the changes, which is called in a next tick callback once the event handler is done. For example:
+
+            @BokehUtilities.async_event_handler(executor="thread")
+            def _on_analyze(self, event):
+                result = self._run_expensive_analysis()
+                return partial(self._update_plot, result)
+
+        CPU-bound work that holds the GIL can be offloaded further by the event handler itself, e.g. by submitting a
+        module-level function to a ProcessPoolExecutor and waiting for its result in the worker thread.
+
+        When an event fires many times in a short period (e.g. dragging a spinner), a policy can be used to avoid
+        running the event handler for every change:
+            - "latest": invocations that were superseded by a newer invocation before they started are dropped.
+                Superseded invocations that already run in an executor are signaled to stop (they can poll
+                BokehUtilities.is_cancelled()) and the callables they return are not applied.
+            - "debounce": the event handler runs only after "wait" milliseconds passed without a newer invocation.
+            - "throttle": the event handler runs at most once every "wait" milliseconds, the invocations that are
+                made in between are coalesced into a single invocation with the latest arguments.
+        The "is_loading" state value is reference-counted: it is turned off only once no invocation of any event handler
+        that shares the same state is pending (function_to_execute is called with False once no invocation of the
+        event handler itself is pending).
+
         Params:
             function_to_execute - the name of a method of the class that accepts a single boolean parameter.
             For example, there could be a method `def _disable_controls(self, disable: bool), in which case the
             string "_disable_controls" should be passed.
+            executor - either "thread", to run the event handler in a process-wide thread pool, or an instance of
+            concurrent.futures.Executor that runs its tasks in threads of the current process (process pools are not
+            supported). Defaults to None (run the event handler on the IOLoop).
+            policy - None, "latest", "debounce" or "throttle" (see above). Defaults to None (run every invocation).
+            wait - the number of milliseconds to wait for the "debounce" and "throttle" policies. Defaults to 300.
+            combine_updates - whether to hold the document while the event handler (or the callable it returns)
+            modifies it, so repeated changes of the same property are merged (see combined_updates). Defaults to False.
+            profile - whether to record the wall time, CPU time, queue delay, number of document change events and
+            serialized patch size of each invocation in the HandlerProfiler registry. Defaults to False.
         """
 
         def _async_event_handler(func):
+            scheduler = EventHandlerScheduler(
+                func,
+                function_to_execute,
+                executor,
+                policy,
+                wait,
+                updates_context=BokehUtilities.combined_updates if combine_updates else None,
+                profile=profile,
+            )
 
             def outer(self, *args, **kwargs):
-                self._state["is_loading"] = True
-                if function_to_execute is not None:
-                    getattr(self, function_to_execute)(True)
-                curdoc().add_next_tick_callback(partial(inner, func, self, *args, **kwargs))
-
-            def inner(f, self, *args, **kwargs):
-                f(self, *args, **kwargs)
-                if function_to_execute is not None:
-                    getattr(self, function_to_execute)(False)
-                self._state["is_loading"] = False
+                scheduler.schedule(curdoc(), self, args, kwargs)
 
             # create a version of outer that has the same signature as func (since that is expected by Bokeh)
             # Note! type hints are removed from the signature.
@@ -54,6 +113,76 @@ class BokehUtilities:
         else:
             return _async_event_handler(_func)
 
+    @staticmethod
+    def profile_event_handler(_func=None, *, name: Optional[str] = None):
+        """A decorator for (synchronous) event handlers that records their cost in the HandlerProfiler registry.
+
+        For each invocation it records the wall time, CPU time, number of document change events and the size of the
+        serialized patch that the changes produce. Use async_event_handler(profile=True) for async event handlers.
+
+        Params:
+            name - the name to record the profile under. Defaults to the qualified name of the event handler.
+        """
+
+        def _profile_event_handler(func):
+            profile_name = name or f"{func.__module__}.{func.__qualname__}"
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                profile = InvocationProfile(profile_name)
+                try:
+                    with profile.measure(curdoc()):
+                        return func(*args, **kwargs)
+                finally:
+                    profile.record()
+
+            return wrapper
+
+        if _func is None:
+            return _profile_event_handler
+        else:
+            return _profile_event_handler(_func)
+
+    @staticmethod
+    def is_cancelled() -> bool:
+        """Returns whether the running event handler invocation was superseded by a newer one.
+
+        Event handlers that are decorated with async_event_handler(executor=..., policy="latest") can poll this
+        function during long computations and return early once it returns True.
+        """
+        return is_current_invocation_cancelled()
+
+    @staticmethod
+    @contextmanager
+    def combined_updates(doc: Optional[Document] = None) -> Iterator[None]:
+        """A context manager that holds the document changes made inside it until it exits.
+
+        While the context is active the document is held with the "combine" policy, hence repeated changes of the same
+        property are merged into one, and Python callbacks of the changed properties are deferred until the context
+        exits. Note! Bokeh still sends the remaining changes to the browser one by one, i.e. the context saves the
+        redundant changes, not the messages of distinct changes. Nested contexts are merged into the outermost one.
+
+        Usage:
+            with BokehUtilities.combined_updates():
+                plot.title.text = "New title"
+                plot.xaxis.axis_label = "Time"
+
+        Params:
+            doc - the document to hold. Defaults to the current document.
+        """
+        doc = doc or curdoc()
+
+        # An outer context (or another hold) is already active, its owner will release the changes.
+        if doc.callbacks.hold_value is not None:
+            yield
+            return
+
+        doc.hold("combine")
+        try:
+            yield
+        finally:
+            doc.unhold()
+
     @staticmethod
     def silent_property_change(widget, property, value):
         """This function allows updating a property without triggering the event handler.
@@ -63,6 +192,194 @@ class BokehUtilities:
         setattr(widget, property, value)
         widget._callbacks[property] = callbacks
 
+    @staticmethod
+    def compact_array(values: Sequence[Any]) -> Union[np.ndarray, Sequence[Any]]:
+        """Converts a data source column to the most compact dtype that Bokeh sends as a binary buffer.
+
+        Integers are converted to the smallest (8/16/32 bit) integer dtype that holds them, floats are converted to
+        float32 when the loss of precision is negligible relative to the span of the values (e.g. not for timestamps),
+        datetimes are converted to milliseconds since epoch, and numeric object arrays (e.g. with None values) are
+        converted to floats. Other columns (e.g. strings, even numeric-looking ones like zero-padded ids, see
+        categorize) are returned as they are.
+
+        Params:
+            values - the column's values.
+        """
+        array = convert_datetime_array(np.asarray(values))
+
+        if array.dtype == object:
+            if not BokehUtilities._is_numeric_array(array):
+                return values
+            array = array.astype(float)
+
+        if array.dtype.kind in "iu":
+            array = BokehUtilities._compact_int_array(array)
+        elif array.dtype.kind == "f" and array.dtype != np.float32:
+            array = BokehUtilities._compact_float_array(array)
+
+        return np.ascontiguousarray(array) if array.dtype in BINARY_ARRAY_TYPES else values
+
+    @staticmethod
+    def categorize(values: Sequence[Any]) -> Tuple[np.ndarray, List[Any]]:
+        """Encodes a categorical column (e.g. strings) as compact integer codes and a list of the categories.
+
+        The codes are sent as a binary buffer, and can be mapped back to the categories (or to their colors) in the
+        browser, e.g. using a LinearColorMapper with a palette of the categories' colors, low=-0.5 and
+        high=len(categories) - 0.5.
+
+        Params:
+            values - the column's values.
+        """
+        codes, categories = factorize(values)
+        return BokehUtilities._compact_int_array(codes), categories.tolist()
+
+    @staticmethod
+    def set_source_data(source: ColumnDataSource, data: Dict[str, Sequence[Any]]):
+        """Replaces the data of a data source with compact arrays (see compact_array).
+
+        Params:
+            source - the data source.
+            data - a mapping of column names to columns.
+        """
+        source.data = {name: BokehUtilities.compact_array(column) for name, column in data.items()}
+
+    @staticmethod
+    def stream(source: ColumnDataSource, new_data: Dict[str, Sequence[Any]], rollover: Optional[int] = None):
+        """Streams data to a data source as binary buffers.
+
+        The new values are converted to the dtypes of the source's (binary) columns, or to compact arrays (see
+        compact_array) otherwise. A column whose dtype can't hold the new values without loss (e.g. an int8 column
+        and a value of 1000) is first replaced with a compact array of a dtype that holds all the values.
+
+        Params:
+            source - the data source.
+            new_data - a mapping of column names to the values to append.
+            rollover - the maximal length of the columns, older values are discarded. Defaults to None (no limit).
+        """
+        converted_data = {}
+        for name, values in new_data.items():
+            array = convert_datetime_array(np.asarray(values))
+            dtype = BokehUtilities._fit_column(source, name, array)
+            converted_data[name] = BokehUtilities.compact_array(values) if dtype is None else \
+                np.ascontiguousarray(array, dtype=dtype)
+
+        source.stream(converted_data, rollover)
+
+    @staticmethod
+    def patch(source: ColumnDataSource, patches: Dict[str, List[Tuple[Any, Any]]]):
+        """Patches a data source, sending patched slices as binary buffers.
+
+        Like in stream, a column whose dtype can't hold the patched values without loss is first replaced with a
+        compact array of a dtype that holds all the values.
+
+        Params:
+            source - the data source.
+            patches - a mapping of column names to lists of (index, value) patches (see ColumnDataSource.patch).
+                The values of slice patches are converted to the dtypes of the patched columns.
+        """
+        converted_patches = {}
+        for name, column_patches in patches.items():
+            # Patches of multi-dimensional columns (e.g. images) are applied as they are.
+            values = [
+                convert_datetime_array(np.ravel(value)) for index, value in column_patches
+                if not isinstance(index, tuple)
+            ]
+            dtype = BokehUtilities._fit_column(source, name, np.concatenate(values)) if values else None
+
+            converted_patches[name] = [
+                (index, np.ascontiguousarray(convert_datetime_array(np.asarray(value)), dtype=dtype))
+                if isinstance(index, slice) and dtype is not None else (index, value)
+                for index, value in column_patches
+            ]
+
+        source.patch(converted_patches)
+
+    @staticmethod
+    def _fit_column(source: ColumnDataSource, name: str, values: np.ndarray) -> Optional[np.dtype]:
+        """Returns the dtype to convert values that are added to a binary column to, or None if the column isn't
+        binary. If the column's dtype can't hold the values without loss, the column is replaced with a compact array
+        (see compact_array) of both its values and the new ones.
+        """
+        column = source.data.get(name)
+        if not isinstance(column, np.ndarray) or column.dtype not in BINARY_ARRAY_TYPES:
+            return None
+
+        if BokehUtilities._fits_dtype(column, values):
+            return column.dtype
+
+        combined_array = BokehUtilities.compact_array(np.concatenate([column, values]))
+        if not isinstance(combined_array, np.ndarray):
+            return None
+
+        source.data[name] = np.ascontiguousarray(combined_array[:len(column)])
+        return combined_array.dtype
+
+    @staticmethod
+    def _fits_dtype(column: np.ndarray, values: np.ndarray) -> bool:
+        """Returns whether a column's dtype holds new values without loss. The values of a float32 column may lose
+        as much precision as compact_array allows relative to the span of both the column's values and the new ones.
+        """
+        if not BokehUtilities._is_numeric_array(values):
+            return False
+
+        try:
+            with np.errstate(invalid="ignore", over="ignore"):
+                converted_values = values.astype(column.dtype)
+            float_values = values.astype(np.float64)
+        except (TypeError, ValueError, OverflowError):
+            return False
+
+        if column.dtype.kind in "iu":
+            return np.array_equal(converted_values, float_values)
+
+        if column.dtype != np.float32:
+            return True
+
+        finite = np.isfinite(float_values)
+        if not finite.any():
+            return True
+
+        all_values = np.concatenate([column[np.isfinite(column)], float_values[finite]])
+        span = all_values.max() - all_values.min()
+        error = np.abs(converted_values[finite] - float_values[finite]).max()
+
+        return error <= FLOAT32_MAX_RELATIVE_ERROR * span
+
+    @staticmethod
+    def _is_numeric_array(array: np.ndarray) -> bool:
+        """Returns whether an array holds only numbers (or None values, in object arrays)."""
+        if array.dtype == object:
+            return all(value is None or isinstance(value, numbers.Real) for value in array.flat)
+
+        return array.dtype.kind in "biuf"
+
+    @staticmethod
+    def _compact_int_array(array: np.ndarray) -> np.ndarray:
+        if len(array) == 0:
+            return array.astype(np.int32)
+
+        low, high = array.min(), array.max()
+        for dtype in INT_DTYPES:
+            if np.iinfo(dtype).min <= low and high <= np.iinfo(dtype).max:
+                return array.astype(dtype, copy=False)
+
+        # JavaScript has no 64-bit integer arrays.
+        return array.astype(np.float64)
+
+    @staticmethod
+    def _compact_float_array(array: np.ndarray) -> np.ndarray:
+        array = array.astype(np.float64, copy=False)
+        compact_array = array.astype(np.float32)
+
+        finite = np.isfinite(array)
+        if not finite.any():
+            return compact_array
+
+        span = array[finite].max() - array[finite].min()
+        error = np.abs(compact_array[finite] - array[finite]).max()
+
+        return compact_array if error <= FLOAT32_MAX_RELATIVE_ERROR * span else array
+
     @staticmethod
     def get_document_title(session_context):
         """Returns the title of the current bokeh document.
@@ -1,7 +1,10 @@
 import itertools
+from functools import lru_cache
 import numpy as np
-import seaborn as sns
-from typing import Iterable, List, Tuple
+from typing import Iterable, Optional, Sequence, Tuple
+from bokeh.models import LinearColorMapper
+
+from .husl import husl_to_rgb, rgb_to_husl
 
 
 TURQUOISE = "#6acece"
@@ -14,6 +17,33 @@ BLUE = "#5a52da"
 EXTRA_LIGHT_YELLOW = "#f4ffca"
 BASE_COLORS = [DARK_BLUE, PURPLE, BLUE, TURQUOISE]
 
+# The number of colors that blended palettes are sampled from (like the lookup table of a matplotlib colormap).
+BLEND_LUT_SIZE = 256
+
+# The number of shades of light palettes.
+LIGHT_PALETTE_SIZE = 6
+
+# The value that the components of a color are changed by in order to find its darker/lighter shade.
+SHADE_DELTA = 30
+
+# Lookup tables for converting between hex and RGB colors: the value of each (ASCII code of a) hex digit, and the
+# two (ASCII codes of the) hex digits of each value.
+INVALID_HEX_DIGIT = 255
+HEX_DIGITS_VALUES = np.full(256, INVALID_HEX_DIGIT, dtype=np.uint8)
+HEX_DIGITS_VALUES[np.frombuffer(b"0123456789abcdef", dtype=np.uint8)] = np.arange(16)
+HEX_DIGITS_VALUES[np.frombuffer(b"0123456789ABCDEF", dtype=np.uint8)] = np.arange(16)
+HEX_BYTES = np.frombuffer("".join(f"{value:02x}" for value in range(256)).encode(), dtype=np.uint8).reshape(256, 2)
+
+# The scales by which values are mapped to the colors of a palette (see map_values_to_codes).
+COLOR_SCALES = ("linear", "log", "quantile")
+
+# The code of missing values (see map_values_to_codes), and their default color.
+MISSING_VALUE_CODE = -1
+NAN_COLOR = "#00000000"
+
+# The maximal number of generated palettes that are cached (per generating function).
+PALETTES_CACHE_SIZE = 128
+
 
 def hex_to_rgb(hex_color: str) -> Tuple[int]:
     """Converts Hex color to RGB.
@@ -24,8 +54,7 @@ def hex_to_rgb(hex_color: str) -> Tuple[int]:
     Returns:
         Tuple[int]: RGB color (e.g. (10, 154, 130)).
     """
-    h = hex_color.lstrip('#')
-    return tuple(int(h[i:i+2], 16) for i in (0, 2, 4))
+    return tuple(hex_to_rgb_array([hex_color])[0].tolist())
 
 
 def rgb_to_hex(rgb_color: Tuple[int]) -> str:
@@ -37,12 +66,7 @@ def rgb_to_hex(rgb_color: Tuple[int]) -> str:
     Returns:
         str: Hex color (e.g. "#4ac5db").
     """
-    MIN = 0
-    MAX = 255
-    return "#" + "".join(
-        "{:02x}".format(np.clip(x, MIN, MAX))
-        for x in rgb_color
-    )
+    return str(rgb_array_to_hex([rgb_color])[0])
 
 
 def normalize_rgb(rgb_color: Tuple[int]) -> Tuple[float]:
@@ -54,7 +78,7 @@ def normalize_rgb(rgb_color: Tuple[int]) -> Tuple[float]:
     Returns:
         Tuple[float]: RGB color (e.g. (10/255, 154/255, 130/255)).
     """
-    return tuple(x/255 for x in rgb_color)
+    return tuple(normalize_rgb_array(rgb_color).tolist())
 
 
 def denormalize_rgb(rgb_color: Tuple[float]) -> Tuple[int]:
@@ -66,41 +90,251 @@ def denormalize_rgb(rgb_color: Tuple[float]) -> Tuple[int]:
     Returns:
         Tuple[float]: RGB color (e.g. (10, 154, 130)).
     """
-    return tuple(int(x*255) for x in rgb_color)
+    return tuple(denormalize_rgb_array(rgb_color).tolist())
+
+
+def hex_to_rgb_array(hex_colors: Sequence[str]) -> np.ndarray:
+    """Converts Hex colors to RGB.
+
+    Args:
+        hex_colors (Sequence[str]): Hex colors (e.g. ["#4ac5db", "#0a9a82"]).
+
+    Returns:
+        np.ndarray: A (n, 3) uint8 array of RGB colors (e.g. [[74, 197, 219], [10, 154, 130]]).
+    """
+    colors = np.char.lstrip(np.asarray(hex_colors, dtype=str).reshape(-1), "#")
+    if np.any(np.char.str_len(colors) < 6):
+        raise ValueError("Invalid hex colors, expected 6 hex digits per color")
+
+    # Map the (ASCII codes of the) first 6 characters of each color to the values of the hex digits.
+    digits = HEX_DIGITS_VALUES[np.frombuffer(colors.astype("S6").tobytes(), dtype=np.uint8)].reshape(-1, 6)
+    if np.any(digits == INVALID_HEX_DIGIT):
+        raise ValueError("Invalid hex colors, expected 6 hex digits per color")
+
+    return (digits[:, 0::2] << 4) | digits[:, 1::2]
+
+
+def rgb_array_to_hex(rgb_colors: np.ndarray) -> np.ndarray:
+    """Converts RGB colors to Hex.
+
+    Args:
+        rgb_colors (np.ndarray): A (n, 3) array of RGB colors (e.g. [[74, 197, 219], [10, 154, 130]]). The components
+            are clipped to the range from 0 to 255.
+
+    Returns:
+        np.ndarray: An array of Hex colors (e.g. ["#4ac5db", "#0a9a82"]).
+    """
+    rgb_colors = np.clip(rgb_colors, 0, 255).astype(np.uint8).reshape(-1, 3)
+
+    chars = np.empty((len(rgb_colors), 7), dtype=np.uint8)
+    chars[:, 0] = ord("#")
+    chars[:, 1:] = HEX_BYTES[rgb_colors].reshape(-1, 6)
+    return chars.view("S7").reshape(-1).astype(str)
+
+
+def normalize_rgb_array(rgb_colors: np.ndarray) -> np.ndarray:
+    """Normalizes RGB colors so their components will range from 0 to 1.
+
+    Args:
+        rgb_colors (np.ndarray): An array of RGB colors, with components that range from 0 to 255.
+
+    Returns:
+        np.ndarray: A float array of the same shape, with components that range from 0 to 1.
+    """
+    return np.asarray(rgb_colors, dtype=float) / 255
+
+
+def denormalize_rgb_array(rgb_colors: np.ndarray) -> np.ndarray:
+    """Denormalizes RGB colors so their components will range from 0 to 255.
+
+    Args:
+        rgb_colors (np.ndarray): An array of RGB colors, with components that range from 0 to 1.
+
+    Returns:
+        np.ndarray: A uint8 array of the same shape, with (truncated) components that range from 0 to 255.
+    """
+    return (np.clip(rgb_colors, 0, 1) * 255).astype(np.uint8)
+
+
+def darken_rgb_array(rgb_colors: np.ndarray, delta: int = SHADE_DELTA) -> np.ndarray:
+    """Finds darker shades for RGB colors by decreasing their components.
+
+    Args:
+        rgb_colors (np.ndarray): An array of RGB colors, with components that range from 0 to 255.
+        delta (int, optional): The value to decrease the components by. Defaults to SHADE_DELTA.
+
+    Returns:
+        np.ndarray: A uint8 array of the darker shades.
+    """
+    return lighten_rgb_array(rgb_colors, -delta)
+
+
+def lighten_rgb_array(rgb_colors: np.ndarray, delta: int = SHADE_DELTA) -> np.ndarray:
+    """Finds lighter shades for RGB colors by increasing their components.
+
+    Args:
+        rgb_colors (np.ndarray): An array of RGB colors, with components that range from 0 to 255.
+        delta (int, optional): The value to increase the components by. Defaults to SHADE_DELTA.
+
+    Returns:
+        np.ndarray: A uint8 array of the lighter shades.
+    """
+    # Each component is clipped to (0, 255) in order to keep it valid.
+    return np.clip(np.asarray(rgb_colors, dtype=np.int32) + delta, 0, 255).astype(np.uint8)
+
+
+class Palette(tuple):
+    """An immutable palette of hex colors, which also holds its colors as a read-only (n, 3) uint8 RGB array.
+
+    A palette is a tuple of hex colors, hence it can be used wherever Bokeh expects a palette.
+
+    Usage:
+        palette = generate_continuous_palette([TURQUOISE, PURPLE])
+        palette[0]  # "#6acece"
+        palette.rgb[0]  # array([106, 206, 206], dtype=uint8)
+    """
+
+    def __new__(cls, colors: Iterable[str]) -> "Palette":
+        """Creates a Palette instance.
+
+        Args:
+            colors (Iterable[str]): Hex colors (e.g. "#4ac5db").
+        """
+        colors = tuple(colors)
+        return cls._create(colors, hex_to_rgb_array(colors))
+
+    @classmethod
+    def from_rgb(cls, rgb: np.ndarray) -> "Palette":
+        """Creates a Palette instance out of RGB colors.
+
+        Args:
+            rgb (np.ndarray): A (n, 3) array of RGB colors, with components that range from 0 to 255.
+
+        Returns:
+            Palette: The palette.
+        """
+        rgb = np.clip(rgb, 0, 255).astype(np.uint8).reshape(-1, 3)
+        return cls._create(rgb_array_to_hex(rgb).tolist(), rgb)
+
+    @classmethod
+    def _create(cls, colors: Iterable[str], rgb: np.ndarray) -> "Palette":
+        palette = super().__new__(cls, colors)
+
+        rgb.flags.writeable = False
+        palette._rgb = rgb
+        return palette
+
+    @property
+    def rgb(self) -> np.ndarray:
+        return self._rgb
+
+    def __repr__(self) -> str:
+        return f"Palette({super().__repr__()})"
+
+    def __reduce__(self):
+        return Palette, (tuple(self),)
+
+
+def blend_palette(colors: Sequence[Tuple[float]], n_colors: int = 6) -> np.ndarray:
+    """Blends a sequence of colors into a palette.
 
+    The colors are linearly interpolated into a lookup table of BLEND_LUT_SIZE colors, out of which the palette's
+    colors are sampled at equal intervals. This matches the palettes of seaborn's "blend_palette".
 
-def generate_continuous_palette(colors, n_colors: int = 256) -> List[str]:
+    Args:
+        colors (Sequence[Tuple[float]]): Normalized RGB colors (e.g. (10/255, 154/255, 130/255)).
+        n_colors (int, optional): Number of colors to include in the resulting palette. Defaults to 6.
+
+    Returns:
+        np.ndarray: A (n_colors, 3) array of normalized RGB colors.
+    """
+    colors = np.asarray(colors, dtype=float).reshape(-1, 3)
+    if len(colors) == 1:
+        return np.repeat(colors, n_colors, axis=0)
+
+    # Interpolate the colors (positioned at equal intervals) into the lookup table.
+    positions = np.linspace(0, 1, len(colors)) * (BLEND_LUT_SIZE - 1)
+    lut_positions = (BLEND_LUT_SIZE - 1) * np.linspace(0, 1, BLEND_LUT_SIZE)
+    upper = np.searchsorted(positions, lut_positions)[1:-1]
+    distance = (lut_positions[1:-1] - positions[upper - 1]) / (positions[upper] - positions[upper - 1])
+    lut = np.concatenate([
+        colors[:1],
+        distance[:, np.newaxis] * (colors[upper] - colors[upper - 1]) + colors[upper - 1],
+        colors[-1:],
+    ])
+    lut = np.clip(lut, 0.0, 1.0)
+
+    # Sample the lookup table.
+    indices = np.linspace(0, 1, int(n_colors)) * BLEND_LUT_SIZE
+    indices[indices == BLEND_LUT_SIZE] = BLEND_LUT_SIZE - 1
+    return lut[indices.astype(int)]
+
+
+def light_palette(color: Tuple[float], n_colors: int = LIGHT_PALETTE_SIZE) -> np.ndarray:
+    """Generates a palette that blends from a light gray with the hue of a color to the color.
+
+    This matches the palettes of seaborn's "light_palette".
+
+    Args:
+        color (Tuple[float]): Normalized RGB color (e.g. (10/255, 154/255, 130/255)).
+        n_colors (int, optional): Number of colors to include in the resulting palette.
+            Defaults to LIGHT_PALETTE_SIZE.
+
+    Returns:
+        np.ndarray: A (n_colors, 3) array of normalized RGB colors, from the lightest to the given color.
+    """
+    hue, saturation, _ = rgb_to_husl(*color)
+    gray = np.clip(husl_to_rgb(hue, .15 * saturation, 95), 0, 1)
+    return blend_palette([gray, color], n_colors)
+
+
+def generate_continuous_palette(colors: Sequence[str], n_colors: int = 256) -> Palette:
     """Generates a continuous color palette out of a given sequence of colors.
 
+    The palettes are cached (see PALETTES_CACHE_SIZE), hence generating the same palette again is free.
+
     Args:
-        colors (str): A sequence of Hex colors.
+        colors (Sequence[str]): A sequence of Hex colors.
         n_colors (int, optional): Number of colors to include in the resulting palette. Defaults to 256.
 
     Returns:
-        List[str]: A continuous color palette.
+        Palette: A continuous color palette.
     """
-    palette = sns.blend_palette([normalize_rgb(hex_to_rgb(c)) for c in colors], n_colors=n_colors)
-    return [rgb_to_hex(denormalize_rgb(color)) for color in palette]
+    return _generate_continuous_palette(tuple(colors), int(n_colors))
 
 
-def generate_categorical_palette(base_colors: List[str] = BASE_COLORS) -> List[str]:
+def generate_categorical_palette(base_colors: Sequence[str] = BASE_COLORS) -> Palette:
     """Generates a categorical color palette given a list of base colors.
 
     The function adds lighter shades of the base colors so the resulting palette includes
-    the base colors and their light shades.
+    the base colors and their light shades. The palettes are cached (see PALETTES_CACHE_SIZE).
 
     Args:
-        base_colors (List[str], optional): Hex colors. Defaults to BASE_COLORS.
+        base_colors (Sequence[str], optional): Hex colors. Defaults to BASE_COLORS.
 
     Returns:
-        List[str]: A categorical palette.
+        Palette: A categorical palette.
     """
-    lighter_palettes = [sns.light_palette(normalize_rgb(hex_to_rgb(hex_color))) for hex_color in base_colors]
-    return [
-        rgb_to_hex(denormalize_rgb(color))
-        for palette in list(zip(*lighter_palettes))[::-2]
-        for color in palette
-    ]
+    return _generate_categorical_palette(tuple(base_colors))
+
+
+@lru_cache(maxsize=PALETTES_CACHE_SIZE)
+def _generate_continuous_palette(colors: Tuple[str], n_colors: int) -> Palette:
+    palette = blend_palette(normalize_rgb_array(hex_to_rgb_array(colors)), n_colors=n_colors)
+
+    # Truncate the components, like denormalize_rgb.
+    return Palette.from_rgb(palette * 255)
+
+
+@lru_cache(maxsize=PALETTES_CACHE_SIZE)
+def _generate_categorical_palette(base_colors: Tuple[str]) -> Palette:
+    lighter_palettes = np.array([
+        light_palette(color) for color in normalize_rgb_array(hex_to_rgb_array(base_colors)).tolist()
+    ]).reshape(-1, LIGHT_PALETTE_SIZE, 3)
+
+    # The base colors, followed by each of their lighter shades (every second shade, from the darkest).
+    shades = lighter_palettes[:, ::-2].transpose(1, 0, 2)
+    return Palette.from_rgb(shades.reshape(-1, 3) * 255)
 
 
 def make_palette_cyclic(palette: Iterable[str]) -> Iterable[str]:
@@ -124,15 +358,159 @@ def find_darker_shade(color: str) -> str:
     Returns:
         str: A darker hex color.
     """
-    MIN = 0
-    MAX = 255
-    DELTA = 30
-    hex_color = color.lstrip("#")
-
-    # For each of the RGB parts, find a darker shade by decreasing the value (by "DELTA") and
-    # concatenate the results back together. Each result is being clipped to (MIN, MAX)
-    # in order to keep it valid.
-    return "#" + "".join(
-        "{:02x}".format(np.clip(int(hex_color[i:i+2], 16) - DELTA, MIN, MAX))
-        for i in (0, 2, 4)
+    return str(find_darker_shades([color])[0])
+
+
+def find_lighter_shade(color: str) -> str:
+    """Finds a lighter shade for a given hex color.
+
+    Args:
+        color (str): A valid hex color (e.g "#4F4F4F").
+
+    Returns:
+        str: A lighter hex color.
+    """
+    return str(find_lighter_shades([color])[0])
+
+
+def find_darker_shades(colors: Sequence[str]) -> np.ndarray:
+    """Finds darker shades for hex colors.
+
+    Args:
+        colors (Sequence[str]): Valid hex colors (e.g ["#4F4F4F", "#6acece"]).
+
+    Returns:
+        np.ndarray: An array of the darker hex colors.
+    """
+    return rgb_array_to_hex(darken_rgb_array(hex_to_rgb_array(colors)))
+
+
+def find_lighter_shades(colors: Sequence[str]) -> np.ndarray:
+    """Finds lighter shades for hex colors.
+
+    Args:
+        colors (Sequence[str]): Valid hex colors (e.g ["#4F4F4F", "#6acece"]).
+
+    Returns:
+        np.ndarray: An array of the lighter hex colors.
+    """
+    return rgb_array_to_hex(lighten_rgb_array(hex_to_rgb_array(colors)))
+
+
+def map_values_to_codes(
+    values: np.ndarray,
+    n_colors: int,
+    scale: str = "linear",
+    low: Optional[float] = None,
+    high: Optional[float] = None,
+) -> np.ndarray:
+    """Maps numeric values to the indices (codes) of the colors of a palette.
+
+    The range from "low" to "high" is divided into n_colors bins, and each value is mapped to the index of its bin.
+    Values below "low" (above "high") are mapped to the first (last) color. Missing values (NaN, and non-positive
+    values of a "log" scale) are mapped to MISSING_VALUE_CODE.
+
+    Args:
+        values (np.ndarray): The values, an array of any shape.
+        n_colors (int): The number of colors of the palette.
+        scale (str, optional): "linear" (bins of equal widths), "log" (bins of equal widths in log scale) or
+            "quantile" (bins of equal numbers of values, "low" and "high" are ignored). Defaults to "linear".
+        low (Optional[float], optional): The value of the first color. Defaults to None (the minimal value).
+        high (Optional[float], optional): The value of the last color. Defaults to None (the maximal value).
+
+    Returns:
+        np.ndarray: The codes, an integer array of the same shape as the values. Use "create_codes_color_mapper" in
+            order to color the codes in the browser.
+    """
+    if scale not in COLOR_SCALES:
+        raise ValueError(f'Invalid color scale "{scale}". Valid scales: {COLOR_SCALES}.')
+
+    if n_colors < 1:
+        raise ValueError("The palette must have at least one color")
+
+    values = np.asarray(values, dtype=float)
+    if scale == "log":
+        with np.errstate(divide="ignore", invalid="ignore"):
+            values = np.where(values > 0, np.log10(values), np.nan)
+        low, high = (np.log10(bound) if bound is not None else None for bound in (low, high))
+
+    missing = np.isnan(values)
+    codes = np.full(values.shape, MISSING_VALUE_CODE, dtype=np.min_scalar_type(-n_colors))
+    if missing.all():
+        return codes
+
+    valid_values = values[~missing]
+    if scale == "quantile":
+        edges = np.quantile(valid_values, np.linspace(0, 1, n_colors + 1)[1:-1])
+    else:
+        low = valid_values.min() if low is None else low
+        high = valid_values.max() if high is None else high
+        edges = np.linspace(low, high, n_colors + 1)[1:-1]
+
+    # A value on the edge of two bins belongs to the upper bin (and the maximal value belongs to the last bin).
+    codes[~missing] = np.searchsorted(edges, valid_values, side="right")
+    return codes
+
+
+def map_values_to_rgba(
+    values: np.ndarray,
+    palette: Sequence[str],
+    scale: str = "linear",
+    low: Optional[float] = None,
+    high: Optional[float] = None,
+    nan_color: str = NAN_COLOR,
+) -> np.ndarray:
+    """Maps numeric values to the colors of a palette, as packed RGBA colors (e.g. for "image_rgba").
+
+    Args:
+        values (np.ndarray): The values, an array of any shape (e.g. the pixels of an image).
+        palette (Sequence[str]): Hex colors (or a Palette).
+        scale (str, optional): See map_values_to_codes. Defaults to "linear".
+        low (Optional[float], optional): See map_values_to_codes. Defaults to None.
+        high (Optional[float], optional): See map_values_to_codes. Defaults to None.
+        nan_color (str, optional): The hex color (with an optional alpha, e.g. "#80808080") of missing values.
+            Defaults to NAN_COLOR (transparent).
+
+    Returns:
+        np.ndarray: A uint32 array of the same shape as the values, whose bytes are the red, green, blue and alpha
+            components of each color.
+    """
+    rgb = palette.rgb if isinstance(palette, Palette) else hex_to_rgb_array(palette)
+    codes = map_values_to_codes(values, len(rgb), scale, low, high)
+
+    # The last color of the lookup table is the color of the missing values (MISSING_VALUE_CODE).
+    lut = np.empty((len(rgb) + 1, 4), dtype=np.uint8)
+    lut[:-1, :3] = rgb
+    lut[:-1, 3] = 255
+    lut[-1] = _hex_to_rgba(nan_color)
+
+    return lut.view(np.uint32).reshape(-1)[codes]
+
+
+def create_codes_color_mapper(palette: Sequence[str], nan_color: str = NAN_COLOR) -> LinearColorMapper:
+    """Creates a color mapper that colors codes (see map_values_to_codes) in the browser.
+
+    Usage:
+        source.data["color_code"] = map_values_to_codes(values, len(palette))
+        plot.scatter("x", "y", source=source, color={"field": "color_code", "transform": color_mapper})
+
+    Args:
+        palette (Sequence[str]): Hex colors.
+        nan_color (str, optional): The color of missing values. Defaults to NAN_COLOR (transparent).
+
+    Returns:
+        LinearColorMapper: A color mapper that maps each code to its color.
+    """
+    # Each code is at the center of its color's bin, and missing values are below the first bin.
+    return LinearColorMapper(
+        palette=list(palette),
+        low=-0.5,
+        high=len(palette) - 0.5,
+        low_color=nan_color,
+        nan_color=nan_color,
     )
+
+
+def _hex_to_rgba(hex_color: str) -> np.ndarray:
+    alpha = hex_color.lstrip("#")[6:8] or "ff"
+    return np.append(hex_to_rgb_array([hex_color])[0], np.uint8(int(alpha, 16)))
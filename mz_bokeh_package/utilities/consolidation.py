@@ -0,0 +1,194 @@
+"""This module contains the consolidate_renderers function that merges the renderers of many groups into one renderer.
+
+Usage:
+    # one renderer per group
+    for group, group_data in data.groupby("material"):
+        plot.scatter("x", "y", source=ColumnDataSource(group_data), color=colors[group], legend_label=group)
+
+    # a single renderer, colored and grouped (in the legend) by data source fields
+    consolidate_renderers(plot)
+
+    # custom names of the added fields, e.g. if the data already has a "group" column
+    consolidate_renderers(plot, group_field="material", color_field="material_color")
+"""
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from bokeh.core.property.dataspec import ColorSpec
+from bokeh.models import ColumnDataSource, GlyphRenderer, LegendItem, Model
+from bokeh.models.glyph import Glyph
+from bokeh.plotting import Figure
+from bokeh.transform import field
+
+GROUP_FIELD = "group"
+COLOR_FIELD = "color"
+LINE_COLOR_FIELD = "line_color"
+SUB_GLYPHS = ("selection_glyph", "nonselection_glyph", "hover_glyph", "muted_glyph")
+# The properties of the renderers (other than their glyphs and data sources) that the consolidated renderer copies.
+RENDERER_PROPERTIES = ("x_range_name", "y_range_name", "level", "visible", "muted")
+
+
+def consolidate_renderers(
+    plot: Figure,
+    group_field: str = GROUP_FIELD,
+    color_field: str = COLOR_FIELD,
+    line_color_field: str = LINE_COLOR_FIELD,
+) -> Optional[GlyphRenderer]:
+    """Replaces the glyph renderers of a plot (one per group) with a single renderer of all the groups.
+
+    The data of all the renderers is concatenated into a single data source, with a group field (the renderers'
+    legend labels) and color fields (the renderers' fill and line colors). The new renderer is colored by the color
+    fields, and the plot's legend is grouped by the group field. The tools and legend items that referenced the
+    renderers reference the new renderer instead. The number of models (and of property changes when the renderers
+    are restyled) therefore doesn't grow with the number of groups.
+
+    All the renderers must have the same glyph type and the same (non-color) glyph properties, fixed colors, the same
+    ranges, level and visibility (see RENDERER_PROPERTIES), and data sources with the same columns, without filters
+    and without the added fields. The group item is the first item of the plot's (first) legend.
+    Note! Hiding a legend item hides all the groups.
+
+    Args:
+        plot (Figure): The plot.
+        group_field (str, optional): The name of the group field. Defaults to GROUP_FIELD.
+        color_field (str, optional): The name of the (fill) color field. Defaults to COLOR_FIELD.
+        line_color_field (str, optional): The name of the line color field. Defaults to LINE_COLOR_FIELD.
+
+    Returns:
+        Optional[GlyphRenderer]: The consolidated renderer, or None if the plot has no glyph renderers.
+    """
+    renderers = [renderer for renderer in plot.renderers if isinstance(renderer, GlyphRenderer)]
+    if len(renderers) <= 1:
+        return renderers[0] if renderers else None
+
+    _validate_renderers(renderers, [group_field, color_field, line_color_field])
+
+    labels = _get_legend_labels(plot, renderers)
+    lengths = [len(next(iter(renderer.data_source.data.values()), [])) for renderer in renderers]
+    columns = renderers[0].data_source.data.keys()
+
+    data = {
+        name: np.concatenate([np.asarray(renderer.data_source.data[name]) for renderer in renderers])
+        for name in columns
+    }
+    data[group_field] = np.repeat(labels, lengths)
+    data[color_field] = np.repeat([renderer.glyph.fill_color for renderer in renderers], lengths)
+    data[line_color_field] = np.repeat([renderer.glyph.line_color for renderer in renderers], lengths)
+
+    first_renderer = renderers[0]
+    # The colors reference the color fields by their names, like the plots that PlotSettings colors by a field.
+    glyph_colors = {"fill_color": color_field, "line_color": line_color_field}
+    consolidated_renderer = GlyphRenderer(
+        data_source=ColumnDataSource(data),
+        glyph=_copy_glyph(first_renderer.glyph, glyph_colors),
+        **{attr: getattr(first_renderer, attr) for attr in RENDERER_PROPERTIES},
+        **{
+            attr: _copy_glyph(getattr(first_renderer, attr), glyph_colors, first_renderer.glyph)
+            for attr in SUB_GLYPHS
+            if isinstance(getattr(first_renderer, attr), Glyph)
+        },
+    )
+
+    plot.renderers = [
+        renderer for renderer in plot.renderers if renderer not in renderers
+    ] + [consolidated_renderer]
+
+    for tool in plot.tools:
+        if isinstance(getattr(tool, "renderers", None), list):
+            tool.renderers = _replace_renderers(tool.renderers, renderers, consolidated_renderer)
+
+    for index, legend in enumerate(plot.legend):
+        # The items of the groups are replaced by a single item (in the first legend), other items that referenced
+        # the renderers (e.g. along with other renderers) reference the new renderer instead.
+        items = []
+        for item in legend.items:
+            if item.renderers and all(renderer in renderers for renderer in item.renderers):
+                continue
+
+            item.renderers = _replace_renderers(item.renderers, renderers, consolidated_renderer)
+            items.append(item)
+
+        if index == 0:
+            items.insert(0, LegendItem(label=field(group_field), renderers=[consolidated_renderer]))
+        legend.items = items
+
+    return consolidated_renderer
+
+
+def _replace_renderers(references: List[Model], renderers: List[GlyphRenderer], new_renderer: GlyphRenderer):
+    """Replaces the references to the given renderers (in a list of models) with a single reference to a new renderer.
+    """
+    replaced_references = [reference for reference in references if reference not in renderers]
+    if len(replaced_references) < len(references):
+        replaced_references.append(new_renderer)
+    return replaced_references
+
+
+def _validate_renderers(renderers: List[GlyphRenderer], added_fields: List[str]):
+    first_renderer = renderers[0]
+    glyph_properties = _get_glyph_properties(first_renderer.glyph)
+    columns = set(first_renderer.data_source.data)
+
+    if len(set(added_fields)) < len(added_fields) or columns & set(added_fields):
+        raise ValueError(
+            f"The added fields {added_fields} must be distinct and not columns of the renderers' data sources"
+        )
+
+    for renderer in renderers:
+        if type(renderer.glyph) is not type(first_renderer.glyph) or \
+                _get_glyph_properties(renderer.glyph) != glyph_properties:
+            raise ValueError("The renderers must have glyphs of the same type and properties")
+
+        if not isinstance(renderer.data_source, ColumnDataSource) or set(renderer.data_source.data) != columns:
+            raise ValueError("The renderers must have data sources with the same columns")
+
+        if any(getattr(renderer, attr) != getattr(first_renderer, attr) for attr in RENDERER_PROPERTIES):
+            raise ValueError(f"The renderers must have the same {', '.join(RENDERER_PROPERTIES)}")
+
+        if renderer.view.filters:
+            raise ValueError("The renderers must not have filters")
+
+        for color in (renderer.glyph.fill_color, renderer.glyph.line_color):
+            if not isinstance(color, str) or color in columns:
+                raise ValueError("The renderers must have fixed colors")
+
+
+def _get_glyph_properties(glyph: Glyph) -> Dict[str, Any]:
+    """Returns the (explicitly set) properties of a glyph, except for its colors.
+    """
+    return {
+        name: value for name, value in _get_set_properties(glyph).items()
+        if not isinstance(glyph.lookup(name).property, ColorSpec)
+    }
+
+
+def _get_set_properties(glyph: Glyph) -> Dict[str, Any]:
+    return {name: getattr(glyph, name) for name in glyph.properties_with_values(include_defaults=False)}
+
+
+def _copy_glyph(glyph: Glyph, colors: Dict[str, Any], main_glyph: Optional[Glyph] = None) -> Glyph:
+    """Copies a glyph with the given colors. The colors of a sub glyph (e.g. the selection glyph) are replaced only
+    if they are the same as the colors of the main glyph.
+    """
+    properties = _get_set_properties(glyph)
+
+    for name, value in colors.items():
+        if main_glyph is None or properties.get(name) == getattr(main_glyph, name):
+            properties[name] = value
+
+    return type(glyph)(**properties)
+
+
+def _get_legend_labels(plot: Figure, renderers: List[GlyphRenderer]) -> List[str]:
+    """Returns the legend label of each renderer, or its name (or index) if it has no legend item.
+    """
+    labels = {}
+    for legend in plot.legend:
+        for item in legend.items:
+            label = item.label.get("value") if isinstance(item.label, dict) else item.label
+            for renderer in item.renderers:
+                labels[renderer] = label
+
+    return [
+        labels.get(renderer) or renderer.name or str(index)
+        for index, renderer in enumerate(renderers)
+    ]
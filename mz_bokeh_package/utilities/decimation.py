@@ -0,0 +1,269 @@
+"""This module contains the RangeDecimator class that sends a decimated view of large data sets to the browser.
+
+Usage:
+    plot = figure(width=800)
+    source = ColumnDataSource()
+    plot.line("time", "value", source=source)
+
+    # the full data stays on the server, the source holds at most a few points per pixel of the visible range
+    decimator = RangeDecimator(plot, source, {"time": time, "value": value}, x="time", y="value")
+"""
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from bokeh.events import RangesUpdate
+from bokeh.models import ColumnDataSource, Plot
+from bokeh.util.serialization import convert_datetime_type
+
+DECIMATION_METHODS = ("minmax", "lttb")
+DEFAULT_BUCKETS_NUM = 600
+
+# LTTB selects its points out of the min/max points of this number of buckets per output point.
+LTTB_CANDIDATES_PER_POINT = 4
+
+
+def lttb(x: np.ndarray, y: np.ndarray, points_num: int) -> np.ndarray:
+    """Selects the points that best preserve the shape of a line using the Largest-Triangle-Three-Buckets algorithm.
+
+    Args:
+        x (np.ndarray): The (sorted) x values of the line.
+        y (np.ndarray): The y values of the line.
+        points_num (int): The number of points to select.
+
+    Returns:
+        np.ndarray: The (sorted) indices of the selected points.
+    """
+    length = len(x)
+    if points_num >= length or points_num < 3:
+        return np.arange(length)
+
+    x = x.astype(float)
+    y = y.astype(float)
+
+    # The first and the last points are always selected, the other points are divided into equal buckets.
+    edges = np.append(np.linspace(1, length - 1, points_num - 1).astype(int), length)
+    selected = np.empty(points_num, dtype=int)
+    selected[0] = 0
+    selected[-1] = length - 1
+
+    previous = 0
+    for i in range(points_num - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start, next_end = edges[i + 1], edges[i + 2]
+        next_x = x[next_start:next_end].mean()
+        next_y = np.nanmean(y[next_start:next_end]) if not np.isnan(y[next_start:next_end]).all() else y[previous]
+
+        # Select the point that forms the largest triangle with the previously selected point and the average
+        # point of the next bucket.
+        areas = np.abs(
+            (x[previous] - next_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (next_y - y[previous])
+        )
+        previous = start + int(np.argmax(np.nan_to_num(areas, nan=-1)))
+        selected[i + 1] = previous
+
+    return selected
+
+
+class MinMaxPyramid:
+    """Caches the indices of the minimal and maximal values of a series in buckets of increasing sizes.
+
+    Level k has buckets of 2 ** k samples. Each level is computed (once) from the level below it, hence querying any
+    window of the series costs a time that is proportional to the number of buckets in the window.
+    """
+
+    def __init__(self, y: np.ndarray):
+        """Initializes a MinMaxPyramid instance.
+
+        Args:
+            y (np.ndarray): The series.
+        """
+        if np.issubdtype(y.dtype, np.floating):
+            # Missing values are never selected as minimal/maximal values (unless their bucket has only missing values).
+            self._y_min = np.where(np.isnan(y), np.inf, y)
+            self._y_max = np.where(np.isnan(y), -np.inf, y)
+        else:
+            self._y_min = self._y_max = y
+
+        indices = np.arange(len(y))
+        self._levels: List[Tuple[np.ndarray, np.ndarray]] = [(indices, indices)]
+
+    def get_indices(self, start: int, end: int, buckets_num: int) -> np.ndarray:
+        """Returns the indices of the minimal and maximal values of a window, in (at least) the given number of buckets.
+
+        Args:
+            start (int): The index of the window's first sample.
+            end (int): The index after the window's last sample.
+            buckets_num (int): The minimal number of buckets to divide the window into.
+
+        Returns:
+            np.ndarray: The sorted indices of the selected samples, including the window's first and last samples.
+        """
+        level = max(int(np.log2(max(end - start, 1) / max(buckets_num, 1))), 0)
+        argmin, argmax = self._get_level(level)
+
+        first_bucket, last_bucket = start >> level, (end - 1) >> level
+        indices = np.concatenate([
+            argmin[first_bucket:last_bucket + 1],
+            argmax[first_bucket:last_bucket + 1],
+            [start, end - 1],
+        ])
+        indices = np.unique(indices)
+
+        # Edge buckets may exceed the window.
+        return indices[(indices >= start) & (indices < end)]
+
+    def _get_level(self, level: int) -> Tuple[np.ndarray, np.ndarray]:
+        while len(self._levels) <= level:
+            argmin, argmax = self._levels[-1]
+
+            # Pair adjacent buckets (a bucket without a pair is paired with itself).
+            if len(argmin) % 2:
+                argmin = np.append(argmin, argmin[-1])
+                argmax = np.append(argmax, argmax[-1])
+
+            left_min, right_min = argmin[0::2], argmin[1::2]
+            left_max, right_max = argmax[0::2], argmax[1::2]
+            self._levels.append((
+                np.where(self._y_min[right_min] < self._y_min[left_min], right_min, left_min),
+                np.where(self._y_max[right_max] > self._y_max[left_max], right_max, left_max),
+            ))
+
+        return self._levels[level]
+
+
+class RangeDecimator:
+    """Keeps a decimated view of a large data set in a plot's data source.
+
+    The full data is kept on the server, and the data source holds only the points that are needed to draw the
+    visible x range: the minimal and maximal points of each pixel-wide bucket ("minmax"), or the points that the
+    Largest-Triangle-Three-Buckets algorithm selects ("lttb"). The visible window is decimated again whenever the
+    plot's ranges are updated (e.g. when zooming or panning), hence the payload is bounded by the plot's width
+    regardless of the data size.
+    """
+
+    def __init__(
+        self,
+        plot: Plot,
+        source: ColumnDataSource,
+        data: Dict[str, Sequence[Any]],
+        x: str,
+        y: str,
+        method: str = "minmax",
+        buckets_num: Optional[int] = None,
+    ):
+        """Initializes a RangeDecimator instance and decimates the data into the source.
+
+        Args:
+            plot (Plot): The plot whose x range determines the visible window.
+            source (ColumnDataSource): The data source of the plot's renderer.
+            data (Dict[str, Sequence[Any]]): The full data, a mapping of column names to columns of equal lengths.
+            x (str): The name of the x column. The x values must be numbers or datetimes.
+            y (str): The name of the y column, by which the points are selected.
+            method (str, optional): Either "minmax" or "lttb". Defaults to "minmax".
+            buckets_num (Optional[int], optional): The number of buckets to divide the visible window into.
+                Defaults to None (the plot's width in pixels).
+        """
+        if method not in DECIMATION_METHODS:
+            raise ValueError(f'Invalid decimation method "{method}". Valid methods: {DECIMATION_METHODS}.')
+
+        self._plot = plot
+        self._source = source
+        self._x = x
+        self._y = y
+        self._method = method
+        self._buckets_num = buckets_num
+
+        self.set_data(data)
+        self._plot.on_event(RangesUpdate, self._on_ranges_update)
+
+    def set_data(self, data: Dict[str, Sequence[Any]]):
+        """Replaces the full data and decimates it into the source.
+
+        Args:
+            data (Dict[str, Sequence[Any]]): The full data, a mapping of column names to columns of equal lengths.
+        """
+        data = {name: np.asarray(column) for name, column in data.items()}
+
+        x = data[self._x]
+        if len(x) > 1 and not np.all(x[1:] >= x[:-1]):
+            order = np.argsort(x, kind="stable")
+            data = {name: column[order] for name, column in data.items()}
+
+        self._data = data
+        self._x_values = self._get_numeric_x(data[self._x])
+        self._pyramid = MinMaxPyramid(data[self._y])
+        self.update()
+
+    def update(self, start: Optional[float] = None, end: Optional[float] = None):
+        """Decimates the visible window into the source.
+
+        Args:
+            start (Optional[float], optional): The start of the visible window. Defaults to the x range's start.
+            end (Optional[float], optional): The end of the visible window. Defaults to the x range's end.
+        """
+        start = self._get_range_bound(start, "start", -np.inf)
+        end = self._get_range_bound(end, "end", np.inf)
+        indices = self._get_window_indices(*self._get_window(start, end))
+
+        self._source.data = {name: column[indices] for name, column in self._data.items()}
+
+    def detach(self):
+        """Stops decimating the data on range updates.
+        """
+        callbacks = self._plot._event_callbacks.get(RangesUpdate.event_name, [])
+        self._plot._event_callbacks[RangesUpdate.event_name] = [
+            callback for callback in callbacks if callback != self._on_ranges_update
+        ]
+
+    def _on_ranges_update(self, event: RangesUpdate):
+        self.update(event.x0, event.x1)
+
+    def _get_range_bound(self, value: Optional[float], attr: str, default: float) -> float:
+        if value is None:
+            value = getattr(self._plot.x_range, attr, None)
+
+        # Auto ranges (e.g. DataRange1d) have no bounds until the plot is rendered.
+        if value is None:
+            return default
+
+        # Datetime bounds are converted to milliseconds since epoch.
+        value = float(convert_datetime_type(value)) if not isinstance(value, (int, float)) else value
+        return default if np.isnan(value) else value
+
+    def _get_window(self, start: float, end: float) -> Tuple[int, int]:
+        """Returns the indices of the samples in a window, including a sample beyond each edge (if there is one), so
+        lines are drawn up to the edges of the plot.
+        """
+        if start > end:
+            start, end = end, start
+
+        first = max(int(np.searchsorted(self._x_values, start, side="left")) - 1, 0)
+        last = min(int(np.searchsorted(self._x_values, end, side="right")) + 1, len(self._x_values))
+        return first, last
+
+    def _get_window_indices(self, start: int, end: int) -> np.ndarray:
+        buckets_num = self._get_buckets_num()
+
+        # The window is small enough to be sent as it is.
+        if end - start <= 2 * buckets_num:
+            return np.arange(start, end)
+
+        if self._method == "minmax":
+            return self._pyramid.get_indices(start, end, buckets_num)
+
+        candidates = self._pyramid.get_indices(start, end, LTTB_CANDIDATES_PER_POINT * buckets_num)
+        selected = lttb(self._x_values[candidates], self._data[self._y][candidates], buckets_num)
+        return candidates[selected]
+
+    def _get_buckets_num(self) -> int:
+        width = self._buckets_num or self._plot.inner_width or self._plot.frame_width or self._plot.width
+        return int(width or DEFAULT_BUCKETS_NUM)
+
+    @staticmethod
+    def _get_numeric_x(x: np.ndarray) -> np.ndarray:
+        # Bokeh represents datetimes as milliseconds since epoch.
+        if np.issubdtype(x.dtype, np.datetime64):
+            return x.astype("datetime64[ms]").astype(float)
+
+        return x.astype(float)
@@ -0,0 +1,268 @@
+"""This module contains the scheduling logic of BokehUtilities.async_event_handler.
+
+A scheduler is created for each decorated event handler. It keeps a separate state for each component instance,
+and decides when (and whether) each invocation of the event handler runs, according to the handler's policy:
+    - None: every invocation runs, in the order they were made.
+    - "latest": invocations that were superseded by a newer one before they started are dropped, and running
+        invocations that were superseded are signaled to stop (see BokehUtilities.is_cancelled).
+    - "debounce": an invocation runs only after "wait" milliseconds passed without a newer invocation.
+    - "throttle": invocations run at most once every "wait" milliseconds. Invocations that are made in between
+        are coalesced into a single trailing invocation with the latest arguments.
+"""
+import math
+import threading
+import time
+import weakref
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext
+from functools import partial
+from typing import Any, Callable, ContextManager, Dict, Optional, Tuple, Union
+
+from .profiling import InvocationProfile
+
+EXECUTOR_MAX_WORKERS = 4
+EVENT_HANDLER_POLICIES = (None, "latest", "debounce", "throttle")
+
+_thread_pool_executor: Optional[ThreadPoolExecutor] = None
+_thread_pool_executor_lock = threading.Lock()
+_current_invocation = threading.local()
+
+# The number of pending invocations of all the event handlers that share a state, by the id of the state (see
+# _update_loading_count). States that have no pending invocations are removed.
+_loading_counts: Dict[int, int] = {}
+
+
+def get_executor(executor: Union[str, Executor]) -> Executor:
+    """Returns the executor to run event handlers in.
+
+    Args:
+        executor (Union[str, Executor]): Either "thread" for the process-wide thread pool, or an Executor instance.
+
+    Returns:
+        Executor: The executor.
+    """
+    global _thread_pool_executor
+
+    if isinstance(executor, Executor):
+        return executor
+
+    if executor != "thread":
+        raise ValueError(f'Invalid executor "{executor}". Valid executors: "thread" or an Executor instance.')
+
+    with _thread_pool_executor_lock:
+        if _thread_pool_executor is None:
+            _thread_pool_executor = ThreadPoolExecutor(
+                max_workers=EXECUTOR_MAX_WORKERS,
+                thread_name_prefix="mz_bokeh_event_handler",
+            )
+
+    return _thread_pool_executor
+
+
+def is_current_invocation_cancelled() -> bool:
+    """Returns whether the invocation that runs in the current thread was superseded by a newer one.
+    """
+    invocation = getattr(_current_invocation, "value", None)
+    return invocation is not None and invocation.cancelled.is_set()
+
+
+class Invocation:
+    """A single call of a decorated event handler.
+    """
+
+    def __init__(self, args: Tuple, kwargs: Dict[str, Any], generation: int):
+        self.args = args
+        self.kwargs = kwargs
+        self.generation = generation
+        self.scheduled_at = time.monotonic()
+        self.cancelled = threading.Event()
+        self.profile: Optional[InvocationProfile] = None
+
+
+class HandlerState:
+    """The scheduling state of a decorated event handler for a single component instance.
+    """
+
+    def __init__(self):
+        self.generation = 0
+        self.pending = 0
+        self.last_started_at = -math.inf
+        self.running: Optional[Invocation] = None
+        self.trailing: Optional[Invocation] = None
+
+
+class EventHandlerScheduler:
+    """Schedules the invocations of a decorated event handler.
+    """
+
+    def __init__(
+        self,
+        func: Callable,
+        function_to_execute: Optional[str] = None,
+        executor: Optional[Union[str, Executor]] = None,
+        policy: Optional[str] = None,
+        wait: int = 0,
+        updates_context: Optional[Callable[[Any], ContextManager]] = None,
+        profile: bool = False,
+    ):
+        if policy not in EVENT_HANDLER_POLICIES:
+            raise ValueError(f'Invalid policy "{policy}". Valid policies: {EVENT_HANDLER_POLICIES}.')
+
+        if isinstance(executor, ProcessPoolExecutor):
+            # The event handler is a method of a component, which can't be sent to another process.
+            raise ValueError(
+                "Event handlers can't run in a ProcessPoolExecutor. Run the event handler in a thread instead, "
+                "and submit its CPU-bound part to the process pool."
+            )
+
+        self._func = func
+        self._function_to_execute = function_to_execute
+        self._executor = executor
+        self._policy = policy
+        self._wait = wait
+        # A function that receives the document and returns the context in which the event handler modifies it.
+        self._updates_context = updates_context
+        self._profile_name = f"{func.__module__}.{func.__qualname__}" if profile else None
+        self._states: "weakref.WeakKeyDictionary[Any, HandlerState]" = weakref.WeakKeyDictionary()
+
+    def schedule(self, doc, component, args: Tuple, kwargs: Dict[str, Any]):
+        """Schedules an invocation of the event handler.
+
+        Args:
+            doc (Document): The Bokeh document of the session.
+            component (Any): The component (i.e. "self") whose event handler was triggered.
+            args (Tuple): The positional arguments of the event handler.
+            kwargs (Dict[str, Any]): The keyword arguments of the event handler.
+        """
+        state = self._states.setdefault(component, HandlerState())
+        state.generation += 1
+        invocation = Invocation(args, kwargs, state.generation)
+        self._begin(component, state)
+
+        if self._policy in ("latest", "debounce") and state.running is not None:
+            state.running.cancelled.set()
+
+        if self._policy == "debounce":
+            doc.add_timeout_callback(partial(self._start, doc, component, invocation), self._wait)
+
+        elif self._policy == "throttle":
+            self._schedule_throttled(doc, component, state, invocation)
+
+        else:
+            doc.add_next_tick_callback(partial(self._start, doc, component, invocation))
+
+    def _schedule_throttled(self, doc, component, state: HandlerState, invocation: Invocation):
+        elapsed = (time.monotonic() - state.last_started_at) * 1000
+
+        if state.trailing is not None:
+            # A trailing invocation is already scheduled, replace its arguments with the latest ones.
+            self._end(component, state)
+            state.trailing = invocation
+
+        elif elapsed >= self._wait:
+            state.last_started_at = time.monotonic()
+            doc.add_next_tick_callback(partial(self._start, doc, component, invocation))
+
+        else:
+            state.trailing = invocation
+            doc.add_timeout_callback(partial(self._start_trailing, doc, component), int(self._wait - elapsed))
+
+    def _start_trailing(self, doc, component):
+        state = self._states[component]
+        invocation, state.trailing = state.trailing, None
+        state.last_started_at = time.monotonic()
+        self._start(doc, component, invocation)
+
+    def _start(self, doc, component, invocation: Invocation):
+        """Starts an invocation. This runs in a session callback, i.e. while holding the document lock.
+        """
+        state = self._states[component]
+
+        if self._is_superseded(state, invocation):
+            self._end(component, state)
+            return
+
+        if self._profile_name is not None:
+            invocation.profile = InvocationProfile(self._profile_name, invocation.scheduled_at)
+
+        if self._executor is None:
+            try:
+                with self._measure(invocation, doc), self._document_updates(doc):
+                    self._func(component, *invocation.args, **invocation.kwargs)
+            finally:
+                self._end(component, state, invocation)
+            return
+
+        state.running = invocation
+        future = get_executor(self._executor).submit(self._run_in_worker, component, invocation)
+
+        future.add_done_callback(
+            lambda f: doc.add_next_tick_callback(partial(self._finish, doc, f, component, invocation))
+        )
+
+    def _run_in_worker(self, component, invocation: Invocation) -> Any:
+        _current_invocation.value = invocation
+        try:
+            with self._measure(invocation):
+                return self._func(component, *invocation.args, **invocation.kwargs)
+        finally:
+            _current_invocation.value = None
+
+    def _finish(self, doc, future: Future, component, invocation: Invocation):
+        """Applies the result of an invocation that ran in an executor. This runs in a next tick callback,
+        hence it's safe to modify the document here.
+        """
+        state = self._states[component]
+        if state.running is invocation:
+            state.running = None
+
+        try:
+            result = future.result()
+            if callable(result) and not self._is_superseded(state, invocation):
+                with self._measure(invocation, doc), self._document_updates(doc):
+                    result()
+        finally:
+            self._end(component, state, invocation)
+
+    @staticmethod
+    def _measure(invocation: Invocation, doc=None) -> ContextManager:
+        return invocation.profile.measure(doc) if invocation.profile is not None else nullcontext()
+
+    def _document_updates(self, doc) -> ContextManager:
+        return self._updates_context(doc) if self._updates_context is not None else nullcontext()
+
+    def _is_superseded(self, state: HandlerState, invocation: Invocation) -> bool:
+        return self._policy in ("latest", "debounce") and invocation.generation != state.generation
+
+    def _begin(self, component, state: HandlerState):
+        state.pending += 1
+        self._update_loading_count(component, 1)
+        if self._function_to_execute is not None:
+            getattr(component, self._function_to_execute)(True)
+
+    def _end(self, component, state: HandlerState, invocation: Optional[Invocation] = None):
+        """Marks an invocation as done. function_to_execute is called once no invocation of the handler is pending.
+        """
+        if invocation is not None and invocation.profile is not None:
+            invocation.profile.record()
+
+        state.pending -= 1
+        self._update_loading_count(component, -1)
+        if state.pending == 0 and self._function_to_execute is not None:
+            getattr(component, self._function_to_execute)(False)
+
+    @staticmethod
+    def _update_loading_count(component, change: int):
+        """Updates the number of pending invocations of all the event handlers that share the component's state.
+
+        The "is_loading" state value is True as long as any invocation is pending, so overlapping event handlers
+        (of the same component or of different components) do not turn the loading mode off too early. The count
+        itself is kept here rather than in the state, so only the loading mode is visible to the state's subscribers. It
+        is keyed by the id of the state, as states may not support weak references (e.g. a dict).
+        """
+        state = component._state
+        loading_count = _loading_counts.pop(id(state), 0) + change
+        if loading_count > 0:
+            _loading_counts[id(state)] = loading_count
+
+        state["is_loading"] = loading_count > 0
@@ -0,0 +1,103 @@
+"""This module contains the GroupIndex class that caches factorized columns of Bokeh data sources.
+
+Usage:
+    group_index = GroupIndex()
+
+    # codes[i] is the index (in uniques) of the group of the i-th row
+    codes, uniques = group_index.get(source, "material")
+
+    # color the rows by their group
+    source.data["color"] = np.asarray(palette)[codes]
+"""
+import weakref
+from typing import Any, Dict, Sequence, Tuple
+
+import numpy as np
+from bokeh.models import ColumnDataSource
+
+
+def factorize(values: Sequence[Any]) -> Tuple[np.ndarray, np.ndarray]:
+    """Encodes values as integer codes of their unique values.
+
+    Args:
+        values (Sequence[Any]): The values to encode.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The codes (the index of each value in the unique values) and the unique
+            values, in order of first appearance.
+    """
+    values = np.asarray(values)
+    try:
+        uniques, first_indices, codes = np.unique(values, return_index=True, return_inverse=True)
+    except TypeError:
+        # Values that can't be sorted (e.g. strings mixed with None) are encoded in order of first appearance.
+        return _factorize_unsortable(values)
+
+    # np.unique sorts the unique values, reorder them by their first appearance.
+    order = np.argsort(first_indices)
+    ranks = np.empty_like(order)
+    ranks[order] = np.arange(len(order))
+
+    return ranks[codes.reshape(-1)], uniques[order]
+
+
+def _factorize_unsortable(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    codes_by_value: Dict[Any, int] = {}
+    codes = np.fromiter(
+        (codes_by_value.setdefault(value, len(codes_by_value)) for value in values.tolist()),
+        dtype=np.intp,
+        count=len(values),
+    )
+
+    uniques = np.empty(len(codes_by_value), dtype=object)
+    uniques[:] = [*codes_by_value]
+    return codes, uniques
+
+
+class GroupIndex:
+    """Caches the factorized columns (see factorize) of Bokeh data sources.
+
+    A cached column is computed again once it is replaced, streamed to or patched. Replacing other columns of the
+    same source (e.g. a colors column) keeps it cached.
+    """
+
+    def __init__(self):
+        self._cache: "weakref.WeakKeyDictionary[ColumnDataSource, Dict[str, Tuple]]" = weakref.WeakKeyDictionary()
+
+    def get(self, source: ColumnDataSource, field: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the factorized column of a data source.
+
+        Args:
+            source (ColumnDataSource): The data source.
+            field (str): The name of the column.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: The codes and the unique values of the column (see factorize).
+        """
+        if source not in self._cache:
+            self._cache[source] = {}
+            source.on_change("data", lambda attr, old, new: self._on_data_change(source, old, new))
+
+        column = source.data[field]
+        columns_cache = self._cache[source]
+
+        # Validate the cached column, in case it was modified without a change notification.
+        if field in columns_cache:
+            cached_column, cached_length, codes, uniques = columns_cache[field]
+            if cached_column is column and cached_length == len(column):
+                return codes, uniques
+
+        codes, uniques = factorize(column)
+        columns_cache[field] = (column, len(column), codes, uniques)
+        return codes, uniques
+
+    def _on_data_change(self, source: ColumnDataSource, old: Dict[str, Any], new: Dict[str, Any]):
+        columns_cache = self._cache.get(source, {})
+        replaced_fields = {field for field in {*old, *new} if field not in new or new[field] is not old.get(field)}
+
+        # Patched columns are modified in place, and the change doesn't tell which of them were patched.
+        if not replaced_fields:
+            columns_cache.clear()
+
+        for field in replaced_fields & columns_cache.keys():
+            del columns_cache[field]
@@ -0,0 +1,209 @@
+"""This module converts colors between RGB and HUSL (a perceptually uniform variant of HSL).
+
+It is a port of the subset of the HUSL reference implementation (https://www.hsluv.org, version 2.1.0) that seaborn
+uses for its palettes, so the palettes of the colors module match the palettes of seaborn without depending on it.
+The operations are kept as they are in the reference implementation, in order to produce the same values.
+"""
+import math
+from typing import List, Sequence
+
+M = [
+    [3.2406, -1.5372, -0.4986],
+    [-0.9689, 1.8758, 0.0415],
+    [0.0557, -0.2040, 1.0570],
+]
+
+M_INV = [
+    [0.4124, 0.3576, 0.1805],
+    [0.2126, 0.7152, 0.0722],
+    [0.0193, 0.1192, 0.9505],
+]
+
+# Hard-coded D65 illuminant
+REF_Y = 1.00000
+REF_U = 0.19784
+REF_V = 0.46834
+LAB_E = 0.008856
+LAB_K = 903.3
+
+
+def husl_to_rgb(h: float, s: float, l: float) -> List[float]:  # noqa: E741
+    """Converts a HUSL color to RGB.
+
+    Args:
+        h (float): Hue, from 0 to 360.
+        s (float): Saturation, from 0 to 100.
+        l (float): Lightness, from 0 to 100.
+
+    Returns:
+        List[float]: Normalized RGB color. The components may slightly exceed the range from 0 to 1.
+    """
+    return _lch_to_rgb(*_husl_to_lch([h, s, l]))
+
+
+def rgb_to_husl(r: float, g: float, b: float) -> List[float]:
+    """Converts a normalized RGB color to HUSL.
+
+    Args:
+        r (float): Red, from 0 to 1.
+        g (float): Green, from 0 to 1.
+        b (float): Blue, from 0 to 1.
+
+    Returns:
+        List[float]: HUSL color (hue, saturation, lightness).
+    """
+    return _lch_to_husl(_rgb_to_lch(r, g, b))
+
+
+def _lch_to_rgb(l: float, c: float, h: float) -> List[float]:  # noqa: E741
+    return _xyz_to_rgb(_luv_to_xyz(_lch_to_luv([l, c, h])))
+
+
+def _rgb_to_lch(r: float, g: float, b: float) -> List[float]:
+    return _luv_to_lch(_xyz_to_luv(_rgb_to_xyz([r, g, b])))
+
+
+def _max_chroma(L: float, H: float) -> float:
+    hrad = math.radians(H)
+    sinH = math.sin(hrad)
+    cosH = math.cos(hrad)
+    sub1 = math.pow(L + 16, 3.0) / 1560896.0
+    sub2 = sub1 if sub1 > 0.008856 else (L / 903.3)
+    result = float("inf")
+    for m1, m2, m3 in M:
+        top = (0.99915 * m1 + 1.05122 * m2 + 1.14460 * m3) * sub2
+        rbottom = 0.86330 * m3 - 0.17266 * m2
+        lbottom = 0.12949 * m3 - 0.38848 * m1
+        bottom = (rbottom * sinH + lbottom * cosH) * sub2
+
+        for t in (0.0, 1.0):
+            C = L * (top - 1.05122 * t) / (bottom + 0.17266 * sinH * t)
+            if 0.0 < C < result:
+                result = C
+    return result
+
+
+def _dot_product(a: Sequence[float], b: Sequence[float]) -> float:
+    return sum(x * y for x, y in zip(a, b))
+
+
+def _f(t: float) -> float:
+    if t > LAB_E:
+        return math.pow(t, 1.0 / 3.0)
+    else:
+        return 7.787 * t + 16.0 / 116.0
+
+
+def _f_inv(t: float) -> float:
+    if math.pow(t, 3.0) > LAB_E:
+        return math.pow(t, 3.0)
+    else:
+        return (116.0 * t - 16.0) / LAB_K
+
+
+def _from_linear(c: float) -> float:
+    if c <= 0.0031308:
+        return 12.92 * c
+    else:
+        return 1.055 * math.pow(c, 1.0 / 2.4) - 0.055
+
+
+def _to_linear(c: float) -> float:
+    a = 0.055
+
+    if c > 0.04045:
+        return math.pow((c + a) / (1.0 + a), 2.4)
+    else:
+        return c / 12.92
+
+
+def _xyz_to_rgb(triple: List[float]) -> List[float]:
+    return [_from_linear(_dot_product(row, triple)) for row in M]
+
+
+def _rgb_to_xyz(triple: List[float]) -> List[float]:
+    rgbl = [_to_linear(c) for c in triple]
+    return [_dot_product(row, rgbl) for row in M_INV]
+
+
+def _xyz_to_luv(triple: List[float]) -> List[float]:
+    X, Y, Z = triple
+
+    if X == Y == Z == 0.0:
+        return [0.0, 0.0, 0.0]
+
+    varU = (4.0 * X) / (X + (15.0 * Y) + (3.0 * Z))
+    varV = (9.0 * Y) / (X + (15.0 * Y) + (3.0 * Z))
+    L = 116.0 * _f(Y / REF_Y) - 16.0
+
+    # Black will create a divide-by-zero error
+    if L == 0.0:
+        return [0.0, 0.0, 0.0]
+
+    U = 13.0 * L * (varU - REF_U)
+    V = 13.0 * L * (varV - REF_V)
+
+    return [L, U, V]
+
+
+def _luv_to_xyz(triple: List[float]) -> List[float]:
+    L, U, V = triple
+
+    if L == 0:
+        return [0.0, 0.0, 0.0]
+
+    varY = _f_inv((L + 16.0) / 116.0)
+    varU = U / (13.0 * L) + REF_U
+    varV = V / (13.0 * L) + REF_V
+    Y = varY * REF_Y
+    X = 0.0 - (9.0 * Y * varU) / ((varU - 4.0) * varV - varU * varV)
+    Z = (9.0 * Y - (15.0 * varV * Y) - (varV * X)) / (3.0 * varV)
+
+    return [X, Y, Z]
+
+
+def _luv_to_lch(triple: List[float]) -> List[float]:
+    L, U, V = triple
+
+    C = math.pow(math.pow(U, 2) + math.pow(V, 2), (1.0 / 2.0))
+    H = math.degrees(math.atan2(V, U))
+    if H < 0.0:
+        H = 360.0 + H
+
+    return [L, C, H]
+
+
+def _lch_to_luv(triple: List[float]) -> List[float]:
+    L, C, H = triple
+
+    Hrad = math.radians(H)
+    U = math.cos(Hrad) * C
+    V = math.sin(Hrad) * C
+
+    return [L, U, V]
+
+
+def _husl_to_lch(triple: List[float]) -> List[float]:
+    H, S, L = triple
+
+    if L > 99.9999999:
+        return [100, 0.0, H]
+    if L < 0.00000001:
+        return [0.0, 0.0, H]
+
+    C = _max_chroma(L, H) / 100.0 * S
+
+    return [L, C, H]
+
+
+def _lch_to_husl(triple: List[float]) -> List[float]:
+    L, C, H = triple
+
+    if L > 99.9999999:
+        return [H, 0.0, 100.0]
+    if L < 0.00000001:
+        return [H, 0.0, 0.0]
+
+    S = C / _max_chroma(L, H) * 100.0
+
+    return [H, S, L]
@@ -0,0 +1,133 @@
+"""This module contains the PatchAccountant class that accounts for the document patches sent to the browser.
+
+Usage:
+    # in the app's main.py
+    accountant = PatchAccountant(curdoc())
+
+    # later, e.g. in a debug handler, log the top offenders of the session and of the whole process
+    logger.info(accountant.top(10))
+    logger.info(PatchAccountant.top_in_process(10))
+"""
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from bokeh.document import Document
+from bokeh.document.events import (
+    ColumnsPatchedEvent,
+    ColumnsStreamedEvent,
+    DocumentPatchedEvent,
+    MessageSentEvent,
+    RootAddedEvent,
+    RootRemovedEvent,
+    TitleChangedEvent,
+)
+from bokeh.io import curdoc
+
+from .profiling import get_patch_size
+
+PatchKey = Tuple[str, str, str]
+
+
+class PatchAccountant:
+    """Aggregates the count and serialized size of outgoing document patches by model type, model name and property.
+
+    Each instance accounts for the patches of a single document (session), and all the instances of the process
+    also add their patches to a process-wide aggregate. Changes that were made by the browser are not counted,
+    since they are not sent back to it.
+
+    Note! Each change is serialized once more in order to measure its size, hence this utility is meant for
+    diagnosing traffic rather than for permanent use in production.
+    """
+    _process_totals: Dict[PatchKey, List[int]] = {}
+    _process_totals_lock = threading.Lock()
+
+    def __init__(self, doc: Optional[Document] = None):
+        """Initializes a PatchAccountant instance and starts accounting for the document's patches.
+
+        Args:
+            doc (Optional[Document], optional): The document to account for. Defaults to the current document.
+        """
+        self._doc = doc or curdoc()
+        self._totals: Dict[PatchKey, List[int]] = {}
+        self._doc.on_change(self._on_document_change)
+
+    def detach(self):
+        """Stops accounting for the document's patches.
+        """
+        self._doc.remove_on_change(self._on_document_change)
+
+    def top(self, n: int = 10, by: str = "bytes") -> List[Dict[str, Any]]:
+        """Returns the top offenders of the document.
+
+        Args:
+            n (int, optional): The number of entries to return. Defaults to 10.
+            by (str, optional): Either "bytes" or "count". Defaults to "bytes".
+
+        Returns:
+            List[Dict[str, Any]]: Entries with the keys "model_type", "model_name", "property", "count" and "bytes".
+        """
+        return self._get_top(self._totals, n, by)
+
+    @classmethod
+    def top_in_process(cls, n: int = 10, by: str = "bytes") -> List[Dict[str, Any]]:
+        """Returns the top offenders of all the documents of the process (see "top").
+        """
+        with cls._process_totals_lock:
+            totals = {key: list(value) for key, value in cls._process_totals.items()}
+        return cls._get_top(totals, n, by)
+
+    @classmethod
+    def reset_process_totals(cls):
+        with cls._process_totals_lock:
+            cls._process_totals.clear()
+
+    def _on_document_change(self, event: Any):
+        # Changes made by the browser have a setter (the session that applied them) and are not sent back.
+        if not isinstance(event, DocumentPatchedEvent) or event.setter is not None:
+            return
+
+        key = self._get_key(event)
+        size = get_patch_size([event])
+
+        self._add(self._totals, key, size)
+        with self._process_totals_lock:
+            self._add(self._process_totals, key, size)
+
+    @staticmethod
+    def _add(totals: Dict[PatchKey, List[int]], key: PatchKey, size: int):
+        count_and_bytes = totals.setdefault(key, [0, 0])
+        count_and_bytes[0] += 1
+        count_and_bytes[1] += size
+
+    @staticmethod
+    def _get_key(event: DocumentPatchedEvent) -> PatchKey:
+        """Returns the (model type, model name, property) key of a document change.
+        """
+        if isinstance(event, (TitleChangedEvent, MessageSentEvent)):
+            return "Document", "", "title" if isinstance(event, TitleChangedEvent) else "message"
+
+        if isinstance(event, (RootAddedEvent, RootRemovedEvent)):
+            return type(event.model).__name__, event.model.name or "", "root"
+
+        model = getattr(event, "model", None) or getattr(event, "column_source", None)
+        attr = getattr(event, "attr", "data")
+
+        # Streaming and patching are reported separately from replacing the whole data.
+        hint = getattr(event, "hint", None) or event
+        if isinstance(hint, ColumnsStreamedEvent):
+            attr = f"{attr} (stream)"
+        elif isinstance(hint, ColumnsPatchedEvent):
+            attr = f"{attr} (patch)"
+
+        return type(model).__name__, getattr(model, "name", None) or "", attr
+
+    @staticmethod
+    def _get_top(totals: Dict[PatchKey, List[int]], n: int, by: str) -> List[Dict[str, Any]]:
+        if by not in ("bytes", "count"):
+            raise ValueError(f'Invalid sort key "{by}". Valid sort keys: "bytes"/"count"')
+
+        entries = [
+            {"model_type": model_type, "model_name": model_name, "property": attr, "count": count, "bytes": size}
+            for (model_type, model_name, attr), (count, size) in totals.items()
+        ]
+        return sorted(entries, key=lambda entry: entry[by], reverse=True)[:n]
@@ -0,0 +1,148 @@
+"""This module contains tools for profiling Bokeh event handlers.
+
+Usage:
+    class MyComponent:
+
+        # profile an async event handler
+        @BokehUtilities.async_event_handler(profile=True)
+        def _on_filter_change(self, attr, old, new):
+            ...
+
+        # profile a regular event handler
+        @BokehUtilities.profile_event_handler
+        def _on_apply(self, event):
+            ...
+
+    # dump the aggregated results of the current process
+    HandlerProfiler.dump()
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from bokeh.document import Document
+from bokeh.document.events import DocumentPatchedEvent
+from bokeh.protocol.messages.patch_doc import process_document_events
+
+PROFILE_METRICS = ("wall_time", "cpu_time", "queue_delay", "events", "patch_bytes")
+
+
+def get_patch_size(events: List[DocumentPatchedEvent]) -> int:
+    """Returns the number of bytes of the patch message that would be sent to the browser for the given events.
+
+    Args:
+        events (List[DocumentPatchedEvent]): Document change events of a single document.
+
+    Returns:
+        int: The size of the serialized patch (including binary buffers) in bytes.
+    """
+    if not events:
+        return 0
+
+    patch_json, buffers = process_document_events(events, use_buffers=True)
+    return len(patch_json.encode()) + sum(len(payload) for _, payload in buffers)
+
+
+class HandlerProfiler:
+    """A process-wide registry of aggregated event handler profiles.
+
+    For each handler it aggregates the number of calls and the total and maximal wall time, CPU time, queue delay
+    (the time between scheduling and execution), number of document change events and serialized patch size.
+    """
+    _profiles: Dict[str, Dict[str, float]] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def record(cls, name: str, **metrics: float):
+        """Adds a single invocation to the profile of a handler.
+
+        Args:
+            name (str): The name of the handler.
+            **metrics (float): The measured values of the invocation (see PROFILE_METRICS).
+        """
+        with cls._lock:
+            profile = cls._profiles.setdefault(name, {"calls": 0})
+            profile["calls"] += 1
+
+            for metric in PROFILE_METRICS:
+                value = metrics.get(metric, 0)
+                profile[f"{metric}_total"] = profile.get(f"{metric}_total", 0) + value
+                profile[f"{metric}_max"] = max(profile.get(f"{metric}_max", value), value)
+
+    @classmethod
+    def dump(cls) -> Dict[str, Dict[str, float]]:
+        """Returns the aggregated profiles, ordered by total wall time (descending).
+
+        Returns:
+            Dict[str, Dict[str, float]]: A dictionary that maps handler names to their aggregated metrics. Times
+                are in seconds.
+        """
+        with cls._lock:
+            profiles = {name: dict(profile) for name, profile in cls._profiles.items()}
+
+        for profile in profiles.values():
+            for metric in PROFILE_METRICS:
+                profile[f"{metric}_mean"] = profile[f"{metric}_total"] / profile["calls"]
+
+        return dict(sorted(profiles.items(), key=lambda item: item[1]["wall_time_total"], reverse=True))
+
+    @classmethod
+    def reset(cls):
+        with cls._lock:
+            cls._profiles.clear()
+
+
+class InvocationProfile:
+    """Measures a single invocation of an event handler.
+
+    The invocation may be measured in several parts (e.g. a part that runs in a worker thread and a part that
+    applies the results to the document), its metrics are recorded once "record" is called.
+    """
+
+    def __init__(self, name: str, scheduled_at: Optional[float] = None):
+        """Initializes an InvocationProfile instance. It should be created when the invocation starts.
+
+        Args:
+            name (str): The name of the handler.
+            scheduled_at (Optional[float], optional): The time (time.monotonic) at which the invocation was
+                scheduled. Defaults to None (no queue delay).
+        """
+        self._name = name
+        self._started_at = time.perf_counter()
+        self._queue_delay = time.monotonic() - scheduled_at if scheduled_at is not None else 0
+        self._cpu_time = 0.0
+        self._events: List[DocumentPatchedEvent] = []
+
+    @contextmanager
+    def measure(self, doc: Optional[Document] = None) -> Iterator[None]:
+        """Measures the CPU time of the current thread, and collects the document changes, while the context is active.
+
+        Args:
+            doc (Optional[Document], optional): The document whose changes are collected. It must be None when
+                measuring outside the document lock (e.g. in a worker thread). Defaults to None.
+        """
+        cpu_time_start = time.thread_time()
+        if doc is not None:
+            doc.on_change(self._on_document_change)
+
+        try:
+            yield
+        finally:
+            self._cpu_time += time.thread_time() - cpu_time_start
+            if doc is not None:
+                doc.remove_on_change(self._on_document_change)
+
+    def record(self):
+        HandlerProfiler.record(
+            self._name,
+            wall_time=time.perf_counter() - self._started_at,
+            cpu_time=self._cpu_time,
+            queue_delay=self._queue_delay,
+            events=len(self._events),
+            patch_bytes=get_patch_size(self._events),
+        )
+
+    def _on_document_change(self, event: Any):
+        if isinstance(event, DocumentPatchedEvent):
+            self._events.append(event)
@@ -8,8 +8,7 @@ setup(
 
     # Requirements for the package.
     install_requires=[
-        "bokeh>=2.3.0, <2.5",
-        "seaborn~=0.12.0",
+        "bokeh>=2.4.3, <2.5",
         "gql[requests]~=3.4.0",
         "jsonschema~=4.17.0",
     ],
@@ -17,6 +16,8 @@ setup(
         "development": [
             "flake8~=3.8",
             "pytest~=6.2.4",
+            # The palettes of the colors module are tested against seaborn's palettes.
+            "seaborn~=0.12.0",
         ],
     },
 
@@ -0,0 +1,125 @@
+import numpy as np
+import pytest
+from typing import Any
+from mz_bokeh_package.components import AppState, ArrayAppStateValue, ArrayDelta
+
+
+class DeltaRecorder():
+
+    def __init__(self):
+        self.values = []
+        self.deltas = []
+        self.plain_values = []
+
+    def on_change(self, new_value: Any) -> None:
+        self.plain_values.append(new_value.copy())
+
+    def on_delta(self, new_value: Any, delta: ArrayDelta) -> None:
+        self.values.append(new_value.copy())
+        self.deltas.append(delta)
+
+
+def test_construction():
+    array_value = ArrayAppStateValue()
+    assert array_value.value is None
+
+    array_value = ArrayAppStateValue([1, 2, 3])
+    np.testing.assert_array_equal(array_value.value, [1, 2, 3])
+
+
+def test_construction_copies_value():
+    initial_value = np.arange(5)
+    array_value = ArrayAppStateValue(initial_value)
+    array_value.patch(0, 42)
+
+    assert initial_value[0] == 0
+
+
+def test_subscribe_delta_validation():
+    array_value = ArrayAppStateValue()
+
+    with pytest.raises(ValueError):
+        array_value.subscribe_delta(lambda new_value: None)
+
+    array_value.subscribe_delta(lambda new_value, delta: None)
+
+
+def test_replace():
+    array_value = ArrayAppStateValue(np.zeros(3))
+    recorder = DeltaRecorder()
+    array_value.subscribe_delta(recorder.on_delta)
+
+    array_value.value = np.zeros(3)
+    assert recorder.deltas == []
+
+    array_value.value = np.ones(4)
+    assert recorder.deltas == [ArrayDelta("replace", [(0, 4)])]
+
+
+def test_patch():
+    array_value = ArrayAppStateValue(np.zeros(10))
+    recorder = DeltaRecorder()
+    array_value.subscribe(recorder.on_change)
+    array_value.subscribe_delta(recorder.on_delta)
+
+    array_value.patch(slice(2, 6), [0, 1, 1, 0])
+    array_value.patch(-1, 5)
+
+    # Patching with identical values does not notify subscribers
+    array_value.patch(slice(0, 2), 0)
+
+    assert [delta.kind for delta in recorder.deltas] == ["patch", "patch"]
+    assert recorder.deltas[0].ranges == [(3, 5)]
+    assert recorder.deltas[1].ranges == [(9, 10)]
+    assert len(recorder.plain_values) == 2
+    np.testing.assert_array_equal(array_value.value, [0, 0, 0, 1, 1, 0, 0, 0, 0, 5])
+
+
+def test_patch_non_contiguous_slice():
+    array_value = ArrayAppStateValue(np.zeros(10))
+
+    with pytest.raises(ValueError):
+        array_value.patch(slice(0, 10, 2), 1)
+
+
+def test_patch_rows_of_2d_array():
+    array_value = ArrayAppStateValue(np.zeros((4, 2)))
+    recorder = DeltaRecorder()
+    array_value.subscribe_delta(recorder.on_delta)
+
+    array_value.patch(slice(0, 4), [[0, 0], [0, 1], [1, 0], [0, 0]])
+
+    assert recorder.deltas[0].ranges == [(1, 3)]
+
+
+def test_append():
+    array_value = ArrayAppStateValue()
+    recorder = DeltaRecorder()
+    array_value.subscribe_delta(recorder.on_delta)
+
+    array_value.append([1, 2])
+    for i in range(3, 20):
+        array_value.append(i)
+
+    np.testing.assert_array_equal(array_value.value, np.arange(1, 20))
+    assert recorder.deltas[0].ranges == [(0, 2)]
+    assert recorder.deltas[-1].ranges == [(18, 19)]
+    np.testing.assert_array_equal(recorder.deltas[-1].tail, [19])
+    np.testing.assert_array_equal(recorder.values[-1], np.arange(1, 20))
+
+
+def test_app_state_array_value():
+    state = AppState()
+    recorder = DeltaRecorder()
+    state.on_change("measurements", recorder.on_change)
+
+    array_value = state.add_array_value("measurements", np.zeros(3))
+    state.on_delta("measurements", recorder.on_delta)
+
+    array_value.patch(0, 1)
+    state["measurements"] = np.arange(5)
+
+    assert state.add_array_value("measurements") is array_value
+    assert [delta.kind for delta in recorder.deltas] == ["patch", "replace"]
+    assert len(recorder.plain_values) == 2
+    np.testing.assert_array_equal(state["measurements"], np.arange(5))
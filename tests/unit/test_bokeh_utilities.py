@@ -0,0 +1,376 @@
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pytest
+from functools import partial
+from bokeh.document import Document
+from bokeh.models import ColumnDataSource, Div
+from mz_bokeh_package.components import AppState
+from mz_bokeh_package.utilities import BokehUtilities, HandlerProfiler
+from mz_bokeh_package.utilities import bokeh_utilities
+
+
+class DummyDocument(Document):
+    """A Bokeh document that runs session callbacks on demand (instead of on a server's IOLoop)."""
+
+    def __init__(self):
+        super().__init__()
+        self._lock = threading.Lock()
+        self.pending_callbacks = []
+
+    def add_next_tick_callback(self, callback):
+        with self._lock:
+            self.pending_callbacks.append(callback)
+
+    def add_timeout_callback(self, callback, timeout_milliseconds):
+        # Timeouts are not simulated, the callback runs on the next call to "run_callbacks".
+        self.add_next_tick_callback(callback)
+
+    def run_callbacks(self, timeout: float = 5):
+        # Wait for callbacks that are added by worker threads.
+        deadline = time.monotonic() + timeout
+        while not self.pending_callbacks and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        with self._lock:
+            callbacks, self.pending_callbacks = self.pending_callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def run_until_idle(self, component):
+        while component._state["is_loading"]:
+            self.run_callbacks()
+
+
+def _square(value):
+    return value ** 2
+
+
+class DummyComponent():
+
+    def __init__(self):
+        self._state = AppState()
+        self.calls = []
+        self.disabled = []
+        self.threads = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def _disable_controls(self, disable: bool):
+        self.disabled.append(disable)
+
+    @BokehUtilities.async_event_handler(function_to_execute="_disable_controls")
+    def on_change(self, attr, old, new):
+        self.calls.append(new)
+
+    @BokehUtilities.async_event_handler(executor="thread")
+    def on_click(self, event):
+        self.threads.append(threading.current_thread())
+        return partial(self.calls.append, event)
+
+    @BokehUtilities.async_event_handler(policy="latest")
+    def on_latest_change(self, attr, old, new):
+        self.calls.append(new)
+
+    @BokehUtilities.async_event_handler(policy="debounce", wait=10)
+    def on_debounced_change(self, attr, old, new):
+        self.calls.append(new)
+
+    @BokehUtilities.async_event_handler(policy="throttle", wait=60000)
+    def on_throttled_change(self, attr, old, new):
+        self.calls.append(new)
+
+    @BokehUtilities.async_event_handler(executor="thread", policy="latest")
+    def on_cancellable_click(self, event):
+        self.started.set()
+        self.release.wait(5)
+        cancelled = BokehUtilities.is_cancelled()
+        return partial(self.calls.append, (event, cancelled))
+
+    @BokehUtilities.async_event_handler(profile=True)
+    def on_profiled_change(self, attr, old, new):
+        self.div.text = new
+        self.div.width = 100
+
+    @BokehUtilities.async_event_handler(executor="thread", profile=True)
+    def on_profiled_click(self, event):
+        return partial(setattr, self.div, "text", event)
+
+    @BokehUtilities.profile_event_handler(name="sync_handler")
+    def on_sync_change(self, attr, old, new):
+        self.div.text = new
+
+    @BokehUtilities.async_event_handler(executor="thread")
+    def on_offloaded_click(self, event):
+        result = self.process_pool.submit(_square, event).result()
+        return partial(self.calls.append, result)
+
+    @BokehUtilities.async_event_handler(executor="thread")
+    def on_failing_click(self, event):
+        raise RuntimeError("Failed")
+
+
+@pytest.fixture
+def document(monkeypatch):
+    document = DummyDocument()
+    monkeypatch.setattr(bokeh_utilities, "curdoc", lambda: document)
+    return document
+
+
+def test_async_event_handler(document):
+    component = DummyComponent()
+
+    component.on_change("value", 1, 2)
+    assert component._state["is_loading"]
+    assert component.calls == []
+
+    document.run_callbacks()
+    assert component.calls == [2]
+    assert component.disabled == [True, False]
+    assert not component._state["is_loading"]
+    # The number of pending invocations isn't exposed in the state
+    assert list(component._state._values) == ["is_loading"]
+
+
+def test_async_event_handler_signature():
+    assert str(bokeh_utilities.inspect.signature(DummyComponent.on_change)) == "(self, attr, old, new)"
+    assert DummyComponent.on_change._original.__name__ == "on_change"
+
+
+def test_async_event_handler_executor(document):
+    component = DummyComponent()
+
+    component.on_click("event")
+    assert component._state["is_loading"]
+
+    document.run_until_idle(component)
+    assert component.calls == ["event"]
+    assert component.threads[0] is not threading.current_thread()
+    assert not component._state["is_loading"]
+
+
+def test_async_event_handler_executor_error(document):
+    component = DummyComponent()
+
+    component.on_failing_click("event")
+
+    with pytest.raises(RuntimeError):
+        document.run_until_idle(component)
+    assert not component._state["is_loading"]
+
+
+def test_async_event_handler_process_pool(document):
+    with ProcessPoolExecutor(max_workers=1) as process_pool:
+        with pytest.raises(ValueError):
+            BokehUtilities.async_event_handler(executor=process_pool)(lambda self, event: None)
+
+        # The CPU-bound part of an event handler that runs in a thread is offloaded to the process pool
+        component = DummyComponent()
+        component.process_pool = process_pool
+        component.on_offloaded_click(3)
+
+        document.run_until_idle(component)
+        assert component.calls == [9]
+
+
+@pytest.mark.parametrize("handler_name", ["on_latest_change", "on_debounced_change"])
+def test_async_event_handler_drops_superseded_invocations(document, handler_name):
+    component = DummyComponent()
+    handler = getattr(component, handler_name)
+
+    for value in range(5):
+        handler("value", value - 1, value)
+    assert component._state["is_loading"]
+
+    document.run_callbacks()
+    assert component.calls == [4]
+    assert not component._state["is_loading"]
+
+
+def test_async_event_handler_throttle(document):
+    component = DummyComponent()
+
+    for value in range(5):
+        component.on_throttled_change("value", value - 1, value)
+
+    document.run_callbacks()
+
+    # The first invocation runs immediately, the rest are coalesced into a single trailing invocation.
+    assert component.calls == [0, 4]
+    assert not component._state["is_loading"]
+
+
+def test_async_event_handler_cancels_running_invocations(document):
+    component = DummyComponent()
+
+    component.on_cancellable_click("first")
+    document.run_callbacks()
+    assert component.started.wait(5)
+
+    component.on_cancellable_click("second")
+    component.release.set()
+
+    # Run the "second" invocation and wait for both invocations to finish.
+    document.run_until_idle(component)
+
+    # The result of the superseded invocation is not applied
+    assert component.calls == [("second", False)]
+
+
+def test_combined_updates():
+    doc = Document()
+    div = Div(text="")
+    doc.add_root(div)
+    events = []
+    doc.on_change(events.append)
+    python_callbacks = []
+    div.on_change("text", lambda attr, old, new: python_callbacks.append(new))
+
+    with BokehUtilities.combined_updates(doc):
+        with BokehUtilities.combined_updates(doc):
+            div.text = "1"
+            div.text = "2"
+        assert events == []
+        div.width = 100
+
+    assert [(event.attr, event.new) for event in events] == [("text", "2"), ("width", 100)]
+    assert python_callbacks == ["2"]
+    assert doc.callbacks.hold_value is None
+
+
+def test_async_event_handler_overlapping_handlers(document):
+    first_component = DummyComponent()
+    second_component = DummyComponent()
+    second_component._state = first_component._state
+
+    first_component.on_change("value", 0, 1)
+    second_component.on_click("event")
+
+    # The first handler finishes while the second one still runs in the executor
+    document.pending_callbacks.pop(0)()
+    assert first_component.calls == [1]
+    assert first_component._state["is_loading"]
+
+    document.run_until_idle(second_component)
+    assert second_component.calls == ["event"]
+    assert not first_component._state["is_loading"]
+
+
+def test_async_event_handler_dict_state(document):
+    component = DummyComponent()
+    component._state = {}
+
+    component.on_change("value", 0, 1)
+    assert component._state["is_loading"]
+
+    document.run_until_idle(component)
+    assert component.calls == [1]
+    assert not component._state["is_loading"]
+
+
+def test_profiling(document):
+    HandlerProfiler.reset()
+    component = DummyComponent()
+    component.div = Div(text="")
+    document.add_root(component.div)
+
+    component.on_profiled_change("text", "", "changed")
+    component.on_profiled_click("clicked")
+    document.run_until_idle(component)
+    component.on_sync_change("text", "", "synced")
+
+    profiles = HandlerProfiler.dump()
+    change_profile = profiles[f"{__name__}.DummyComponent.on_profiled_change"]
+    click_profile = profiles[f"{__name__}.DummyComponent.on_profiled_click"]
+
+    assert change_profile["calls"] == 1
+    assert change_profile["events_total"] == 2
+    assert change_profile["patch_bytes_total"] > 0
+    assert change_profile["queue_delay_max"] >= 0
+    assert click_profile["events_total"] == 1
+    assert profiles["sync_handler"]["events_total"] == 1
+    assert profiles["sync_handler"]["wall_time_mean"] > 0
+
+
+@pytest.mark.parametrize("values, expected_dtype", [
+    ([1, 2, 3], np.int8),
+    ([0, 200], np.uint8),
+    ([-1, 1000], np.int16),
+    ([0, 2 ** 40], np.float64),
+    ([0.5, 1.5, None], np.float32),
+    (np.array([1.6e12, 1.6e12 + 1]), np.float64),
+    (np.array(["2022-01-01", "2022-01-02"], dtype="datetime64[ns]"), np.float64),
+])
+def test_compact_array(values, expected_dtype):
+    array = BokehUtilities.compact_array(values)
+
+    assert array.dtype == expected_dtype
+    assert np.allclose(array, np.array(values, dtype=float), equal_nan=True) or array.dtype == np.float64
+
+
+def test_compact_array_strings():
+    values = ["a", "b"]
+    assert BokehUtilities.compact_array(values) is values
+
+
+def test_compact_array_numeric_strings():
+    # e.g. the zero-padded ids of an object column of a data frame.
+    values = np.array(["001", "002", "010"], dtype=object)
+    assert BokehUtilities.compact_array(values) is values
+
+    source = ColumnDataSource()
+    BokehUtilities.set_source_data(source, {"id": [1, 2, 3]})
+    BokehUtilities.stream(source, {"id": np.array(["004"], dtype=object)})
+    assert source.data["id"].tolist() == [1, 2, 3, "004"]
+
+
+def test_categorize():
+    codes, categories = BokehUtilities.categorize(["b", "a", "b"])
+
+    assert codes.dtype == np.int8
+    assert codes.tolist() == [0, 1, 0]
+    assert categories == ["b", "a"]
+
+
+def test_stream_and_patch():
+    source = ColumnDataSource()
+    BokehUtilities.set_source_data(source, {"x": [1, 2, 3], "y": [0.5, 1.5, 2.5]})
+
+    BokehUtilities.stream(source, {"x": [4], "y": [3.5]})
+    BokehUtilities.patch(source, {"y": [(slice(0, 2), [5, 6]), (3, 7)]})
+
+    assert source.data["x"].dtype == np.int8
+    assert source.data["y"].dtype == np.float32
+    assert source.data["x"].tolist() == [1, 2, 3, 4]
+    assert source.data["y"].tolist() == [5, 6, 2.5, 7]
+
+
+def test_stream_and_patch_int_overflow():
+    source = ColumnDataSource()
+    BokehUtilities.set_source_data(source, {"id": [1, 2, 3]})
+
+    BokehUtilities.stream(source, {"id": [200, 1000]})
+    assert source.data["id"].dtype == np.int16
+    assert source.data["id"].tolist() == [1, 2, 3, 200, 1000]
+
+    BokehUtilities.patch(source, {"id": [(slice(0, 2), [-70000, 5]), (2, 2**40)]})
+    assert source.data["id"].dtype == np.float64
+    assert source.data["id"].tolist() == [-70000, 5, 2**40, 200, 1000]
+
+
+def test_stream_and_patch_float_precision():
+    source = ColumnDataSource()
+    BokehUtilities.set_source_data(source, {"x": [1e6, 1e6 + 1], "y": [1e6, 1e6 + 1]})
+    assert source.data["x"].dtype == np.float32
+
+    BokehUtilities.stream(source, {"x": [1e6 + 0.1], "y": [1e6 + 0.5]})
+    assert source.data["x"].dtype == np.float64
+    assert source.data["x"].tolist() == [1e6, 1e6 + 1, 1e6 + 0.1]
+
+    # Values that float32 holds exactly keep the column's dtype.
+    assert source.data["y"].dtype == np.float32
+
+    BokehUtilities.patch(source, {"y": [(slice(1, 3), [1e6 + 0.3, 1e6 + 0.25])]})
+    assert source.data["y"].dtype == np.float64
+    assert source.data["y"].tolist() == [1e6, 1e6 + 0.3, 1e6 + 0.25]
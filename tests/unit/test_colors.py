@@ -1,14 +1,29 @@
+import numpy as np
 import pytest
 from mz_bokeh_package.utilities.colors import (
     TURQUOISE,
     DARK_TURQUOISE,
     PURPLE,
     BLUE,
+    BASE_COLORS,
+    Palette,
+    hex_to_rgb_array,
+    rgb_array_to_hex,
+    find_darker_shade,
+    find_darker_shades,
+    find_lighter_shades,
+    map_values_to_codes,
+    map_values_to_rgba,
+    create_codes_color_mapper,
     hex_to_rgb,
     rgb_to_hex,
     normalize_rgb,
     denormalize_rgb,
     make_palette_cyclic,
+    blend_palette,
+    light_palette,
+    generate_continuous_palette,
+    generate_categorical_palette,
 )
 
 hex_to_rgb_params = [
@@ -21,6 +36,11 @@ normalize_rgb_params = [
     ((0, 0, 0), (0, 0, 0)),
     ((30, 45, 12), (30/255, 45/255, 12/255)),
 ]
+palette_colors_params = [
+    [TURQUOISE, PURPLE],
+    [DARK_TURQUOISE, PURPLE, BLUE],
+    ["#000000", "#ffffff", "#ff0000", "#00ff00", "#0000ff"],
+]
 make_palette_cyclic_params = [
     ([TURQUOISE, PURPLE], 3),
     ([TURQUOISE, PURPLE], 10),
@@ -55,3 +75,109 @@ def test_make_palette_cyclic(palette, size):
     colors_pool = make_palette_cyclic(palette)
 
     assert [next(colors_pool) for i in range(size)] == expected_result
+
+
+@pytest.mark.parametrize("colors", palette_colors_params)
+@pytest.mark.parametrize("n_colors", [1, 2, 6, 256, 1000])
+def test_blend_palette(colors, n_colors):
+    sns = pytest.importorskip("seaborn")
+    normalized_colors = [normalize_rgb(hex_to_rgb(color)) for color in colors]
+
+    assert blend_palette(normalized_colors, n_colors).tolist() == \
+        [list(color) for color in sns.blend_palette(normalized_colors, n_colors)]
+
+
+@pytest.mark.parametrize("color", [TURQUOISE, DARK_TURQUOISE, PURPLE, BLUE, "#000000", "#ffffff", "#808080"])
+def test_light_palette(color):
+    sns = pytest.importorskip("seaborn")
+    normalized_color = normalize_rgb(hex_to_rgb(color))
+
+    assert light_palette(normalized_color).tolist() == \
+        [list(color) for color in sns.light_palette(normalized_color)]
+
+
+def test_generate_palettes():
+    continuous_palette = generate_continuous_palette([TURQUOISE, PURPLE], n_colors=5)
+    assert continuous_palette[0] == TURQUOISE
+    assert continuous_palette[-1] == PURPLE
+
+    categorical_palette = generate_categorical_palette([TURQUOISE, PURPLE])
+    assert categorical_palette[:2] == (TURQUOISE, PURPLE)
+    assert len(categorical_palette) == 6
+
+
+def test_palette():
+    palette = Palette([TURQUOISE, PURPLE])
+
+    assert palette == (TURQUOISE, PURPLE)
+    assert palette.rgb.tolist() == [[106, 206, 206], [149, 84, 255]]
+    assert Palette.from_rgb(palette.rgb) == palette
+
+    with pytest.raises(ValueError):
+        palette.rgb[0, 0] = 0
+
+
+def test_generated_palettes_are_cached():
+    palette = generate_continuous_palette([TURQUOISE, PURPLE], n_colors=10)
+
+    assert generate_continuous_palette((TURQUOISE, PURPLE), n_colors=10) is palette
+    assert generate_continuous_palette([TURQUOISE, PURPLE], n_colors=11) is not palette
+    assert generate_categorical_palette() is generate_categorical_palette(BASE_COLORS)
+
+
+def test_rgb_arrays():
+    hex_colors = [hex_color for hex_color, _ in hex_to_rgb_params]
+    rgb_colors = [rgb for _, rgb in hex_to_rgb_params]
+
+    assert hex_to_rgb_array(hex_colors).tolist() == [list(rgb) for rgb in rgb_colors]
+    assert hex_to_rgb_array([color.upper() for color in hex_colors]).tolist() == [list(rgb) for rgb in rgb_colors]
+    assert rgb_array_to_hex(np.array(rgb_colors)).tolist() == hex_colors
+    assert rgb_array_to_hex(np.array([[-10, 300, 16]])).tolist() == ["#00ff10"]
+
+
+@pytest.mark.parametrize("hex_colors", [["#12345"], ["#12345g"]])
+def test_hex_to_rgb_array_invalid(hex_colors):
+    with pytest.raises(ValueError):
+        hex_to_rgb_array(hex_colors)
+
+
+def test_shades():
+    assert find_darker_shade("#4f4f4f") == "#313131"
+    assert find_darker_shades(["#4f4f4f", "#100000"]).tolist() == ["#313131", "#000000"]
+    assert find_lighter_shades(["#4f4f4f", "#f00000"]).tolist() == ["#6d6d6d", "#ff1e1e"]
+
+
+@pytest.mark.parametrize("scale, kwargs, expected_codes", [
+    ("linear", {}, [0, 0, 0, 0, 1, -1, 2]),
+    ("linear", {"low": 1, "high": 4}, [0, 0, 1, 2, 2, -1, 2]),
+    ("log", {}, [-1, 0, 0, 1, 1, -1, 2]),
+    ("quantile", {}, [0, 0, 1, 1, 2, -1, 2]),
+])
+def test_map_values_to_codes(scale, kwargs, expected_codes):
+    values = np.array([0, 1, 2, 3, 4, np.nan, 10])
+
+    assert map_values_to_codes(values, 3, scale, **kwargs).tolist() == expected_codes
+
+
+def test_map_values_to_codes_invalid():
+    assert map_values_to_codes([np.nan, np.nan], 3).tolist() == [-1, -1]
+
+    with pytest.raises(ValueError):
+        map_values_to_codes([1, 2], 3, scale="sqrt")
+
+
+def test_map_values_to_rgba():
+    values = np.array([[0, 1], [2, np.nan]])
+    rgba = map_values_to_rgba(values, ["#ff0000", "#0000ff"], nan_color="#80808040")
+
+    assert rgba.shape == values.shape
+    assert rgba.dtype == np.uint32
+    assert rgba.view(np.uint8).reshape(-1, 4).tolist() == [
+        [255, 0, 0, 255], [0, 0, 255, 255], [0, 0, 255, 255], [128, 128, 128, 64],
+    ]
+
+
+def test_create_codes_color_mapper():
+    color_mapper = create_codes_color_mapper([TURQUOISE, PURPLE, BLUE])
+
+    assert (color_mapper.low, color_mapper.high) == (-0.5, 2.5)
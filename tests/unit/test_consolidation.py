@@ -0,0 +1,87 @@
+import pytest
+from bokeh.models import ColumnDataSource, HoverTool, LegendItem, Range1d
+from bokeh.plotting import figure
+from mz_bokeh_package.utilities import consolidate_renderers
+
+
+@pytest.fixture
+def plot():
+    plot = figure()
+    for group, color in (("a", "#ff0000"), ("b", "#00ff00"), ("c", "#0000ff")):
+        source = ColumnDataSource(data={"x": [1, 2], "y": [3, 4]})
+        plot.scatter("x", "y", source=source, marker="square", fill_color=color, line_color="black",
+                     selection_color="black", legend_label=group)
+
+    return plot
+
+
+def test_consolidate_renderers(plot):
+    renderer = consolidate_renderers(plot)
+
+    assert plot.renderers == [renderer]
+    assert renderer.glyph.marker == "square"
+    assert renderer.glyph.fill_color == "color"
+    assert renderer.glyph.line_color == "line_color"
+    assert renderer.selection_glyph.fill_color == "black"
+    assert renderer.data_source.data["x"].tolist() == [1, 2] * 3
+    assert renderer.data_source.data["group"].tolist() == ["a", "a", "b", "b", "c", "c"]
+    assert renderer.data_source.data["color"].tolist()[::2] == ["#ff0000", "#00ff00", "#0000ff"]
+    assert renderer.data_source.data["line_color"].tolist() == ["black"] * 6
+
+    legend_items = plot.legend[0].items
+    assert len(legend_items) == 1
+    assert legend_items[0].label == {"field": "group"}
+    assert legend_items[0].renderers == [renderer]
+
+
+def test_consolidate_renderers_invalid(plot):
+    plot.circle("x", "y", source=ColumnDataSource(data={"x": [1], "y": [2]}))
+
+    with pytest.raises(ValueError):
+        consolidate_renderers(plot)
+
+
+def test_consolidate_renderers_references(plot):
+    old_renderers = [*plot.renderers]
+    # A renderer that isn't consolidated
+    line = figure().line("x", "y", source=ColumnDataSource(data={"x": [1], "y": [2]}))
+    hover_tool = HoverTool(renderers=[old_renderers[0], old_renderers[1], line])
+    plot.add_tools(hover_tool)
+    plot.legend[0].items.append(LegendItem(label="all", renderers=[old_renderers[0], line]))
+
+    renderer = consolidate_renderers(plot)
+
+    assert hover_tool.renderers == [line, renderer]
+    assert [item.renderers for item in plot.legend[0].items] == [[renderer], [line, renderer]]
+
+
+def test_consolidate_renderers_properties(plot):
+    plot.extra_y_ranges = {"right": Range1d(0, 10)}
+    for renderer in plot.renderers:
+        renderer.y_range_name = "right"
+        renderer.level = "overlay"
+
+    renderer = consolidate_renderers(plot)
+
+    assert renderer.y_range_name == "right"
+    assert renderer.level == "overlay"
+
+
+def test_consolidate_renderers_different_properties(plot):
+    plot.extra_y_ranges = {"right": Range1d(0, 10)}
+    plot.renderers[0].y_range_name = "right"
+
+    with pytest.raises(ValueError):
+        consolidate_renderers(plot)
+
+
+def test_consolidate_renderers_field_names(plot):
+    with pytest.raises(ValueError):
+        consolidate_renderers(plot, group_field="x")
+
+    with pytest.raises(ValueError):
+        consolidate_renderers(plot, color_field="group_color", line_color_field="group_color")
+
+    renderer = consolidate_renderers(plot, group_field="material", color_field="material_color")
+    assert {*renderer.data_source.data} == {"x", "y", "material", "material_color", "line_color"}
+    assert renderer.glyph.fill_color == "material_color"
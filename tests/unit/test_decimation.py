@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+from bokeh.events import RangesUpdate
+from bokeh.models import ColumnDataSource, Range1d
+from bokeh.plotting import figure
+from mz_bokeh_package.utilities import RangeDecimator
+from mz_bokeh_package.utilities.decimation import MinMaxPyramid, lttb
+
+SAMPLES_NUM = 100_000
+BUCKETS_NUM = 100
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    x = np.arange(SAMPLES_NUM, dtype=float)
+    y = np.cumsum(rng.normal(size=SAMPLES_NUM))
+    return {"x": x, "y": y, "label": np.arange(SAMPLES_NUM)}
+
+
+def test_min_max_pyramid(data):
+    y = data["y"]
+    pyramid = MinMaxPyramid(y)
+
+    indices = pyramid.get_indices(1000, 51000, BUCKETS_NUM)
+
+    assert BUCKETS_NUM <= len(indices) <= 4 * BUCKETS_NUM + 2
+    assert np.all(np.diff(indices) > 0)
+    assert indices[0] == 1000 and indices[-1] == 50999
+    assert y[indices].min() == y[1000:51000].min()
+    assert y[indices].max() == y[1000:51000].max()
+
+
+def test_lttb():
+    x = np.arange(1000, dtype=float)
+    y = np.zeros(1000)
+    y[500] = 10
+
+    selected = lttb(x, y, 20)
+
+    assert len(selected) == 20
+    assert selected[0] == 0 and selected[-1] == 999
+    assert 500 in selected
+
+
+@pytest.mark.parametrize("method", ["minmax", "lttb"])
+def test_range_decimator(data, method):
+    plot = figure(x_range=Range1d(0, SAMPLES_NUM))
+    source = ColumnDataSource()
+    plot.line("x", "y", source=source)
+
+    decimator = RangeDecimator(plot, source, data, x="x", y="y", method=method, buckets_num=BUCKETS_NUM)
+
+    assert len(source.data["x"]) <= 4 * BUCKETS_NUM + 2
+    assert np.array_equal(source.data["y"], data["y"][source.data["label"]])
+
+    # Zoom into a window that is small enough to be sent as it is.
+    plot._trigger_event(RangesUpdate(plot, x0=1000.5, x1=1100.5, y0=0, y1=1))
+
+    assert source.data["x"].tolist() == list(range(1000, 1102))
+
+    decimator.detach()
+    plot._trigger_event(RangesUpdate(plot, x0=0, x1=SAMPLES_NUM, y0=0, y1=1))
+
+    assert source.data["x"].tolist() == list(range(1000, 1102))
+
+
+def test_range_decimator_unsorted_data(data):
+    plot = figure()
+    source = ColumnDataSource()
+    order = np.random.default_rng(0).permutation(SAMPLES_NUM)
+
+    decimator = RangeDecimator(plot, source, {name: column[order] for name, column in data.items()}, x="x", y="y")
+    decimator.update(10, 20)
+
+    assert source.data["x"].tolist() == list(range(9, 22))
+    assert source.data["label"].tolist() == list(range(9, 22))
+
+
+def test_range_decimator_invalid_method(data):
+    with pytest.raises(ValueError):
+        RangeDecimator(figure(), ColumnDataSource(), data, x="x", y="y", method="mean")
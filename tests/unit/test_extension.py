@@ -0,0 +1,37 @@
+import json
+import os
+
+from mz_bokeh_package.custom_widgets import CustomSelect
+from mz_bokeh_package.custom_widgets.extension import (
+    BUILD_INFO_PATH,
+    BUNDLE_PATH,
+    IS_BUNDLE_BUILT,
+    get_build_info,
+    get_implementation,
+)
+
+
+def test_get_implementation():
+    implementation = get_implementation("select.ts")
+
+    assert 'from "core/dom"' in implementation.code
+    assert "@bokehjs/" not in implementation.code
+    assert os.path.isabs(implementation.file)
+
+
+def test_bundled_widgets():
+    assert IS_BUNDLE_BUILT == os.path.exists(BUNDLE_PATH)
+
+    # Widgets that are loaded from the bundle are identified by their qualified names.
+    assert hasattr(CustomSelect, "__implementation__") != IS_BUNDLE_BUILT
+    if IS_BUNDLE_BUILT:
+        assert CustomSelect.__qualified_model__ == "mz_bokeh_package.custom_widgets.custom_select.CustomSelect"
+
+
+def test_bundle_is_up_to_date():
+    if not IS_BUNDLE_BUILT:
+        return
+
+    # The bundle must be rebuilt (see the extension module) once its sources or the version of Bokeh change.
+    with open(BUILD_INFO_PATH, encoding="utf-8") as f:
+        assert json.load(f) == get_build_info(), "Rebuild it: python -m mz_bokeh_package.custom_widgets.build"
@@ -0,0 +1,41 @@
+import numpy as np
+from bokeh.models import ColumnDataSource
+from mz_bokeh_package.utilities import GroupIndex
+from mz_bokeh_package.utilities.group_index import factorize
+
+
+def test_factorize():
+    codes, uniques = factorize(["b", "a", "b", "c", "a"])
+
+    assert codes.tolist() == [0, 1, 0, 2, 1]
+    assert uniques.tolist() == ["b", "a", "c"]
+
+
+def test_factorize_none_values():
+    codes, uniques = factorize(["b", None, "a", "b", None])
+
+    assert codes.tolist() == [0, 1, 2, 0, 1]
+    assert uniques.tolist() == ["b", None, "a"]
+
+
+def test_group_index_cache():
+    source = ColumnDataSource(data={"group": ["b", "a", "b"], "color": ["red"] * 3})
+    group_index = GroupIndex()
+
+    codes, uniques = group_index.get(source, "group")
+    assert group_index.get(source, "group")[0] is codes
+
+    # Replacing another column keeps the group index.
+    source.data["color"] = np.array(["blue"] * 3)
+    assert group_index.get(source, "group")[0] is codes
+
+    source.patch({"group": [(0, "c")]})
+    codes, uniques = group_index.get(source, "group")
+    assert uniques.tolist() == ["c", "a", "b"]
+
+    source.stream({"group": ["d"], "color": ["red"]})
+    codes, uniques = group_index.get(source, "group")
+    assert codes.tolist() == [0, 1, 2, 3]
+
+    source.data = {"group": ["x", "x"], "color": ["red"] * 2}
+    assert group_index.get(source, "group")[1].tolist() == ["x"]
@@ -0,0 +1,49 @@
+import pytest
+from bokeh.document import Document
+from bokeh.models import ColumnDataSource, Div
+from mz_bokeh_package.utilities import PatchAccountant
+
+
+@pytest.fixture
+def document():
+    doc = Document()
+    doc.add_root(ColumnDataSource(data={"x": [1, 2]}, name="source"))
+    doc.add_root(Div(text=""))
+    PatchAccountant.reset_process_totals()
+    yield doc
+    PatchAccountant.reset_process_totals()
+
+
+def test_patch_accounting(document):
+    source = document.get_model_by_name("source")
+    div = document.roots[1]
+
+    accountant = PatchAccountant(document)
+    div.text = "a"
+    div.text = "b" * 1000
+    source.stream({"x": [3]})
+    source.patch({"x": [(0, 5)]})
+    accountant.detach()
+    div.text = "c"
+
+    top = accountant.top(by="count")
+    assert top[0] == {"model_type": "Div", "model_name": "", "property": "text", "count": 2, "bytes": top[0]["bytes"]}
+    assert top[0]["bytes"] > 1000
+    assert {(entry["model_name"], entry["property"]) for entry in top[1:]} == {
+        ("source", "data (stream)"),
+        ("source", "data (patch)"),
+    }
+    assert accountant.top(1) == top[:1]
+    assert PatchAccountant.top_in_process() == accountant.top()
+
+
+def test_patch_accounting_ignores_browser_changes(document):
+    accountant = PatchAccountant(document)
+    document.roots[1].update_from_json({"text": "from browser"}, setter="session")
+
+    assert accountant.top() == []
+
+
+def test_patch_accounting_invalid_sort_key(document):
+    with pytest.raises(ValueError):
+        PatchAccountant(document).top(by="time")
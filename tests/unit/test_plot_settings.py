@@ -0,0 +1,348 @@
+import numpy as np
+import pytest
+from bokeh.document import Document
+from bokeh.models import ColumnDataSource, Grid, Legend, LegendItem, Scatter
+from bokeh.plotting import figure
+from bokeh.themes import Theme
+from bokeh.transform import factor_cmap
+from mz_bokeh_package.components import AppState, PlotSettings
+from mz_bokeh_package.components.plot_settings import BASE_SETTINGS, COLORS_PALETTE, WEBGL_POINTS_THRESHOLD
+
+
+@pytest.fixture
+def plot_settings():
+    plot = figure()
+    plot.scatter([1, 2, 3], [1, 2, 3], legend_label="points", marker="square")
+
+    state = AppState()
+    state["plot_settings_state"] = None
+
+    included_settings = [*BASE_SETTINGS, "point_shape", "point_size", "legend_position"]
+    settings = PlotSettings("Settings", plot, state, included_settings=included_settings)
+
+    doc = Document()
+    doc.add_root(plot)
+    doc.add_root(settings.layout)
+    return settings
+
+
+def get_changed_properties(settings: PlotSettings):
+    doc = settings._plot.document
+    events = []
+    doc.on_change(events.append)
+    settings.on_apply_dialog()
+    doc.remove_on_change(events.append)
+
+    # Ignore the changes of the settings' own models (e.g. the snapshot of the applied settings).
+    settings_models = settings.layout.references() | {settings._backend_callback_invoker}
+    return {(type(event.model).__name__, event.attr) for event in events if event.model not in settings_models}
+
+
+def test_apply_unchanged_settings(plot_settings):
+    assert get_changed_properties(plot_settings) == set()
+
+
+def test_apply_changed_settings_only(plot_settings):
+    plot_settings._legend_position_widget.value = "bottom_left"
+
+    assert get_changed_properties(plot_settings) == {("Legend", "location")}
+    assert plot_settings._plot.legend.location == "bottom_left"
+    assert plot_settings._plot_settings_state["legend_position"] == "bottom_left"
+
+
+def test_apply_dependent_settings(plot_settings):
+    plot_settings._point_size_widget.value = 12
+    plot_settings.on_apply_dialog()
+    plot_settings._point_shape_widget.value = "diamond"
+    plot_settings.on_apply_dialog()
+
+    glyph = plot_settings._plot.renderers[0].glyph
+    assert glyph.marker == "diamond"
+    assert glyph.size == 12
+
+
+def test_apply_overlapping_color_settings():
+    plot = figure()
+    plot.scatter([1, 2, 3], [1, 2, 3])
+
+    state = AppState()
+    state["plot_settings_state"] = None
+    settings = PlotSettings("Settings", plot, state, included_settings=["point_color", "fill_color"])
+
+    doc = Document()
+    doc.add_root(plot)
+    doc.add_root(settings.layout)
+
+    settings._point_color_widget.value = COLORS_PALETTE[1]
+    settings.on_apply_dialog()
+
+    glyph = plot.renderers[0].glyph
+    assert glyph.line_color == COLORS_PALETTE[1]
+    assert glyph.fill_color == settings._fill_color_widget.value
+    assert settings._plot_settings_state["fill_color"] == settings._fill_color_widget.value
+
+
+def test_apply_new_plot(plot_settings):
+    new_plot = figure()
+    new_plot.scatter([1, 2, 3], [1, 2, 3], legend_label="points")
+    plot_settings._plot.document.add_root(new_plot)
+
+    plot_settings.on_apply_dialog(new_plot)
+
+    assert new_plot.legend.location == plot_settings._legend_position_widget.value
+    assert not new_plot.grid[0].visible
+
+
+def test_apply_without_plot():
+    state = AppState()
+    state["plot_settings_state"] = None
+    settings = PlotSettings("Settings", None, state, included_settings=["legend_position"])
+    Document().add_root(settings.layout)
+
+    settings._legend_position_widget.value = "bottom_left"
+    settings.on_apply_dialog()
+    assert settings._plot_settings_state["legend_position"] == "bottom_left"
+
+    # The saved settings are applied to the plot that is given later.
+    plot = figure()
+    plot.scatter([1, 2, 3], [1, 2, 3], legend_label="points")
+    settings.on_apply_dialog(plot)
+    assert plot.legend.location == "bottom_left"
+
+
+def test_point_shape_in_place(plot_settings):
+    renderer = plot_settings._plot.renderers[0]
+
+    plot_settings._point_shape_widget.value = "circle_cross"
+    plot_settings.on_apply_dialog()
+
+    assert plot_settings._plot.renderers == [renderer]
+    assert renderer.glyph.marker == "circle_cross"
+    assert renderer.glyph.fill_alpha == 0
+    assert renderer.nonselection_glyph.marker == "circle_cross"
+
+
+def test_point_shape_in_place_applies_marker_only(plot_settings):
+    plot_settings._point_shape_widget.value = "diamond"
+
+    assert get_changed_properties(plot_settings) == {("Scatter", "marker")}
+
+
+def test_point_shape_recreates_other_glyphs(plot_settings):
+    plot = figure()
+    plot.circle([1, 2, 3], [1, 2, 3], legend_label="points")
+    plot_settings._plot.document.add_root(plot)
+    plot_settings._point_shape_widget.value = "diamond"
+    plot_settings.on_apply_dialog(plot)
+
+    renderer = plot.renderers[0]
+    assert type(renderer.glyph).__name__ == "Scatter"
+    assert renderer.glyph.marker == "diamond"
+    assert plot.legend.items[0].renderers == [renderer]
+
+
+def test_multi_point_color_color_mapper():
+    plot = figure()
+    source = ColumnDataSource(data={"x": [1, 2, 3], "y": [1, 2, 3], "group": ["a", "b", "a"]})
+    color_map = factor_cmap("group", ["#000000", "#ffffff"], ["a", "b"])
+    plot.scatter("x", "y", source=source, fill_color=color_map, line_color=color_map, legend_field="group")
+
+    state = AppState()
+    state["plot_settings_state"] = None
+    settings = PlotSettings("Settings", plot, state, included_settings=["multi_point_color"])
+    Document().add_root(plot)
+
+    assert settings._multi_point_color == [*COLORS_PALETTE[:2]]
+
+    settings._multi_point_color_widget.value = [COLORS_PALETTE[1], COLORS_PALETTE[2]]
+
+    assert get_changed_properties(settings) == {("CategoricalColorMapper", "palette")}
+    assert settings._multi_point_color == [COLORS_PALETTE[1], COLORS_PALETTE[2]]
+    assert "color" not in source.data
+
+
+def test_multi_point_color_consolidated():
+    plot = figure()
+    for group in ("a", "b", "c"):
+        plot.scatter("x", "y", source=ColumnDataSource(data={"x": [1, 2], "y": [1, 2]}), legend_label=group)
+
+    state = AppState()
+    state["plot_settings_state"] = None
+    settings = PlotSettings("Settings", plot, state, included_settings=["multi_point_color"], consolidate=True)
+    Document().add_root(plot)
+
+    assert len(plot.renderers) == 1
+    assert settings._multi_point_color == [*COLORS_PALETTE[:3]]
+
+    settings._multi_point_color_widget.value = [COLORS_PALETTE[3]]
+
+    assert get_changed_properties(settings) == {("ColumnDataSource", "data")}
+    assert plot.renderers[0].data_source.data["color"].tolist()[::2] == settings._multi_point_color
+    assert settings._multi_point_color[0] == COLORS_PALETTE[3]
+
+
+def test_multi_point_color_consolidated_other_legend_items():
+    plot = figure()
+    for group in ("a", "b"):
+        plot.scatter("x", "y", source=ColumnDataSource(data={"x": [1, 2], "y": [1, 2]}), legend_label=group)
+
+    state = AppState()
+    state["plot_settings_state"] = None
+    settings = PlotSettings("Settings", plot, state, included_settings=["multi_point_color"], consolidate=True)
+    Document().add_root(plot)
+
+    # The group item isn't the first item of the legend.
+    [renderer] = plot.renderers
+    plot.legend.items.insert(0, LegendItem(label="all", renderers=[renderer]))
+
+    settings._multi_point_color_widget.value = [COLORS_PALETTE[3], COLORS_PALETTE[4]]
+    settings.on_apply_dialog()
+
+    assert renderer.data_source.data["color"].tolist() == [COLORS_PALETTE[3]] * 2 + [COLORS_PALETTE[4]] * 2
+
+
+def test_multi_point_color_new_groups():
+    plot = figure()
+    for group in ("a", "b"):
+        plot.scatter("x", "y", source=ColumnDataSource(data={"x": [1, 2], "y": [1, 2]}), legend_label=group)
+
+    state = AppState()
+    state["plot_settings_state"] = None
+    settings = PlotSettings("Settings", plot, state, included_settings=["multi_point_color"], consolidate=True)
+    Document().add_root(plot)
+    settings.on_apply_dialog()
+    assert get_changed_properties(settings) == set()
+
+    # Another component adds a group, which is colored the next time the settings are applied.
+    source = plot.renderers[0].data_source
+    source.stream({"x": [3], "y": [3], "group": ["c"], "color": ["black"], "line_color": ["black"]})
+    assert get_changed_properties(settings) == {("ColumnDataSource", "data")}
+    assert source.data["color"].tolist() == [*np.repeat(COLORS_PALETTE[:3], [2, 2, 1])]
+    assert source.data["line_color"].tolist() == source.data["color"].tolist()
+
+
+def test_applied_settings_snapshot(plot_settings):
+    plot_settings._legend_position_widget.value = "bottom_left"
+    plot_settings._grid_lines_widget.active = [0]
+    plot_settings.on_apply_dialog()
+
+    [applied_settings] = plot_settings._backend_callback_invoker.tags
+    assert not applied_settings["stale"]
+    assert applied_settings["snapshot"]["legend_position"] == {"value": "bottom_left"}
+    assert applied_settings["snapshot"]["grid_lines"] == {"active": [0]}
+
+    plot_settings.mark_plot_changed()
+    assert plot_settings._backend_callback_invoker.tags[0]["stale"]
+
+    # Opening the modal when the plot was changed reads the settings from the plot.
+    plot_settings._plot.legend.location = "top_left"
+    plot_settings._backend_callback_invoker.active = True
+    [applied_settings] = plot_settings._backend_callback_invoker.tags
+    assert not applied_settings["stale"]
+    assert applied_settings["snapshot"]["legend_position"] == {"value": "top_left"}
+    assert plot_settings._legend_position_widget.value == "top_left"
+
+
+def test_reset_settings_widgets(plot_settings):
+    changes = []
+    plot_settings._grid_lines_widget.on_change("active", lambda attr, old, new: changes.append(new))
+    plot_settings._custom_plot_dimensions_widget.active = [0]
+    plot_settings._grid_lines_widget.active = [0]
+    assert not plot_settings._plot_height_widget.disabled
+
+    plot_settings._on_reset_settings()
+
+    # Callbacks of others are still called, while the plot dimensions widgets are updated once.
+    assert changes == [[0], []]
+    assert plot_settings._plot_height_widget.disabled
+    assert not plot_settings._aspect_ratio_widget.disabled
+
+
+def test_mark_plot_changed(plot_settings):
+    # A plot may be marked as changed before any settings were applied to it.
+    state = AppState()
+    state["plot_settings_state"] = None
+    settings = PlotSettings("Settings", None, state)
+    settings.mark_plot_changed()
+    assert settings._backend_callback_invoker.tags[0]["stale"]
+
+    assert not plot_settings._backend_callback_invoker.tags[0]["stale"]
+
+    # Data changes mark the plot as changed automatically.
+    plot_settings._plot.renderers[0].data_source.stream({"x": [4], "y": [4]})
+    assert plot_settings._backend_callback_invoker.tags[0]["stale"]
+
+
+def test_build_theme(plot_settings):
+    plot_settings._grid_lines_widget.active = [0]
+    plot_settings._point_size_widget.value = 12
+    plot_settings.on_apply_dialog()
+
+    theme = plot_settings.build_theme()
+    grid, legend, scatter = Grid(), Legend(), Scatter()
+    for model in (grid, legend, scatter):
+        theme.apply_to_model(model)
+
+    assert grid.themed_values() == {"visible": True}
+    assert legend.themed_values() == {"location": plot_settings._legend_position_widget.value}
+    # The attributes of the Marker base class apply to the Scatter glyph.
+    assert scatter.themed_values() == {"size": 12, "marker": "circle"}
+
+
+def test_installed_theme(plot_settings):
+    doc = plot_settings._plot.document
+    doc.theme = Theme(json={"attrs": {"Title": {"text_color": "red"}}})
+    plot_settings.install_theme(doc)
+
+    plot_settings._legend_position_widget.value = "bottom_left"
+    plot_settings.on_apply_dialog()
+
+    new_plot = figure(tags=[plot_settings.theme_tag])
+    new_plot.scatter([1, 2, 3], [1, 2, 3], legend_label="points", size=20)
+    other_plot = figure()
+    other_plot.scatter([1, 2, 3], [1, 2, 3], legend_label="points")
+    doc.add_root(new_plot)
+    doc.add_root(other_plot)
+    assert new_plot.legend.location == "bottom_left"
+
+    # The theme applies only to the tagged plots, on top of the document's original theme.
+    assert other_plot.legend.location != "bottom_left"
+    assert other_plot.title.text_color == new_plot.title.text_color == "red"
+
+    plot_settings.on_apply_dialog(new_plot)
+
+    # Themed settings are not set explicitly, unlike settings the theme couldn't apply (e.g. the explicit size).
+    legend = new_plot.legend[0]
+    assert legend.location == "bottom_left"
+    legend.unapply_theme()
+    assert legend.location == Legend.lookup("location").class_default(Legend)
+    assert new_plot.renderers[0].glyph.size == plot_settings._point_size_widget.value
+
+
+def test_output_backend():
+    plot = figure()
+    source = ColumnDataSource(data={"x": [1, 2, 3], "y": [1, 2, 3]})
+    plot.scatter("x", "y", source=source)
+
+    state = AppState()
+    state["plot_settings_state"] = None
+    settings = PlotSettings("Settings", plot, state, included_settings=["point_shape", "output_backend"])
+    Document().add_root(plot)
+
+    assert plot.output_backend == "canvas"
+    assert settings._output_backend == "auto"
+
+    source.stream({"x": np.arange(WEBGL_POINTS_THRESHOLD), "y": np.arange(WEBGL_POINTS_THRESHOLD)})
+    settings._point_shape_widget.value = "square"
+    settings.on_apply_dialog()
+
+    assert plot.output_backend == "webgl"
+    assert plot.renderers[0].glyph.marker == "square"
+    assert settings._output_backend == "auto"
+
+    settings._output_backend_widget.value = "canvas"
+    settings.on_apply_dialog()
+
+    assert plot.output_backend == "canvas"
+    assert settings._output_backend == "canvas"
+    assert plot.js_property_callbacks["change:output_backend"] == [settings._rerender_plot_callback]
@@ -0,0 +1,82 @@
+import pytest
+from bokeh.document import Document
+from bokeh.plotting import figure
+from mz_bokeh_package.components import AppState, PlotSettingsManager
+
+
+def create_figure():
+    plot = figure()
+    plot.scatter([1, 2, 3], [1, 2, 3], legend_label="points")
+    return plot
+
+
+@pytest.fixture
+def manager():
+    state = AppState()
+    state["plot_settings_state"] = None
+
+    figures = [create_figure() for _ in range(3)]
+    settings = PlotSettingsManager("Settings", state, figures=figures, included_settings=["grid_lines", "show_legend"])
+
+    doc = Document()
+    for plot in figures:
+        doc.add_root(plot)
+    doc.add_root(settings.layout)
+    return settings
+
+
+def test_apply_to_all_figures(manager):
+    assert all(not plot.grid[0].visible for plot in manager.figures)
+
+    manager._grid_lines_widget.active = [0]
+    manager.on_apply_dialog()
+
+    assert all(plot.grid[0].visible for plot in manager.figures)
+    assert manager._state["plot_settings_state"]["grid_lines"]
+
+
+def test_shared_settings_tool(manager):
+    tools = {plot.tools[-1] for plot in manager.figures}
+
+    assert tools == {manager._settings_plot_tool}
+
+
+def test_register_and_unregister(manager):
+    manager._show_legend_widget.active = []
+    manager.on_apply_dialog()
+
+    plot = create_figure()
+    manager.register(plot)
+    assert not plot.legend.visible
+
+    manager.unregister(plot)
+    assert manager._settings_plot_tool not in plot.tools
+    with pytest.raises(ValueError):
+        manager.apply(plot)
+
+
+def test_apply_to_changed_figure(manager):
+    plot = manager.figures[0]
+    plot.grid[0].visible = True
+
+    manager.apply(plot)
+    assert plot.grid[0].visible
+
+    manager.mark_plot_changed(plot)
+    manager.apply(plot)
+    assert not plot.grid[0].visible
+
+
+def test_apply_to_figure_with_changed_data(manager):
+    first_plot, second_plot = manager.figures[:2]
+    for plot in manager.figures:
+        plot.grid[0].visible = True
+
+    # Replacing the data of a plot's renderers marks only that plot as changed.
+    renderer = second_plot.renderers[0]
+    renderer.data_source.data = {**renderer.data_source.data, "x": [4, 5, 6]}
+    manager.apply()
+
+    assert manager._plot is None
+    assert first_plot.grid[0].visible
+    assert not second_plot.grid[0].visible
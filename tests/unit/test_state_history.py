@@ -0,0 +1,140 @@
+import numpy as np
+import pytest
+from mz_bokeh_package.components import AppState
+from mz_bokeh_package.components.state_history import StateHistory
+
+
+def test_record_shares_unchanged_values():
+    history = StateHistory(max_depth=5)
+    large_array = np.zeros(1000)
+
+    assert history.record({"a": [1, {"b": 2}], "c": large_array})
+    first_version = history.current
+
+    assert history.record({"a": [1, {"b": 2}, 3], "c": large_array})
+    second_version = history.current
+
+    assert second_version["c"] is first_version["c"]
+    assert second_version["a"][1] is first_version["a"][1]
+    assert second_version["a"] is not first_version["a"]
+
+    # Recording identical values does not create a new version
+    assert not history.record({"a": [1, {"b": 2}, 3], "c": np.zeros(1000)})
+
+
+def test_record_copies_values():
+    history = StateHistory()
+    value = {"items": [1, 2]}
+
+    history.record({"value": value})
+    value["items"].append(3)
+
+    assert history.current["value"] == {"items": [1, 2]}
+
+
+def test_undo_redo():
+    history = StateHistory()
+    history.record({"a": 1})
+    history.record({"a": 2})
+
+    assert history.undo() == {"a": 1}
+    assert history.undo() is None
+    assert history.redo() == {"a": 2}
+    assert history.redo() is None
+
+    # Recording after undo discards the versions that could be redone
+    history.undo()
+    history.record({"a": 3})
+    assert not history.can_redo
+    assert history.undo() == {"a": 1}
+
+
+def test_max_depth():
+    history = StateHistory(max_depth=3)
+    for i in range(10):
+        history.record({"a": i})
+
+    assert history.undo() == {"a": 8}
+    assert history.undo() == {"a": 7}
+    assert history.undo() is None
+
+
+def test_max_bytes():
+    array_bytes = np.zeros(1000).nbytes
+    history = StateHistory(max_depth=100, max_bytes=int(3.5 * array_bytes))
+    for i in range(10):
+        history.record({"a": np.full(1000, i, dtype=float)})
+
+    assert history.size_in_bytes <= 3.5 * array_bytes
+    assert history.undo()["a"][0] == 8
+    assert history.undo()["a"][0] == 7
+    assert history.undo() is None
+
+
+def test_max_bytes_counts_shared_values_once():
+    history = StateHistory(max_depth=100)
+    large_array = np.zeros(1000)
+
+    history.record({"a": 0, "b": large_array})
+    size = history.size_in_bytes
+    history.record({"a": 1, "b": large_array})
+
+    assert history.size_in_bytes - size < large_array.nbytes
+
+
+def test_app_state_undo_redo():
+    state = AppState(history_depth=10, history_keys=["plot_area", "selection"])
+    values = []
+
+    def callback(new_value):
+        values.append(new_value)
+
+    state.on_change("plot_area", callback)
+
+    state["plot_area"] = 1
+    state["selection"] = [1, 2]
+    state["is_loading"] = False
+    state.checkpoint()
+
+    state["plot_area"] = 2
+    state["selection"].append(3)
+    state["is_loading"] = True
+
+    # Changes since the last checkpoint are undone first
+    assert state.undo()
+    assert state["plot_area"] == 1
+    assert state["selection"] == [1, 2]
+    assert state["is_loading"] is True
+    assert not state.undo()
+
+    assert state.redo()
+    assert state["plot_area"] == 2
+    assert state["selection"] == [1, 2, 3]
+    assert values == [1, 2, 1, 2]
+
+
+def test_app_state_history_disabled():
+    state = AppState()
+
+    with pytest.raises(ValueError):
+        state.undo()
+
+
+def test_app_state_history_excludes_transient_keys():
+    state = AppState(history_depth=10)
+
+    state["plot_area"] = 1
+    state["is_loading"] = False
+    state.checkpoint()
+
+    state["plot_area"] = 2
+    state["is_loading"] = True
+
+    # An undo doesn't turn off the loading mode of a running event handler
+    assert state.undo()
+    assert state["plot_area"] == 1
+    assert state["is_loading"] is True
+
+    # A change of a transient value alone isn't a new version
+    state["is_loading"] = False
+    assert not state.checkpoint()